@@ -82,27 +82,15 @@ if selected == "📊 Dashboard":
     st.header("Dashboard Overview")
     
     try:
-        investments = st.session_state.service.read_all_investments()
+        # Value the portfolio once; metrics and table render from this view
+        portfolio = st.session_state.service.get_portfolio_view()
         
-        if not investments:
+        if not portfolio.rows:
             st.info("📭 No investments found. Create one to get started!")
         else:
-            # Calculate metrics
-            total_invested = 0
-            total_current_value = 0
-            total_profit_loss = 0
-            
-            for inv in investments:
-                amount = float(inv.get('investment_amount', 0))
-                annual_return = float(inv.get('annual_return_percentage', 0))
-                inv_date = inv.get('investment_date', '')
-                
-                total_invested += amount
-                
-                if inv_date:
-                    current_val = calculate_current_value(amount, annual_return, inv_date)
-                    total_current_value += current_val
-                    total_profit_loss += calculate_profit_loss(current_val, amount)
+            total_invested = portfolio.total_invested
+            total_current_value = portfolio.total_current_value
+            total_profit_loss = portfolio.total_profit_loss
             
             # Display key metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -122,7 +110,7 @@ if selected == "📊 Dashboard":
                 )
             
             with col3:
-                overall_return = calculate_return_percentage(total_current_value, total_invested)
+                overall_return = portfolio.total_return_percentage
                 st.metric(
                     label="Overall Return %",
                     value=f"{overall_return:.2f}%",
@@ -132,7 +120,7 @@ if selected == "📊 Dashboard":
             with col4:
                 st.metric(
                     label="Total Investments",
-                    value=len(investments),
+                    value=portfolio.count,
                     delta=None
                 )
             
@@ -141,29 +129,30 @@ if selected == "📊 Dashboard":
             # Display investments table
             st.subheader("All Investments")
             
-            # Prepare data for display
-            display_data = []
-            for inv in investments:
-                amount = float(inv.get('investment_amount', 0))
-                annual_return = float(inv.get('annual_return_percentage', 0))
-                inv_date = inv.get('investment_date', '')
-                
-                current_val = calculate_current_value(amount, annual_return, inv_date)
-                profit_loss = calculate_profit_loss(current_val, amount)
-                return_pct = calculate_return_percentage(current_val, amount)
-                
-                display_data.append({
-                    'Investment ID': inv.get('investment_id', '')[:8] + '...',
-                    'Amount': f"₹{amount:,.2f}",
-                    'Date': inv_date,
-                    'Annual Return %': f"{annual_return:.2f}%",
-                    'Current Value': f"₹{current_val:,.2f}",
-                    'Profit/Loss': f"₹{profit_loss:,.2f}",
-                    'Return %': f"{return_pct:.2f}%"
-                })
-            
-            df = pd.DataFrame(display_data)
-            st.dataframe(df, use_container_width=True)
+            # Keep the columns numeric and let column_config format them, so
+            # sorting is by value and no per-cell strings are built
+            rows = portfolio.rows
+            df = pd.DataFrame({
+                'Investment ID': [row.investment_id[:8] + '...' for row in rows],
+                'Amount': [row.investment_amount for row in rows],
+                'Date': pd.to_datetime([row.investment_date for row in rows]),
+                'Annual Return %': [row.annual_return_percentage for row in rows],
+                'Current Value': [row.current_value for row in rows],
+                'Profit/Loss': [row.profit_loss for row in rows],
+                'Return %': [row.return_percentage for row in rows]
+            })
+            st.dataframe(
+                df,
+                use_container_width=True,
+                column_config={
+                    'Amount': st.column_config.NumberColumn("Amount (₹)", format="localized"),
+                    'Date': st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+                    'Annual Return %': st.column_config.NumberColumn(format="%.2f%%"),
+                    'Current Value': st.column_config.NumberColumn("Current Value (₹)", format="localized"),
+                    'Profit/Loss': st.column_config.NumberColumn("Profit/Loss (₹)", format="localized"),
+                    'Return %': st.column_config.NumberColumn(format="%.2f%%")
+                }
+            )
             
     except Exception as e:
         st.error(f"❌ Error loading dashboard: {str(e)}")
@@ -246,33 +235,32 @@ elif selected == "👁️ View All":
     st.header("All Investments")
     
     try:
-        investments = st.session_state.service.read_all_investments()
+        portfolio = st.session_state.service.get_portfolio_view()
         
-        if not investments:
+        if not portfolio.rows:
             st.info("📭 No investments found. Create one to get started!")
         else:
             # Sort investments by date
-            investments = sorted(
-                investments, 
-                key=lambda x: x.get('investment_date', ''), 
+            rows = sorted(
+                portfolio.rows, 
+                key=lambda row: row.investment_date, 
                 reverse=True
             )
             
             # Display investments
-            for idx, inv in enumerate(investments, 1):
+            for idx, row in enumerate(rows, 1):
                 with st.expander(
-                    f"📈 Investment #{idx} - {inv.get('investment_date', 'N/A')}", 
+                    f"📈 Investment #{idx} - {row.investment_date}", 
                     expanded=False
                 ):
                     col1, col2, col3 = st.columns(3)
                     
-                    amount = float(inv.get('investment_amount', 0))
-                    annual_return = float(inv.get('annual_return_percentage', 0))
-                    inv_date = inv.get('investment_date', '')
-                    
-                    current_val = calculate_current_value(amount, annual_return, inv_date)
-                    profit_loss = calculate_profit_loss(current_val, amount)
-                    return_pct = calculate_return_percentage(current_val, amount)
+                    amount = row.investment_amount
+                    annual_return = row.annual_return_percentage
+                    inv_date = row.investment_date
+                    current_val = row.current_value
+                    profit_loss = row.profit_loss
+                    return_pct = row.return_percentage
                     
                     with col1:
                         st.metric("Investment Amount", f"₹{amount:,.2f}")
@@ -287,14 +275,14 @@ elif selected == "👁️ View All":
                     with col2:
                         st.metric("Return %", f"{return_pct:.2f}%")
                     with col3:
-                        st.metric("Investment Date", inv_date)
+                        st.metric("Investment Date", str(inv_date))
                     
-                    st.info(f"**ID:** `{inv.get('investment_id')}`")
+                    st.info(f"**ID:** `{row.investment_id}`")
                     
                     col1, col2 = st.columns(2)
                     with col1:
-                        if st.button("✏️ Edit", key=f"edit_{inv.get('investment_id')}"):
-                            st.session_state.selected_investment_id = inv.get('investment_id')
+                        if st.button("✏️ Edit", key=f"edit_{row.investment_id}"):
+                            st.session_state.selected_investment_id = row.investment_id
             
     except Exception as e:
         st.error(f"❌ Error loading investments: {str(e)}")
@@ -305,16 +293,15 @@ elif selected == "✏️ Update":
     st.header("Update Investment")
     
     try:
-        investments = st.session_state.service.read_all_investments()
+        portfolio = st.session_state.service.get_portfolio_view()
         
-        if not investments:
+        if not portfolio.rows:
             st.info("📭 No investments found to update!")
         else:
             # Create selection options
             investment_options = {
-                f"{inv.get('investment_date', 'N/A')} - ₹{float(inv.get('investment_amount', 0)):,.2f}": 
-                inv.get('investment_id') 
-                for inv in investments
+                f"{row.investment_date} - ₹{row.investment_amount:,.2f}": row.investment_id
+                for row in portfolio.rows
             }
             
             selected_display = st.selectbox(
@@ -408,9 +395,9 @@ elif selected == "🗑️ Delete":
     st.header("Delete Investment")
     
     try:
-        investments = st.session_state.service.read_all_investments()
+        portfolio = st.session_state.service.get_portfolio_view()
         
-        if not investments:
+        if not portfolio.rows:
             st.info("📭 No investments found to delete!")
         else:
             col1, col2 = st.columns([3, 1])
@@ -418,9 +405,8 @@ elif selected == "🗑️ Delete":
             with col1:
                 # Create selection options
                 investment_options = {
-                    f"{inv.get('investment_date', 'N/A')} - ₹{float(inv.get('investment_amount', 0)):,.2f}": 
-                    inv.get('investment_id') 
-                    for inv in investments
+                    f"{row.investment_date} - ₹{row.investment_amount:,.2f}": row.investment_id
+                    for row in portfolio.rows
                 }
                 
                 selected_display = st.selectbox(
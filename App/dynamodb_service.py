@@ -2,10 +2,66 @@
 DynamoDB service module for Investment table operations
 """
 import boto3
+from botocore.exceptions import ClientError
 import uuid
-from datetime import datetime
+from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, NamedTuple, Union
+from dataclasses import dataclass
+import numpy as np
+import threading
+import time
+
+# Process-wide valuation cache keyed on (as-of date, data version). Writes from
+# this process bump the version; entries also expire after _VALUATION_CACHE_TTL
+# seconds so writes from other app instances and direct loads show up too.
+_valuation_cache = {}
+_valuation_cache_lock = threading.Lock()
+_data_version = 0
+_VALUATION_CACHE_SIZE = 16
+_VALUATION_CACHE_TTL = 30.0
+
+
+def _invalidate_valuation_cache():
+    """Bump the data version and drop cached valuations after a write"""
+    global _data_version
+    with _valuation_cache_lock:
+        _data_version += 1
+        _valuation_cache.clear()
+
+
+def _cached_valuation(as_of: date, build: Optional[Callable[[], 'PortfolioView']] = None) -> Optional['PortfolioView']:
+    """
+    Look up the cached valuation for a date, building and caching it on a miss
+    
+    Args:
+        as_of: Valuation date
+        build: Builds the valuation on a miss (optional; without it a miss returns None)
+        
+    Returns:
+        The cached or newly built PortfolioView, or None on a miss without build
+    """
+    started = time.monotonic()
+    with _valuation_cache_lock:
+        key = (as_of, _data_version)
+        entry = _valuation_cache.get(key)
+    if entry is not None and started - entry[1] < _VALUATION_CACHE_TTL:
+        return entry[0]
+    if build is None:
+        return None
+    
+    portfolio = build()
+    
+    with _valuation_cache_lock:
+        # Skip caching if a write bumped the version while records were read
+        if key[1] == _data_version:
+            _valuation_cache.pop(key, None)
+            if len(_valuation_cache) >= _VALUATION_CACHE_SIZE:
+                _valuation_cache.pop(next(iter(_valuation_cache)))
+            # Aged from when the read started, so the TTL bounds how stale the data is
+            _valuation_cache[key] = (portfolio, started)
+    return portfolio
+
 
 class InvestmentService:
     def __init__(self, table_name: str = "Investment", region: str = "ap-south-1"):
@@ -38,6 +94,7 @@ class InvestmentService:
         }
         
         self.table.put_item(Item=item)
+        _invalidate_valuation_cache()
         return item
     
     def read_investment(self, investment_id: str) -> Optional[Dict]:
@@ -70,6 +127,32 @@ class InvestmentService:
         
         return items
     
+    def read_all_investment_records(self) -> List['Investment']:
+        """
+        Read all investment records as typed Investment records
+        
+        Returns:
+            List of Investment records, newest investment date first
+        """
+        records = [Investment.from_row(item) for item in self.read_all_investments()]
+        records.sort(key=lambda inv: inv.investment_date or date.min, reverse=True)
+        return records
+    
+    def get_portfolio_view(self, as_of: Optional[date] = None) -> 'PortfolioView':
+        """
+        Get the valued portfolio, served from the valuation cache when possible
+        
+        Args:
+            as_of: Valuation date (defaults to today)
+            
+        Returns:
+            PortfolioView valued as of the given date
+        """
+        as_of = as_of or date.today()
+        return _cached_valuation(
+            as_of, lambda: build_portfolio_view(self.read_all_investment_records(), as_of=as_of)
+        )
+    
     def update_investment(self, investment_id: str, investment_amount: Optional[float] = None,
                          investment_date: Optional[str] = None, 
                          annual_return_percentage: Optional[float] = None) -> Optional[Dict]:
@@ -85,11 +168,6 @@ class InvestmentService:
         Returns:
             Updated investment record or None if not found
         """
-        # Check if investment exists
-        existing = self.read_investment(investment_id)
-        if not existing:
-            return None
-        
         update_expression = "SET updated_at = :updated_at"
         expression_values = {":updated_at": datetime.now().isoformat()}
         
@@ -105,12 +183,21 @@ class InvestmentService:
             update_expression += ", annual_return_percentage = :return"
             expression_values[":return"] = Decimal(str(annual_return_percentage))
         
-        response = self.table.update_item(
-            Key={'investment_id': investment_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values,
-            ReturnValues='ALL_NEW'
-        )
+        # The condition stops update_item from creating a missing item, so the
+        # existence check and the write are a single request
+        try:
+            response = self.table.update_item(
+                Key={'investment_id': investment_id},
+                UpdateExpression=update_expression,
+                ConditionExpression='attribute_exists(investment_id)',
+                ExpressionAttributeValues=expression_values,
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise
+        _invalidate_valuation_cache()
         
         return response.get('Attributes')
     
@@ -124,17 +211,51 @@ class InvestmentService:
         Returns:
             True if deleted, False if not found
         """
-        # Check if investment exists
-        existing = self.read_investment(investment_id)
-        if not existing:
+        # ALL_OLD returns the deleted item, or nothing if there was none
+        response = self.table.delete_item(
+            Key={'investment_id': investment_id},
+            ReturnValues='ALL_OLD'
+        )
+        if not response.get('Attributes'):
             return False
-        
-        self.table.delete_item(Key={'investment_id': investment_id})
+        _invalidate_valuation_cache()
         return True
 
 
+class Investment(NamedTuple):
+    """Compact typed investment record with native date and float fields"""
+    investment_id: str
+    investment_amount: float
+    investment_date: Optional[date]
+    annual_return_percentage: float
+    investment_comments: Optional[str] = None
+    
+    @classmethod
+    def from_row(cls, row: Dict) -> 'Investment':
+        """
+        Convert an investment row dict into a typed record
+        
+        Args:
+            row: Investment record as returned by read_investment/read_all_investments
+            
+        Returns:
+            Investment record
+        """
+        inv_date = row.get('investment_date')
+        if isinstance(inv_date, str):
+            inv_date = date.fromisoformat(inv_date) if inv_date else None
+        
+        return cls(
+            investment_id=str(row.get('investment_id', '')),
+            investment_amount=float(row.get('investment_amount', 0)),
+            investment_date=inv_date,
+            annual_return_percentage=float(row.get('annual_return_percentage', 0)),
+            investment_comments=row.get('investment_comments')
+        )
+
+
 def calculate_current_value(investment_amount: float, annual_return_percentage: float, 
-                           investment_date: str) -> float:
+                           investment_date: Union[str, date], as_of: Optional[date] = None) -> float:
     """
     Calculate current value of investment based on compound interest
     
@@ -144,16 +265,18 @@ def calculate_current_value(investment_amount: float, annual_return_percentage:
     Args:
         investment_amount: Initial investment amount
         annual_return_percentage: Annual return percentage (e.g., 5 for 5%)
-        investment_date: Investment date (YYYY-MM-DD format)
+        investment_date: Investment date (date object or YYYY-MM-DD string)
+        as_of: Valuation date (defaults to today)
         
     Returns:
         Current value of investment
     """
-    from datetime import datetime
-    
-    # Parse investment date
-    inv_date = datetime.strptime(investment_date, "%Y-%m-%d").date()
-    today = datetime.now().date()
+    # Driver and Investment record dates are used as-is; only strings are parsed
+    if isinstance(investment_date, str):
+        inv_date = datetime.strptime(investment_date, "%Y-%m-%d").date()
+    else:
+        inv_date = investment_date
+    today = as_of or datetime.now().date()
     
     # Calculate actual days passed (as a timedelta object for precision)
     time_delta = today - inv_date
@@ -204,3 +327,178 @@ def calculate_return_percentage(current_value: float, investment_amount: float)
         return 0.0
     
     return round(((current_value - investment_amount) / investment_amount) * 100, 2)
+
+
+PAISE_PER_RUPEE = 100
+
+
+def to_paise(rupees) -> np.ndarray:
+    """
+    Convert rupee amounts to fixed-point integer paise
+    
+    Args:
+        rupees: Amount or sequence of amounts in rupees (float or Decimal)
+        
+    Returns:
+        int64 NumPy array of paise
+    """
+    return np.rint(np.asarray(rupees, dtype=np.float64) * PAISE_PER_RUPEE).astype(np.int64)
+
+
+def from_paise(paise) -> np.ndarray:
+    """
+    Convert fixed-point integer paise to rupees
+    
+    Args:
+        paise: Amount or sequence of amounts in paise
+        
+    Returns:
+        float64 NumPy array of rupees
+    """
+    return np.asarray(paise, dtype=np.int64) / PAISE_PER_RUPEE
+
+
+def calculate_portfolio_values_paise(investment_paise, annual_return_percentages,
+                                     investment_dates, as_of: Optional[date] = None):
+    """
+    Calculate current value, profit/loss and return percentage for a whole portfolio in paise
+    
+    Fixed-point core of the valuation engine: each current value is rounded to
+    the paise once, and profit/loss and any totals over the results are exact
+    int64 arithmetic.
+    
+    Args:
+        investment_paise: Sequence of initial investment amounts in paise
+        annual_return_percentages: Sequence of annual return percentages (e.g., 5 for 5%)
+        investment_dates: Sequence of investment dates (date objects or YYYY-MM-DD strings)
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        Tuple of NumPy arrays (current_values_paise, profit_loss_paise, return_percentages)
+    """
+    amounts = np.asarray(investment_paise, dtype=np.int64)
+    annual_rates = np.asarray(annual_return_percentages, dtype=np.float64) / 100
+    inv_dates = np.asarray(investment_dates, dtype='datetime64[D]')
+    today = np.datetime64(as_of or datetime.now().date(), 'D')
+    
+    # Missing or future dates keep the principal, as in calculate_current_value
+    days_passed = (today - inv_dates).astype(np.float64)
+    not_started = np.isnat(inv_dates) | (days_passed < 0)
+    years_passed = np.where(not_started, 0.0, days_passed) / 365.25
+    
+    current_values = np.where(
+        not_started,
+        amounts,
+        np.rint(amounts * np.power(1 + annual_rates, years_passed)).astype(np.int64)
+    )
+    profit_loss = current_values - amounts
+    
+    return_percentages = np.zeros(len(amounts))
+    np.divide(profit_loss, amounts, out=return_percentages, where=amounts != 0)
+    return_percentages = np.round(return_percentages * 100, 2)
+    
+    return current_values, profit_loss, return_percentages
+
+
+def calculate_portfolio_values(investment_amounts, annual_return_percentages,
+                               investment_dates, as_of: Optional[date] = None):
+    """
+    Calculate current value, profit/loss and return percentage for a whole portfolio
+    
+    Vectorized counterpart of calculate_current_value, calculate_profit_loss and
+    calculate_return_percentage: whole columns are valued in one fixed-point
+    NumPy pass (calculate_portfolio_values_paise) instead of once per investment.
+    
+    Args:
+        investment_amounts: Sequence of initial investment amounts
+        annual_return_percentages: Sequence of annual return percentages (e.g., 5 for 5%)
+        investment_dates: Sequence of investment dates (date objects or YYYY-MM-DD strings)
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        Tuple of NumPy arrays (current_values, profit_loss, return_percentages)
+    """
+    current_values, profit_loss, return_percentages = calculate_portfolio_values_paise(
+        to_paise(investment_amounts), annual_return_percentages, investment_dates, as_of=as_of
+    )
+    return from_paise(current_values), from_paise(profit_loss), return_percentages
+
+
+@dataclass(frozen=True)
+class PortfolioRow:
+    """One valued investment of a PortfolioView"""
+    investment_id: str
+    investment_amount: float
+    investment_date: Optional[date]
+    annual_return_percentage: float
+    current_value: float
+    profit_loss: float
+    return_percentage: float
+    investment_comments: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PortfolioView:
+    """Valued portfolio shared by the metric cards, charts, tables and pages of one rerun"""
+    rows: List[PortfolioRow]
+    total_invested: float
+    total_current_value: float
+    total_profit_loss: float
+    total_return_percentage: float
+    as_of: Optional[date] = None
+    
+    @property
+    def count(self) -> int:
+        """Number of investments in the portfolio"""
+        return len(self.rows)
+
+
+def build_portfolio_view(investments: List[Investment], as_of: Optional[date] = None) -> PortfolioView:
+    """
+    Value a list of investment records once and build the portfolio view model
+    
+    Args:
+        investments: Investment records as returned by read_all_investment_records()
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        PortfolioView with one row per investment and precomputed totals
+    """
+    # Amounts enter the engine as paise once; totals below are exact integer sums
+    amounts = to_paise([inv.investment_amount for inv in investments])
+    current_values, profit_losses, return_pcts = calculate_portfolio_values_paise(
+        amounts,
+        [inv.annual_return_percentage for inv in investments],
+        [inv.investment_date for inv in investments],
+        as_of=as_of
+    )
+    
+    rows = [
+        PortfolioRow(
+            investment_id=inv.investment_id,
+            investment_amount=inv.investment_amount,
+            investment_date=inv.investment_date,
+            annual_return_percentage=inv.annual_return_percentage,
+            current_value=current_value,
+            profit_loss=profit_loss,
+            return_percentage=return_pct,
+            investment_comments=inv.investment_comments
+        )
+        for inv, current_value, profit_loss, return_pct in zip(
+            investments,
+            from_paise(current_values).tolist(),
+            from_paise(profit_losses).tolist(),
+            return_pcts.tolist()
+        )
+    ]
+    
+    total_invested = int(amounts.sum())
+    total_current_value = int(current_values.sum())
+    return PortfolioView(
+        rows=rows,
+        total_invested=total_invested / PAISE_PER_RUPEE,
+        total_current_value=total_current_value / PAISE_PER_RUPEE,
+        total_profit_loss=(total_current_value - total_invested) / PAISE_PER_RUPEE,
+        total_return_percentage=calculate_return_percentage(total_current_value, total_invested),
+        as_of=as_of or datetime.now().date()
+    )
@@ -4,14 +4,23 @@ Run with: pytest test_investment_dashboard.py -v
 """
 
 import pytest
+import numpy as np
 from datetime import datetime, timedelta, date
 from decimal import Decimal
 from unittest.mock import Mock, patch, MagicMock
+from botocore.exceptions import ClientError
 from dynamodb_service import (
     InvestmentService,
     calculate_current_value,
     calculate_profit_loss,
-    calculate_return_percentage
+    calculate_return_percentage,
+    calculate_portfolio_values,
+    build_portfolio_view,
+    Investment,
+    _invalidate_valuation_cache,
+    to_paise,
+    from_paise,
+    calculate_portfolio_values_paise
 )
 
 
@@ -115,6 +124,151 @@ class TestCalculations:
         assert return_pct == 0.0
 
 
+class TestPortfolioValues:
+    """Test vectorized portfolio valuation"""
+    
+    def test_as_of_date(self):
+        """Test valuation on an explicit as-of date"""
+        current_values, _, _ = calculate_portfolio_values(
+            [10000, 10000], [10, 10], [date(2023, 1, 1), date(2025, 1, 1)], as_of=date(2024, 1, 1)
+        )
+        
+        assert current_values[0] == calculate_current_value(10000, 10, date(2023, 1, 1), as_of=date(2024, 1, 1))
+        assert current_values[0] == pytest.approx(10000 * 1.1 ** (365 / 365.25), abs=0.01)
+        assert current_values[1] == 10000
+    
+    def test_matches_per_investment_calculations(self):
+        """Test batch results match the scalar calculation functions"""
+        amounts = [10000, 25000.5, 500]
+        annual_returns = [5, 12.5, 0]
+        inv_dates = [
+            (date.today() - timedelta(days=365)).strftime("%Y-%m-%d"),
+            (date.today() - timedelta(days=1200)).strftime("%Y-%m-%d"),
+            date.today().strftime("%Y-%m-%d")
+        ]
+        
+        current_values, profit_losses, return_pcts = calculate_portfolio_values(
+            amounts, annual_returns, inv_dates
+        )
+        
+        for i, amount in enumerate(amounts):
+            expected = calculate_current_value(amount, annual_returns[i], inv_dates[i])
+            assert current_values[i] == pytest.approx(expected, abs=0.01)
+            assert profit_losses[i] == pytest.approx(calculate_profit_loss(expected, amount), abs=0.01)
+            assert return_pcts[i] == pytest.approx(calculate_return_percentage(expected, amount), abs=0.01)
+    
+    def test_future_and_missing_dates_keep_principal(self):
+        """Test future or missing dates are valued at the invested amount"""
+        future = (date.today() + timedelta(days=10)).strftime("%Y-%m-%d")
+        
+        current_values, profit_losses, _ = calculate_portfolio_values(
+            [10000, 5000], [5, 5], [future, None]
+        )
+        
+        assert list(current_values) == [10000, 5000]
+        assert list(profit_losses) == [0, 0]
+    
+    def test_zero_investment(self):
+        """Test zero investment amount gives zero return percentage"""
+        _, _, return_pcts = calculate_portfolio_values([0], [5], ["2024-01-15"])
+        
+        assert return_pcts[0] == 0.0
+    
+    def test_empty_portfolio(self):
+        """Test empty portfolio returns empty arrays"""
+        current_values, profit_losses, return_pcts = calculate_portfolio_values([], [], [])
+        
+        assert len(current_values) == len(profit_losses) == len(return_pcts) == 0
+
+
+class TestPortfolioView:
+    """Test the portfolio view model"""
+    
+    def test_rows_and_totals(self):
+        """Test view rows carry valuations and totals add up"""
+        investments = [
+            Investment('id1', 10000.0, date.today() - timedelta(days=365), 5.0),
+            Investment('id2', 20000.0, date.today(), 8.5)
+        ]
+        
+        portfolio = build_portfolio_view(investments)
+        
+        assert portfolio.count == 2
+        assert [row.investment_id for row in portfolio.rows] == ['id1', 'id2']
+        assert portfolio.rows[1].current_value == 20000
+        assert portfolio.rows[1].investment_date == date.today()
+        assert portfolio.total_invested == 30000
+        assert portfolio.total_current_value == pytest.approx(
+            sum(row.current_value for row in portfolio.rows)
+        )
+        assert portfolio.total_profit_loss == pytest.approx(
+            portfolio.total_current_value - portfolio.total_invested, abs=0.01
+        )
+    
+    def test_empty_portfolio(self):
+        """Test empty investment list gives an empty view"""
+        portfolio = build_portfolio_view([])
+        
+        assert portfolio.rows == []
+        assert portfolio.total_invested == 0
+        assert portfolio.total_return_percentage == 0.0
+
+
+class TestFixedPointMoney:
+    """Test the fixed-point paise valuation engine"""
+    
+    def test_paise_round_trip(self):
+        """Test Decimal and float rupees convert to exact paise and back"""
+        paise = to_paise([Decimal('10000.55'), 0.1, 0.2, 1234567.89])
+        
+        assert paise.dtype == np.int64
+        assert paise.tolist() == [1000055, 10, 20, 123456789]
+        assert from_paise(paise).tolist() == [10000.55, 0.1, 0.2, 1234567.89]
+    
+    def test_totals_are_exact(self):
+        """Test portfolio totals equal the exact sum of the row values"""
+        investments = [
+            Investment(f'id{i}', 0.1 + i * 0.01, date.today() - timedelta(days=400 + i), 7.3)
+            for i in range(1000)
+        ]
+        
+        portfolio = build_portfolio_view(investments)
+        current_paise, profit_paise, _ = calculate_portfolio_values_paise(
+            to_paise([inv.investment_amount for inv in investments]),
+            [inv.annual_return_percentage for inv in investments],
+            [inv.investment_date for inv in investments]
+        )
+        
+        assert portfolio.total_current_value == int(current_paise.sum()) / 100
+        assert portfolio.total_profit_loss == int(profit_paise.sum()) / 100
+        assert portfolio.total_invested == 5095.0
+
+
+class TestInvestmentRecord:
+    """Test typed Investment records"""
+    
+    def test_from_dynamodb_item(self):
+        """Test Decimal amounts and string dates are converted"""
+        record = Investment.from_row({
+            'investment_id': 'id1',
+            'investment_amount': Decimal('10000.50'),
+            'investment_date': '2024-06-15',
+            'annual_return_percentage': Decimal('7.5'),
+            'investment_comments': 'FD'
+        })
+        
+        assert record == Investment('id1', 10000.50, date(2024, 6, 15), 7.5, 'FD')
+        assert isinstance(record.investment_amount, float)
+    
+    def test_date_object_matches_string(self):
+        """Test calculate_current_value accepts date objects"""
+        inv_date = date.today() - timedelta(days=200)
+        
+        assert calculate_current_value(10000, 8, inv_date) == calculate_current_value(
+            10000, 8, inv_date.strftime("%Y-%m-%d")
+        )
+
+
 # ==================== Service Tests ====================
 
 class TestInvestmentService:
@@ -207,9 +361,6 @@ class TestInvestmentService:
         investment_id = "test-id"
         new_amount = 15000
         
-        # Mock existing investment
-        mock_service.table.get_item.return_value = {'Item': {'investment_id': investment_id}}
-        
         # Mock update return
         updated_item = {
             'investment_id': investment_id,
@@ -225,10 +376,15 @@ class TestInvestmentService:
         assert result is not None
         assert result['investment_amount'] == Decimal(str(new_amount))
         mock_service.table.update_item.assert_called_once()
+        assert mock_service.table.update_item.call_args.kwargs['ConditionExpression'] == 'attribute_exists(investment_id)'
+        mock_service.table.get_item.assert_not_called()
     
     def test_update_investment_not_found(self, mock_service):
         """Test updating non-existent investment"""
-        mock_service.table.get_item.return_value = {}
+        mock_service.table.update_item.side_effect = ClientError(
+            {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+            'UpdateItem'
+        )
         
         result = mock_service.update_investment(
             investment_id="non-existent",
@@ -236,26 +392,84 @@ class TestInvestmentService:
         )
         
         assert result is None
-        mock_service.table.update_item.assert_not_called()
+        mock_service.table.get_item.assert_not_called()
+    
+    def test_update_investment_other_error_raised(self, mock_service):
+        """Test errors other than a failed condition still propagate"""
+        mock_service.table.update_item.side_effect = ClientError(
+            {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Slow down'}},
+            'UpdateItem'
+        )
+        
+        with pytest.raises(ClientError):
+            mock_service.update_investment(investment_id="test-id", investment_amount=15000)
     
     def test_delete_investment_found(self, mock_service):
         """Test deleting an existing investment"""
         investment_id = "test-id"
-        mock_service.table.get_item.return_value = {'Item': {'investment_id': investment_id}}
+        mock_service.table.delete_item.return_value = {'Attributes': {'investment_id': investment_id}}
         
         result = mock_service.delete_investment(investment_id)
         
         assert result is True
-        mock_service.table.delete_item.assert_called_once()
+        mock_service.table.delete_item.assert_called_once_with(
+            Key={'investment_id': investment_id},
+            ReturnValues='ALL_OLD'
+        )
+        mock_service.table.get_item.assert_not_called()
     
     def test_delete_investment_not_found(self, mock_service):
         """Test deleting non-existent investment"""
-        mock_service.table.get_item.return_value = {}
+        mock_service.table.delete_item.return_value = {}
         
         result = mock_service.delete_investment("non-existent")
         
         assert result is False
-        mock_service.table.delete_item.assert_not_called()
+        mock_service.table.get_item.assert_not_called()
+    
+    def test_portfolio_view_cached_until_write(self, mock_service):
+        """Test the valued portfolio is reused until a write invalidates it"""
+        _invalidate_valuation_cache()
+        mock_service.table.scan.return_value = {'Items': [
+            {'investment_id': 'id1', 'investment_amount': Decimal('10000'),
+             'investment_date': '2024-01-15', 'annual_return_percentage': Decimal('5')}
+        ]}
+        
+        first = mock_service.get_portfolio_view()
+        assert mock_service.get_portfolio_view() is first
+        assert mock_service.table.scan.call_count == 1
+        assert first.as_of == date.today()
+        
+        mock_service.create_investment(5000, "2024-02-01", 6)
+        
+        assert mock_service.get_portfolio_view() is not first
+        assert mock_service.table.scan.call_count == 2
+    
+    def test_portfolio_view_keyed_on_as_of(self, mock_service):
+        """Test different as-of dates are valued separately"""
+        _invalidate_valuation_cache()
+        mock_service.table.scan.return_value = {'Items': [
+            {'investment_id': 'id1', 'investment_amount': Decimal('10000'),
+             'investment_date': '2023-01-01', 'annual_return_percentage': Decimal('10')}
+        ]}
+        
+        past = mock_service.get_portfolio_view(as_of=date(2023, 1, 1))
+        current = mock_service.get_portfolio_view()
+        
+        assert past.total_current_value == 10000
+        assert current.total_current_value > 10000
+        assert mock_service.table.scan.call_count == 2
+    
+    def test_portfolio_view_expires(self, mock_service):
+        """Test a cached valuation is re-read after the TTL so other instances' writes show up"""
+        _invalidate_valuation_cache()
+        mock_service.table.scan.return_value = {'Items': []}
+        
+        with patch('dynamodb_service.time.monotonic', side_effect=[0.0, 10.0, 40.0]):
+            first = mock_service.get_portfolio_view()
+            assert mock_service.get_portfolio_view() is first
+            assert mock_service.get_portfolio_view() is not first
+        assert mock_service.table.scan.call_count == 2
 
 
 # ==================== Integration Tests ====================
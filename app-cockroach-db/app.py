@@ -14,7 +14,16 @@ from cockroach_service import (
     AuthenticationService,
     calculate_current_value, 
     calculate_profit_loss,
-    calculate_return_percentage
+    calculate_return_percentage,
+    build_portfolio_view
+)
+from portfolio_analytics import (
+    calculate_portfolio_growth,
+    calculate_portfolio_xirr,
+    project_portfolio_monte_carlo,
+    build_real_estate_scenarios,
+    real_estate_scenario,
+    real_estate_break_even_price
 )
 from auth_pages import show_login_page, show_admin_page, show_profile_page
 
@@ -97,6 +106,277 @@ def show_inactive_user_message():
     Please contact an administrator to activate your account.
     """)
 
+
+# Investments per page on the View All, Update and Delete pages
+INVESTMENTS_PAGE_SIZE = 25
+
+
+def show_investments_page(key: str, projection: str = 'full'):
+    """
+    Fetch the current page of investments and draw Previous/Next controls
+    
+    Pages are read with keyset pagination; the session keeps the (date, id)
+    each visited page starts after, so only one page is ever loaded.
+    
+    Args:
+        key: Session-state key holding this view's page cursors
+        projection: Columns to fetch - 'summary', 'valuation' or 'full'
+        
+    Returns:
+        Tuple of (records on the current page, number of records on earlier pages)
+    """
+    cursors = st.session_state.setdefault(key, [None])
+    # One extra row tells whether there is a next page
+    records = st.session_state.service.read_investments_page(
+        after=cursors[-1], limit=INVESTMENTS_PAGE_SIZE + 1, projection=projection
+    )
+    has_next = len(records) > INVESTMENTS_PAGE_SIZE
+    records = records[:INVESTMENTS_PAGE_SIZE]
+    
+    if not records and len(cursors) > 1:
+        # Everything on this page was deleted; go back one
+        cursors.pop()
+        st.rerun()
+    
+    if len(cursors) > 1 or has_next:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("◀ Previous", key=f"{key}_previous", disabled=len(cursors) == 1, use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            st.caption(f"Page {len(cursors)}")
+        with col3:
+            if st.button("Next ▶", key=f"{key}_next", disabled=not has_next, use_container_width=True):
+                cursors.append((records[-1].investment_date, records[-1].investment_id))
+                st.rerun()
+    
+    return records, (len(cursors) - 1) * INVESTMENTS_PAGE_SIZE
+
+# Real estate calculator; a fragment, so changing the market price reruns only this section
+@st.fragment
+def show_real_estate_calculator(portfolio):
+    """Show the real estate vs mutual fund calculator for the valued portfolio"""
+    total_invested = portfolio.total_invested
+    total_current_value = portfolio.total_current_value
+    total_profit_loss = portfolio.total_profit_loss
+    
+    st.markdown("<h3 style='color: #1f2937; margin-top: 30px; margin-bottom: 15px;'>🏠 Real Estate Investment Calculator</h3>", unsafe_allow_html=True)
+    st.markdown("""
+    <p style='color: #666; margin-bottom: 15px; font-size: 14px;'>
+    Track the actual returns from real estate investment in the flat. Keep market price at ₹24,000/Sq Ft to see mutual fund baseline (16% annual return). Enter custom price to see real estate appreciation scenario.
+    </p>
+    """, unsafe_allow_html=True)
+    
+    # Real estate property details
+    property_area_sqft = 3000  # Fixed property area
+    original_price_per_sqft = 24000  # Fixed original price at purchase
+    original_property_value = property_area_sqft * original_price_per_sqft
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Property Area", f"{property_area_sqft:,} Sq Ft")
+    
+    with col2:
+        st.metric("Original Purchase Price/Sq Ft", f"₹{original_price_per_sqft:,}")
+    
+    # Input field for current market price with heading
+    st.markdown("<h4 style='color: #1f2937; margin-top: 20px; margin-bottom: 10px;'>💰 Enter Current Market Price per Sq Ft (₹)</h4>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        current_price_per_sqft = st.number_input(
+            "Enter market price",
+            min_value=0.0,
+            value=float(original_price_per_sqft),
+            step=100.0,
+            format="%.0f",
+            help="Enter current market price per square foot. Keep at 24,000 for mutual fund scenario.",
+            label_visibility="collapsed"
+        )
+    
+    # Every figure below is read off the precomputed scenario grid
+    scenarios = build_real_estate_scenarios(
+        total_invested, total_profit_loss, property_area_sqft, original_price_per_sqft
+    )
+    scenario = real_estate_scenario(scenarios, current_price_per_sqft)
+    
+    with col2:
+        if current_price_per_sqft != original_price_per_sqft:
+            price_change_percent = scenario['price_change_percentage']
+            change_color = "green" if price_change_percent > 0 else "red"
+            st.markdown(f"<p style='color: {change_color}; font-weight: bold; margin-top: 30px;'>{price_change_percent:+.2f}%</p>", unsafe_allow_html=True)
+    
+    # Display Real Estate vs Mutual Fund comparison
+    st.markdown("<h4 style='color: #1f2937; margin-top: 25px; margin-bottom: 15px;'>📊 Scenario Comparison (Your Share - 50%)</h4>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); opacity: 0.9;" style="background: #f0f2f5; border-left: 4px solid #4facfe; padding: 20px; border-radius: 8px; margin-bottom: 20px;">
+            <h5 style="color: #4facfe; margin-top: 0; margin-bottom: 10px;">📈 Mutual Fund Scenario (16% Annual Return)</h5>
+            <p style="margin: 8px 0; font-size: 14px; color: #666;">Invested: ₹{total_invested:,.2f}</p>
+            <p style="margin: 8px 0; font-size: 14px; color: #666;">Current Value: ₹{total_current_value:,.2f}</p>
+            <p style="margin: 8px 0; font-size: 14px; color: #666;">P/L: <span style="color: #43e97b;">₹{total_profit_loss:,.2f}</span></p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Only show real estate scenario if market price is different from original
+    if current_price_per_sqft != original_price_per_sqft:
+        with col2:
+            # Real estate profit based on property appreciation
+            # Profit = (Current Market Price - Original Price) × Property Area
+            property_profit = scenario['property_profit']
+            your_share_profit = scenario['share_profit']  # 50% partner
+            
+            profit_color = "#43e97b" if your_share_profit >= 0 else "#f5576c"
+            profit_color_bg = "#f0f2f5" if your_share_profit >= 0 else "#fff5f5"
+            border_color = "#43e97b" if your_share_profit >= 0 else "#f5576c"
+            
+            st.markdown(f"""
+            <div class="metric-card metric-card-alt2" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); opacity: 0.9;" style="background: {profit_color_bg}; border-left: 4px solid {border_color}; padding: 20px; border-radius: 8px; margin-bottom: 20px;">
+                <h5 style="color: {border_color}; margin-top: 0; margin-bottom: 10px;">🏠 Real Estate Scenario (Market Price)</h5>
+                <p style="margin: 8px 0; font-size: 14px; color: #666;">Invested: ₹{total_invested:,.2f}</p>
+                <p style="margin: 8px 0; font-size: 14px; color: #666;">Current Value: ₹{scenario['share_current_value']:,.2f}</p>
+                <p style="margin: 8px 0; font-size: 14px; color: {border_color};"><strong>P/L: <span style="color: #43e97b;">₹{your_share_profit:,.2f}</span></strong></p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Show YOUR SHARE real estate metrics when custom market price is entered
+        st.markdown("<h4 style='color: #1f2937; margin-top: 25px; margin-bottom: 15px;'>👤 Your Share - Real Estate Investment (50%)</h4>", unsafe_allow_html=True)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        your_share_invested_re = total_invested
+        your_share_current_value_re = scenario['share_current_value']
+        your_share_roi = scenario['share_roi']
+        
+        with col1:
+            st.markdown(f"""
+                <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); opacity: 0.9;">
+                    <div class="metric-label">💰 Total Invested</div>
+                    <div class="metric-value">₹{your_share_invested_re:,.2f}</div>
+                    <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(your_share_invested_re)}</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+                <div class="metric-card metric-card-alt2" style="opacity: 0.9;">
+                    <div class="metric-label">📈 Current Value</div>
+                    <div class="metric-value">₹{your_share_current_value_re:,.2f}</div>
+                    <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(your_share_current_value_re)}</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            profit_card_color = "linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)" if your_share_profit >= 0 else "linear-gradient(135deg, #f5576c 0%, #f93b1d 100%)"
+            st.markdown(f"""
+                <div class="metric-card" style="background: {profit_card_color}; opacity: 0.9;">
+                    <div class="metric-label">📊 Your P/L</div>
+                    <div class="metric-value">₹{your_share_profit:,.2f}</div>
+                    <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(abs(your_share_profit))}</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col4:
+            st.markdown(f"""
+                <div class="metric-card metric-card-alt" style="opacity: 0.9;">
+                    <div class="metric-label">📉 ROI %</div>
+                    <div class="metric-value">{your_share_roi:.2f}%</div>
+                    <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">Your 50% Share</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        # Show overall real estate metrics only when custom market price is entered
+        st.markdown("<h4 style='color: #1f2937; margin-top: 25px; margin-bottom: 15px;'>🌍 Overall Real Estate Investment (100% Partnership)</h4>", unsafe_allow_html=True)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        overall_invested_re = scenario['overall_invested']
+        overall_profit_re = property_profit  # Full property profit (both partners)
+        overall_current_value_re = scenario['overall_current_value']
+        
+        with col1:
+            st.markdown(f"""
+                <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); opacity: 0.9;">
+                    <div class="metric-label">💰 Total Invested</div>
+                    <div class="metric-value">₹{overall_invested_re:,.2f}</div>
+                    <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(overall_invested_re)}</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+                <div class="metric-card metric-card-alt2" style="opacity: 0.9;">
+                    <div class="metric-label">📈 Current Value</div>
+                    <div class="metric-value">₹{overall_current_value_re:,.2f}</div>
+                    <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(overall_current_value_re)}</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            profit_card_color = "linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)" if overall_profit_re >= 0 else "linear-gradient(135deg, #f5576c 0%, #f93b1d 100%)"
+            st.markdown(f"""
+                <div class="metric-card" style="background: {profit_card_color}; opacity: 0.9;">
+                    <div class="metric-label">📊 Total P/L</div>
+                    <div class="metric-value">₹{overall_profit_re:,.2f}</div>
+                    <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(abs(overall_profit_re))}</div>
+                </div>
+            """, unsafe_allow_html=True)
+        
+        with col4:
+            re_roi = scenario['overall_roi']
+            st.markdown(f"""
+                <div class="metric-card metric-card-alt" style="opacity: 0.9;">
+                    <div class="metric-label">📉 ROI %</div>
+                    <div class="metric-value">{re_roi:.2f}%</div>
+                    <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">Overall Partnership</div>
+                </div>
+            """, unsafe_allow_html=True)
+    
+    # Sensitivity of your share's P/L to the market price against the mutual fund baseline
+    fig_sensitivity = go.Figure()
+    fig_sensitivity.add_trace(go.Scatter(
+        x=scenarios['price_per_sqft'],
+        y=scenarios['share_profit'],
+        name='Real Estate P/L (Your Share)',
+        line=dict(color='#667eea', width=3),
+        hovertemplate='₹%{x:,.0f}/Sq Ft<br>P/L: ₹%{y:,.2f}<extra></extra>'
+    ))
+    fig_sensitivity.add_hline(
+        y=total_profit_loss, line_dash="dash", line_color="#43e97b",
+        annotation_text="Mutual Fund P/L"
+    )
+    fig_sensitivity.add_vline(
+        x=current_price_per_sqft, line_dash="dot", line_color="gray",
+        annotation_text="Market Price"
+    )
+    fig_sensitivity.update_layout(
+        title={
+            'text': "Real Estate Price Sensitivity (Your Share)",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 18}
+        },
+        height=400,
+        xaxis_title="Market Price per Sq Ft (₹)",
+        yaxis_title="P/L (₹)",
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    st.plotly_chart(fig_sensitivity, use_container_width=True)
+    
+    break_even_price = real_estate_break_even_price(scenarios)
+    if break_even_price is not None:
+        st.caption(f"Real estate matches the mutual fund P/L at ₹{break_even_price:,.0f}/Sq Ft")
+
 # CockroachDB Configuration from Streamlit Secrets
 # For local development: credentials are read from .streamlit/secrets.toml
 # For Streamlit Cloud: add secrets via the Streamlit Cloud console
@@ -734,34 +1014,16 @@ if selected == "📊 Dashboard":
         show_inactive_user_message()
     else:
         try:
-            investments = st.session_state.service.read_all_investments()
+            # Headline totals come from one aggregate query, so the cards render
+            # before the full valuation that the charts and table need
+            summary = st.session_state.service.get_portfolio_summary()
             
-            if not investments:
+            if summary.count == 0:
                 st.info("📭 No investments found. Create one to get started!")
             else:
-                # Calculate metrics
-                total_invested = 0
-                total_current_value = 0
-                total_profit_loss = 0
-                
-                for inv in investments:
-                    amount = float(inv.get('investment_amount', 0))
-                    annual_return = float(inv.get('annual_return_percentage', 0))
-                    inv_date = inv.get('investment_date')
-                    
-                    # Handle date conversion
-                    if inv_date:
-                        if hasattr(inv_date, 'strftime'):
-                            inv_date_str = inv_date.strftime('%Y-%m-%d')
-                        else:
-                            inv_date_str = str(inv_date)
-                    else:
-                        continue
-                    
-                    total_invested += amount
-                    current_val = calculate_current_value(amount, annual_return, inv_date_str)
-                    total_current_value += current_val
-                    total_profit_loss += calculate_profit_loss(current_val, amount)
+                total_invested = summary.total_invested
+                total_current_value = summary.total_current_value
+                total_profit_loss = summary.total_profit_loss
                 
                 # Display key metrics with custom gradient cards
                 col1, col2, col3, col4 = st.columns(4)
@@ -798,16 +1060,25 @@ if selected == "📊 Dashboard":
                     """, unsafe_allow_html=True)
                 
                 with col4:
-                    roi = calculate_return_percentage(total_current_value, total_invested) if total_invested > 0 else 0
-                    st.markdown(f"""
-                        <div class="metric-card metric-card-alt">
-                            <div class="metric-label">📉 ROI %</div>
-                            <div class="metric-value">{roi:.2f}%</div>
-                        </div>
-                    """, unsafe_allow_html=True)
+                    # Filled in once the XIRR is known
+                    roi_card = st.empty()
                 
                 st.markdown("<br>", unsafe_allow_html=True)
                 
+                # Value the portfolio once; every section below renders from this view
+                portfolio = st.session_state.service.get_portfolio_view()
+                portfolio_xirr, position_xirrs = calculate_portfolio_xirr(portfolio)
+                
+                roi = summary.total_return_percentage
+                xirr_text = f"XIRR {portfolio_xirr:.2f}% p.a." if pd.notna(portfolio_xirr) else "XIRR —"
+                roi_card.markdown(f"""
+                    <div class="metric-card metric-card-alt">
+                        <div class="metric-label">📉 ROI %</div>
+                        <div class="metric-value">{roi:.2f}%</div>
+                        <div style="font-size: 12px; color: rgba(255,255,255,0.85); margin-top: 8px;">{xirr_text}</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
                 # Display overall investment segment (2x the current values for 50% partner)
                 st.markdown("<h3 style='color: #1f2937; margin-top: 20px; margin-bottom: 15px;'>🌍 Overall Investment (100% Partnership)</h3>", unsafe_allow_html=True)
                 
@@ -859,204 +1130,123 @@ if selected == "📊 Dashboard":
                 st.markdown("<br>", unsafe_allow_html=True)
                 
                 # ===== REAL ESTATE INVESTMENT CALCULATOR =====
-                st.markdown("<h3 style='color: #1f2937; margin-top: 30px; margin-bottom: 15px;'>🏠 Real Estate Investment Calculator</h3>", unsafe_allow_html=True)
-                st.markdown("""
-                <p style='color: #666; margin-bottom: 15px; font-size: 14px;'>
-                Track the actual returns from real estate investment in the flat. Keep market price at ₹24,000/Sq Ft to see mutual fund baseline (16% annual return). Enter custom price to see real estate appreciation scenario.
-                </p>
-                """, unsafe_allow_html=True)
-                
-                # Real estate property details
-                property_area_sqft = 3000  # Fixed property area
-                original_price_per_sqft = 24000  # Fixed original price at purchase
-                original_property_value = property_area_sqft * original_price_per_sqft
+                show_real_estate_calculator(portfolio)
                 
-                col1, col2 = st.columns(2)
+                st.markdown("<br>", unsafe_allow_html=True)
                 
-                with col1:
-                    st.metric("Property Area", f"{property_area_sqft:,} Sq Ft")
+                # Prepare detailed data for charts
+                chart_data = [
+                    {
+                        'Date': row.investment_date,
+                        'Invested': row.investment_amount,
+                        'Current': row.current_value,
+                        'Return %': row.annual_return_percentage
+                    }
+                    for row in portfolio.rows
+                ]
                 
-                with col2:
-                    st.metric("Original Purchase Price/Sq Ft", f"₹{original_price_per_sqft:,}")
+                # Create visualizations
+                st.markdown("<h2 style='color: #1f2937; margin-top: 30px;'>📊 Investment Analysis</h2>", unsafe_allow_html=True)
                 
-                # Input field for current market price with heading
-                st.markdown("<h4 style='color: #1f2937; margin-top: 20px; margin-bottom: 10px;'>💰 Enter Current Market Price per Sq Ft (₹)</h4>", unsafe_allow_html=True)
+                # Portfolio growth since the first investment
+                growth_df = calculate_portfolio_growth(portfolio.rows, as_of=portfolio.as_of)
+                if not growth_df.empty:
+                    fig_growth = go.Figure()
+                    fig_growth.add_trace(go.Scatter(
+                        x=growth_df['date'],
+                        y=growth_df['invested'],
+                        name='Invested',
+                        line=dict(color='#667eea', shape='hv'),
+                        hovertemplate='Invested: ₹%{y:,.2f}<extra></extra>'
+                    ))
+                    fig_growth.add_trace(go.Scatter(
+                        x=growth_df['date'],
+                        y=growth_df['current_value'],
+                        name='Current Value',
+                        fill='tonexty',
+                        line=dict(color='#43e97b'),
+                        customdata=growth_df['profit_loss'],
+                        hovertemplate='Value: ₹%{y:,.2f}<br>P/L: ₹%{customdata:,.2f}<extra></extra>'
+                    ))
+                    fig_growth.update_layout(
+                        title={
+                            'text': "Portfolio Growth",
+                            'x': 0.5,
+                            'xanchor': 'center',
+                            'font': {'size': 18}
+                        },
+                        height=450,
+                        hovermode='x unified',
+                        yaxis_title="Amount (₹)",
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        plot_bgcolor='rgba(0,0,0,0)'
+                    )
+                    st.plotly_chart(fig_growth, use_container_width=True)
                 
-                col1, col2 = st.columns([2, 1])
+                # Monte Carlo projection of today's portfolio value
+                st.markdown("<h3 style='color: #1f2937; margin-top: 20px; margin-bottom: 15px;'>🔮 Monte Carlo Projection</h3>", unsafe_allow_html=True)
                 
+                col1, col2, col3 = st.columns(3)
                 with col1:
-                    current_price_per_sqft = st.number_input(
-                        "Enter market price",
+                    projection_years = st.slider("Projection horizon (years)", min_value=1, max_value=30, value=10)
+                with col2:
+                    volatility_percentage = st.number_input(
+                        "Annual volatility (%)",
                         min_value=0.0,
-                        value=float(original_price_per_sqft),
-                        step=100.0,
-                        format="%.0f",
-                        help="Enter current market price per square foot. Keep at 24,000 for mutual fund scenario.",
-                        label_visibility="collapsed"
+                        max_value=100.0,
+                        value=15.0,
+                        step=1.0,
+                        help="Standard deviation of each year's return around the investment's annual return"
                     )
+                with col3:
+                    n_paths = st.selectbox("Scenarios", [1_000, 10_000, 100_000], index=1, format_func=lambda n: f"{n:,}")
                 
-                with col2:
-                    if current_price_per_sqft != original_price_per_sqft:
-                        price_change_percent = ((current_price_per_sqft - original_price_per_sqft) / original_price_per_sqft) * 100
-                        change_color = "green" if price_change_percent > 0 else "red"
-                        st.markdown(f"<p style='color: {change_color}; font-weight: bold; margin-top: 30px;'>{price_change_percent:+.2f}%</p>", unsafe_allow_html=True)
-                
-                # Display Real Estate vs Mutual Fund comparison
-                st.markdown("<h4 style='color: #1f2937; margin-top: 25px; margin-bottom: 15px;'>📊 Scenario Comparison (Your Share - 50%)</h4>", unsafe_allow_html=True)
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); opacity: 0.9;" style="background: #f0f2f5; border-left: 4px solid #4facfe; padding: 20px; border-radius: 8px; margin-bottom: 20px;">
-                        <h5 style="color: #4facfe; margin-top: 0; margin-bottom: 10px;">📈 Mutual Fund Scenario (16% Annual Return)</h5>
-                        <p style="margin: 8px 0; font-size: 14px; color: #666;">Invested: ₹{total_invested:,.2f}</p>
-                        <p style="margin: 8px 0; font-size: 14px; color: #666;">Current Value: ₹{total_current_value:,.2f}</p>
-                        <p style="margin: 8px 0; font-size: 14px; color: #666;">P/L: <span style="color: #43e97b;">₹{total_profit_loss:,.2f}</span></p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Only show real estate scenario if market price is different from original
-                if current_price_per_sqft != original_price_per_sqft:
-                    with col2:
-                        # Calculate real estate profit based on property appreciation
-                        # Profit = (Current Market Price - Original Price) × Property Area
-                        property_profit = (current_price_per_sqft - original_price_per_sqft) * property_area_sqft
-                        your_share_profit = property_profit / 2  # 50% partner
-                        
-                        profit_color = "#43e97b" if your_share_profit >= 0 else "#f5576c"
-                        profit_color_bg = "#f0f2f5" if your_share_profit >= 0 else "#fff5f5"
-                        border_color = "#43e97b" if your_share_profit >= 0 else "#f5576c"
-                        
-                        st.markdown(f"""
-                        <div class="metric-card metric-card-alt2" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); opacity: 0.9;" style="background: {profit_color_bg}; border-left: 4px solid {border_color}; padding: 20px; border-radius: 8px; margin-bottom: 20px;">
-                            <h5 style="color: {border_color}; margin-top: 0; margin-bottom: 10px;">🏠 Real Estate Scenario (Market Price)</h5>
-                            <p style="margin: 8px 0; font-size: 14px; color: #666;">Invested: ₹{total_invested:,.2f}</p>
-                            <p style="margin: 8px 0; font-size: 14px; color: #666;">Current Value: ₹{total_invested + your_share_profit:,.2f}</p>
-                            <p style="margin: 8px 0; font-size: 14px; color: {border_color};"><strong>P/L: <span style="color: #43e97b;">₹{your_share_profit:,.2f}</span></strong></p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Show YOUR SHARE real estate metrics when custom market price is entered
-                    st.markdown("<h4 style='color: #1f2937; margin-top: 25px; margin-bottom: 15px;'>👤 Your Share - Real Estate Investment (50%)</h4>", unsafe_allow_html=True)
-                    
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    your_share_invested_re = total_invested
-                    your_share_current_value_re = your_share_invested_re + your_share_profit
-                    your_share_roi = (your_share_profit / your_share_invested_re * 100) if your_share_invested_re > 0 else 0
-                    
-                    with col1:
-                        st.markdown(f"""
-                            <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); opacity: 0.9;">
-                                <div class="metric-label">💰 Total Invested</div>
-                                <div class="metric-value">₹{your_share_invested_re:,.2f}</div>
-                                <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(your_share_invested_re)}</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown(f"""
-                            <div class="metric-card metric-card-alt2" style="opacity: 0.9;">
-                                <div class="metric-label">📈 Current Value</div>
-                                <div class="metric-value">₹{your_share_current_value_re:,.2f}</div>
-                                <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(your_share_current_value_re)}</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        profit_card_color = "linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)" if your_share_profit >= 0 else "linear-gradient(135deg, #f5576c 0%, #f93b1d 100%)"
-                        st.markdown(f"""
-                            <div class="metric-card" style="background: {profit_card_color}; opacity: 0.9;">
-                                <div class="metric-label">📊 Your P/L</div>
-                                <div class="metric-value">₹{your_share_profit:,.2f}</div>
-                                <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(abs(your_share_profit))}</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col4:
-                        st.markdown(f"""
-                            <div class="metric-card metric-card-alt" style="opacity: 0.9;">
-                                <div class="metric-label">📉 ROI %</div>
-                                <div class="metric-value">{your_share_roi:.2f}%</div>
-                                <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">Your 50% Share</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    
-                    # Show overall real estate metrics only when custom market price is entered
-                    st.markdown("<h4 style='color: #1f2937; margin-top: 25px; margin-bottom: 15px;'>🌍 Overall Real Estate Investment (100% Partnership)</h4>", unsafe_allow_html=True)
-                    
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    overall_invested_re = total_invested * 2
-                    overall_profit_re = property_profit  # Full property profit (both partners)
-                    overall_current_value_re = overall_invested_re + overall_profit_re
-                    
-                    with col1:
-                        st.markdown(f"""
-                            <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); opacity: 0.9;">
-                                <div class="metric-label">💰 Total Invested</div>
-                                <div class="metric-value">₹{overall_invested_re:,.2f}</div>
-                                <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(overall_invested_re)}</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown(f"""
-                            <div class="metric-card metric-card-alt2" style="opacity: 0.9;">
-                                <div class="metric-label">📈 Current Value</div>
-                                <div class="metric-value">₹{overall_current_value_re:,.2f}</div>
-                                <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(overall_current_value_re)}</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        profit_card_color = "linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)" if overall_profit_re >= 0 else "linear-gradient(135deg, #f5576c 0%, #f93b1d 100%)"
-                        st.markdown(f"""
-                            <div class="metric-card" style="background: {profit_card_color}; opacity: 0.9;">
-                                <div class="metric-label">📊 Total P/L</div>
-                                <div class="metric-value">₹{overall_profit_re:,.2f}</div>
-                                <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">{number_to_words(abs(overall_profit_re))}</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col4:
-                        re_roi = (overall_profit_re / overall_invested_re * 100) if overall_invested_re > 0 else 0
-                        st.markdown(f"""
-                            <div class="metric-card metric-card-alt" style="opacity: 0.9;">
-                                <div class="metric-label">📉 ROI %</div>
-                                <div class="metric-value">{re_roi:.2f}%</div>
-                                <div style="font-size: 11px; color: rgba(255,255,255,0.85); margin-top: 8px;">Overall Partnership</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                
-                st.markdown("<br>", unsafe_allow_html=True)
+                projection_df = project_portfolio_monte_carlo(
+                    portfolio,
+                    years=projection_years,
+                    volatility_percentage=volatility_percentage,
+                    n_paths=n_paths
+                )
                 
-                # Prepare detailed data for charts
-                chart_data = []
-                for inv in investments:
-                    inv_date = inv.get('investment_date')
-                    if inv_date:
-                        if hasattr(inv_date, 'strftime'):
-                            inv_date_str = inv_date.strftime('%Y-%m-%d')
-                        else:
-                            inv_date_str = str(inv_date)
-                        
-                        amount = float(inv.get('investment_amount', 0))
-                        annual_return = float(inv.get('annual_return_percentage', 0))
-                        current_val = calculate_current_value(amount, annual_return, inv_date_str)
-                        
-                        chart_data.append({
-                            'Date': inv_date_str,
-                            'Invested': amount,
-                            'Current': current_val,
-                            'Return %': annual_return
-                        })
+                fig_projection = go.Figure()
+                for upper, lower, band_name, band_color in [
+                    ('p95', 'p5', '5th-95th percentile', 'rgba(102, 126, 234, 0.2)'),
+                    ('p75', 'p25', '25th-75th percentile', 'rgba(102, 126, 234, 0.4)')
+                ]:
+                    fig_projection.add_trace(go.Scatter(
+                        x=projection_df['year'], y=projection_df[upper],
+                        line=dict(width=0), showlegend=False, hoverinfo='skip'
+                    ))
+                    fig_projection.add_trace(go.Scatter(
+                        x=projection_df['year'], y=projection_df[lower],
+                        fill='tonexty', fillcolor=band_color, line=dict(width=0), name=band_name,
+                        hoverinfo='skip'
+                    ))
+                fig_projection.add_trace(go.Scatter(
+                    x=projection_df['year'], y=projection_df['p50'], name='Median',
+                    line=dict(color='#667eea', width=3),
+                    hovertemplate='Year %{x}: ₹%{y:,.0f}<extra>Median</extra>'
+                ))
+                fig_projection.add_trace(go.Scatter(
+                    x=projection_df['year'], y=projection_df['deterministic'], name='Compounded at annual return',
+                    line=dict(color='#43e97b', dash='dash'),
+                    hovertemplate='Year %{x}: ₹%{y:,.0f}<extra>Compounded</extra>'
+                ))
+                fig_projection.update_layout(
+                    height=450,
+                    xaxis_title="Years from today",
+                    yaxis_title="Portfolio Value (₹)",
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)'
+                )
+                st.plotly_chart(fig_projection, use_container_width=True)
                 
-                # Create visualizations
-                st.markdown("<h2 style='color: #1f2937; margin-top: 30px;'>📊 Investment Analysis</h2>", unsafe_allow_html=True)
+                final_year = projection_df.iloc[-1]
+                st.caption(
+                    f"After {projection_years} years: median ₹{final_year['p50']:,.0f}, "
+                    f"5th-95th percentile ₹{final_year['p5']:,.0f} - ₹{final_year['p95']:,.0f} "
+                    f"({n_paths:,} scenarios)"
+                )
                 
                 # Create a single sunburst/circle chart showing Total Invested, Current Value, and P/L
                 if chart_data:
@@ -1097,34 +1287,32 @@ if selected == "📊 Dashboard":
                     <p style='color: #666; margin-bottom: 20px;'>Complete list of all your investments</p>
                 """, unsafe_allow_html=True)
                 
-                # Display investments table
-                display_data = []
-                for inv in investments:
-                    inv_date = inv.get('investment_date')
-                    if inv_date:
-                        if hasattr(inv_date, 'strftime'):
-                            inv_date_str = inv_date.strftime('%Y-%m-%d')
-                        else:
-                            inv_date_str = str(inv_date)
-                        
-                        amount = float(inv.get('investment_amount', 0))
-                        annual_return = float(inv.get('annual_return_percentage', 0))
-                        current_val = calculate_current_value(amount, annual_return, inv_date_str)
-                        profit_loss = calculate_profit_loss(current_val, amount)
-                        roi = calculate_return_percentage(current_val, amount)
-                        
-                        display_data.append({
-                            'Amount': f"₹{amount:,.2f}",
-                            'Date': inv_date_str,
-                            'Annual Return %': f"{annual_return:.2f}%",
-                            'Current Value': f"₹{current_val:,.2f}",
-                            'P/L': f"₹{profit_loss:,.2f}",
-                            'ROI %': f"{roi:.2f}%",
-                            'Comments': inv.get('investment_comments', 'N/A')
-                        })
-                
-                df = pd.DataFrame(display_data)
-                st.dataframe(df, use_container_width=True)
+                # Display investments table; columns stay numeric so they sort
+                # by value, and column_config handles the formatting
+                rows = portfolio.rows
+                df = pd.DataFrame({
+                    'Amount': [row.investment_amount for row in rows],
+                    'Date': pd.to_datetime([row.investment_date for row in rows]),
+                    'Annual Return %': [row.annual_return_percentage for row in rows],
+                    'Current Value': [row.current_value for row in rows],
+                    'P/L': [row.profit_loss for row in rows],
+                    'ROI %': [row.return_percentage for row in rows],
+                    'XIRR %': position_xirrs,
+                    'Comments': [row.investment_comments for row in rows]
+                })
+                st.dataframe(
+                    df,
+                    use_container_width=True,
+                    column_config={
+                        'Amount': st.column_config.NumberColumn("Amount (₹)", format="localized"),
+                        'Date': st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+                        'Annual Return %': st.column_config.NumberColumn(format="%.2f%%"),
+                        'Current Value': st.column_config.NumberColumn("Current Value (₹)", format="localized"),
+                        'P/L': st.column_config.NumberColumn("P/L (₹)", format="localized"),
+                        'ROI %': st.column_config.NumberColumn(format="%.2f%%"),
+                        'XIRR %': st.column_config.NumberColumn(format="%.2f%%")
+                    }
+                )
         
         except Exception as e:
             st.error(f"❌ Error loading dashboard: {str(e)}")
@@ -1204,47 +1392,35 @@ elif selected == "👁️ View All":
         st.header("All Investments")
         
         try:
-            investments = st.session_state.service.read_all_investments()
+            records, offset = show_investments_page("view_all_cursors")
+            portfolio = build_portfolio_view(records)
             
-            if not investments:
+            if not portfolio.rows:
                 st.info("📭 No investments found. Create one to get started!")
             else:
                 # Display investments in an expandable format
-                for idx, inv in enumerate(investments, 1):
-                    inv_date = inv.get('investment_date')
-                    if inv_date:
-                        if hasattr(inv_date, 'strftime'):
-                            inv_date_str = inv_date.strftime('%Y-%m-%d')
-                        else:
-                            inv_date_str = str(inv_date)
+                for idx, row in enumerate(portfolio.rows, offset + 1):
+                    with st.expander(f"💼 Investment {idx} - ₹{row.investment_amount:,.2f} ({row.investment_date})", expanded=False):
+                        col1, col2, col3 = st.columns(3)
                         
-                        amount = float(inv.get('investment_amount', 0))
-                        annual_return = float(inv.get('annual_return_percentage', 0))
-                        current_val = calculate_current_value(amount, annual_return, inv_date_str)
-                        profit_loss = calculate_profit_loss(current_val, amount)
-                        roi = calculate_return_percentage(current_val, amount)
+                        with col1:
+                            st.metric("Investment Amount", f"₹{row.investment_amount:,.2f}")
+                        with col2:
+                            st.metric("Current Value", f"₹{row.current_value:,.2f}")
+                        with col3:
+                            st.metric("P/L", f"₹{row.profit_loss:,.2f}")
                         
-                        with st.expander(f"💼 Investment {idx} - ₹{amount:,.2f} ({inv_date_str})", expanded=False):
-                            col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                st.metric("Investment Amount", f"₹{amount:,.2f}")
-                            with col2:
-                                st.metric("Current Value", f"₹{current_val:,.2f}")
-                            with col3:
-                                st.metric("P/L", f"₹{profit_loss:,.2f}")
-                            
-                            col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                st.metric("Annual Return %", f"{annual_return:.2f}%")
-                            with col2:
-                                st.metric("ROI %", f"{roi:.2f}%")
-                            with col3:
-                                st.metric("Investment Date", inv_date_str)
-                            
-                            if inv.get('investment_comments'):
-                                st.markdown(f"**Notes:** {inv.get('investment_comments')}")
+                        col1, col2, col3 = st.columns(3)
+                        
+                        with col1:
+                            st.metric("Annual Return %", f"{row.annual_return_percentage:.2f}%")
+                        with col2:
+                            st.metric("ROI %", f"{row.return_percentage:.2f}%")
+                        with col3:
+                            st.metric("Investment Date", str(row.investment_date))
+                        
+                        if row.investment_comments:
+                            st.markdown(f"**Notes:** {row.investment_comments}")
         
         except Exception as e:
             st.error(f"❌ Error loading investments: {str(e)}")
@@ -1259,22 +1435,16 @@ elif selected == "✏️ Update":
         st.header("Update Investment")
         
         try:
-            investments = st.session_state.service.read_all_investments()
+            records, _ = show_investments_page("update_cursors", projection='summary')
             
-            if not investments:
+            if not records:
                 st.info("📭 No investments found to update!")
             else:
                 # Create selection options
-                investment_options = {}
-                for inv in investments:
-                    inv_date = inv.get('investment_date')
-                    if inv_date:
-                        if hasattr(inv_date, 'strftime'):
-                            inv_date_str = inv_date.strftime('%Y-%m-%d')
-                        else:
-                            inv_date_str = str(inv_date)
-                        amount = float(inv.get('investment_amount', 0))
-                        investment_options[f"₹{amount:,.2f} - {inv_date_str}"] = inv['investment_id']
+                investment_options = {
+                    f"₹{row.investment_amount:,.2f} - {row.investment_date}": row.investment_id
+                    for row in records
+                }
                 
                 selected_display = st.selectbox(
                     "Select an investment to update",
@@ -1360,24 +1530,18 @@ elif selected == "🗑️ Delete":
         st.header("Delete Investment")
         
         try:
-            investments = st.session_state.service.read_all_investments()
+            records, _ = show_investments_page("delete_cursors", projection='summary')
             
-            if not investments:
+            if not records:
                 st.info("📭 No investments found to delete!")
             else:
                 col1, col2 = st.columns([3, 1])
                 
                 with col1:
-                    investment_options = {}
-                    for inv in investments:
-                        inv_date = inv.get('investment_date')
-                        if inv_date:
-                            if hasattr(inv_date, 'strftime'):
-                                inv_date_str = inv_date.strftime('%Y-%m-%d')
-                            else:
-                                inv_date_str = str(inv_date)
-                            amount = float(inv.get('investment_amount', 0))
-                            investment_options[f"₹{amount:,.2f} - {inv_date_str}"] = inv['investment_id']
+                    investment_options = {
+                        f"₹{row.investment_amount:,.2f} - {row.investment_date}": row.investment_id
+                        for row in records
+                    }
                     
                     selected_display = st.selectbox(
                         "Select an investment to delete",
@@ -1387,7 +1551,7 @@ elif selected == "🗑️ Delete":
                 
                 if selected_display:
                     selected_id = investment_options[selected_display]
-                    inv = st.session_state.service.read_investment(selected_id)
+                    inv = st.session_state.service.read_investment(selected_id, projection='summary')
                     
                     if inv:
                         st.warning(f"""
@@ -0,0 +1,242 @@
+"""
+Benchmark the investment date index layouts on CockroachDB
+
+Compares the date indexes the schema had before migration 4 (sequential
+idx_investment_date and idx_investment_date_id) with the index set migrations
+produce now (one hash-sharded covering idx_investment_date_id_hash), on scratch
+tables shaped like investment:
+
+- insert throughput: concurrent writers inserting recent-dated rows, the pattern
+  that sends every write to the same range when an index key is sequential
+- scan latency: the date-ordered valuation scan, and whether its plan needs an
+  index join back to the primary key
+- page latency: the first keyset page of read_investments_page
+
+    python benchmark_indexes.py --rows 20000 --writers 8 --scans 20
+
+Connects with the same settings as the app. The write hotspot only shows on a
+multi-node cluster; on a single node the insert numbers stay close and the scan
+difference comes from the index join.
+"""
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from psycopg2 import extras
+
+from cockroach_service import InvestmentService, close_connection_pools
+
+# Indexes on the scratch table for each layout; {table} is substituted. Keep
+# 'hash_sharded' in step with the date indexes migrations.py leaves in place
+LAYOUTS = {
+    'sequential': (
+        "CREATE INDEX {table}_date ON {table} (investment_date)",
+        "CREATE INDEX {table}_date_id ON {table} (investment_date DESC, investment_id)",
+    ),
+    'hash_sharded': (
+        "CREATE INDEX {table}_date_id ON {table} (investment_date DESC, investment_id) "
+        "USING HASH STORING (investment_amount, annual_return_percentage)",
+    ),
+}
+
+SCAN_QUERY = """
+    SELECT investment_amount, investment_date, annual_return_percentage
+    FROM {table}
+    WHERE investment_date >= %s
+    ORDER BY investment_date DESC
+"""
+
+PAGE_QUERY = """
+    SELECT investment_id, investment_amount, investment_date, annual_return_percentage
+    FROM {table}
+    ORDER BY investment_date DESC, investment_id
+    LIMIT 50
+"""
+
+
+def create_table(service: InvestmentService, table: str, layout: str):
+    """
+    Create an empty scratch copy of the investment table with a layout's date indexes
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        layout: Key of LAYOUTS
+    """
+    service.pool.run_statement(f"DROP TABLE IF EXISTS {table}")
+    service.pool.run_statement(f"""
+        CREATE TABLE {table} (
+            investment_id UUID PRIMARY KEY,
+            investment_amount DECIMAL(15, 2) NOT NULL,
+            investment_date DATE NOT NULL,
+            annual_return_percentage DECIMAL(5, 2) NOT NULL,
+            investment_comments TEXT,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    for statement in LAYOUTS[layout]:
+        service.pool.run_statement(statement.format(table=table))
+
+
+def insert_rows(service: InvestmentService, table: str, rows: int, writers: int,
+                batch_size: int, days: int) -> float:
+    """
+    Insert rows from concurrent writers, each committing one batch per transaction
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        rows: Total rows to insert
+        writers: Number of writer threads
+        batch_size: Rows per INSERT transaction
+        days: Investment dates are spread over this many days ending today
+    
+    Returns:
+        Rows inserted per second
+    """
+    today = date.today()
+    insert_query = f"""
+        INSERT INTO {table} (investment_id, investment_amount, investment_date,
+                             annual_return_percentage, investment_comments)
+        VALUES %s
+    """
+    errors = []
+    
+    def writer(count: int):
+        rng = random.Random()
+        try:
+            for start in range(0, count, batch_size):
+                batch = [
+                    (str(uuid.uuid4()), round(rng.uniform(1000, 500000), 2),
+                     today - timedelta(days=rng.randrange(days)), round(rng.uniform(0, 15), 2), "")
+                    for _ in range(min(batch_size, count - start))
+                ]
+                service.pool.run_transaction(lambda cursor: extras.execute_values(cursor, insert_query, batch))
+        except Exception as e:
+            errors.append(e)
+    
+    counts = [rows // writers + (1 if i < rows % writers else 0) for i in range(writers)]
+    threads = [threading.Thread(target=writer, args=(count,)) for count in counts]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    if errors:
+        raise errors[0]
+    return rows / elapsed
+
+
+def query_latencies(service: InvestmentService, query: str, params: tuple, runs: int) -> Dict:
+    """
+    Time a read query
+    
+    Args:
+        service: Connected InvestmentService
+        query: Query to run
+        params: Query parameters
+        runs: Number of timed runs
+    
+    Returns:
+        Dict with p50/p95 latency in milliseconds, rows returned and whether the plan
+        joins back to the primary index
+    """
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN " + query, params)
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+        
+        latencies = []
+        row_count = 0
+        for _ in range(runs):
+            started = time.perf_counter()
+            cursor.execute(query, params)
+            row_count = len(cursor.fetchall())
+            latencies.append((time.perf_counter() - started) * 1000)
+        connection.commit()
+        cursor.close()
+    
+    latencies.sort()
+    return {
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'rows': row_count,
+        'index_join': 'index join' in plan,
+    }
+
+
+def read_latencies(service: InvestmentService, table: str, scans: int, days: int) -> Dict:
+    """
+    Time the valuation scan over the most recent quarter of the date range, and the first keyset page
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        scans: Number of timed runs of each query
+        days: Date spread used when inserting
+    
+    Returns:
+        Dict with the scan's query_latencies() results, plus the page's p50 latency as page_p50_ms
+    """
+    since = date.today() - timedelta(days=max(days // 4, 1))
+    service.pool.run_statement(f"ANALYZE {table}")
+    scan = query_latencies(service, SCAN_QUERY.format(table=table), (since,), scans)
+    page = query_latencies(service, PAGE_QUERY.format(table=table), (), scans)
+    return dict(scan, page_p50_ms=page['p50_ms'])
+
+
+def drop_table(service: InvestmentService, table: str):
+    """Drop a scratch table"""
+    service.pool.run_statement(f"DROP TABLE IF EXISTS {table}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs hash-sharded investment date indexes")
+    parser.add_argument("--rows", type=int, default=20000, help="rows inserted per layout")
+    parser.add_argument("--writers", type=int, default=8, help="concurrent writer threads")
+    parser.add_argument("--batch-size", type=int, default=100, help="rows per insert transaction")
+    parser.add_argument("--days", type=int, default=30, help="spread of investment dates, ending today")
+    parser.add_argument("--scans", type=int, default=20, help="timed runs of the scan query")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch tables afterwards")
+    args = parser.parse_args(argv)
+    
+    service = InvestmentService()
+    max_size = service.pool.stats()['max_size']
+    if args.writers > max_size:
+        parser.error(f"--writers {args.writers} exceeds pool_max_size {max_size}")
+    
+    results = {}
+    try:
+        for layout in LAYOUTS:
+            table = f"bench_investment_{layout}"
+            print(f"⏳ {layout}: inserting {args.rows} rows with {args.writers} writers...")
+            create_table(service, table, layout)
+            throughput = insert_rows(service, table, args.rows, args.writers, args.batch_size, args.days)
+            results[layout] = dict(read_latencies(service, table, args.scans, args.days), rows_per_s=throughput)
+            if not args.keep:
+                drop_table(service, table)
+    finally:
+        service.close()
+        close_connection_pools()
+    
+    print()
+    print(f"{'layout':<14} {'inserts/s':>10} {'scan p50 ms':>12} {'scan p95 ms':>12} {'rows':>8}  "
+          f"{'index join':<10} {'page p50 ms':>12}")
+    for layout, result in results.items():
+        print(f"{layout:<14} {result['rows_per_s']:>10.0f} {result['p50_ms']:>12.1f} {result['p95_ms']:>12.1f} "
+              f"{result['rows']:>8}  {'yes' if result['index_join'] else 'no':<10} {result['page_p50_ms']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,472 @@
 """
 CockroachDB service module for Investment table operations using PostgreSQL driver
+
+The schema is managed by migrations.py, which is run at deploy time.
 """
 import psycopg2
-from psycopg2 import Error, extras
+from psycopg2 import Error, errors, extensions, extras, pool
 import uuid
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, date
+from typing import Callable, List, Dict, Optional, NamedTuple, Tuple, Union
+from contextlib import contextmanager
+from dataclasses import dataclass
+import numpy as np
 import logging
+import random
+import threading
+import time
 import streamlit as st
 import os
 
 logger = logging.getLogger(__name__)
 
-# Track if tables have been created to avoid running on every initialization
-_tables_created = {
-    'investment': False,
-    'users': False
+# Process-wide valuation cache keyed on (as-of date, data version). Writes from
+# this process bump the version; entries also expire after _VALUATION_CACHE_TTL
+# seconds so writes from other app instances and direct loads show up too.
+_valuation_cache = {}
+_valuation_cache_lock = threading.Lock()
+_data_version = 0
+_VALUATION_CACHE_SIZE = 16
+_VALUATION_CACHE_TTL = 30.0
+
+# Monotonic time of this process's last write; stale reads are skipped until the
+# staleness window has passed it so a session always sees its own writes
+_last_write_at = float('-inf')
+
+# follower_read_timestamp() trails the present by roughly 4.8s with default cluster settings
+_FOLLOWER_READ_LAG = 5.0
+
+# Columns fetched by each read projection: 'summary' for pickers and labels,
+# 'valuation' for everything the calculations need, 'full' for the whole row
+_PROJECTIONS = {
+    'summary': ('investment_id', 'investment_amount', 'investment_date'),
+    'valuation': ('investment_id', 'investment_amount', 'investment_date', 'annual_return_percentage'),
+    'full': ('investment_id', 'investment_amount', 'investment_date', 'annual_return_percentage',
+             'investment_comments', 'created_at', 'updated_at'),
+}
+
+# Typed-record reads cast in SQL so no Decimal or UUID objects are built
+_RECORD_COLUMN_CASTS = {
+    'investment_id': 'investment_id::STRING',
+    'investment_amount': 'investment_amount::FLOAT8',
+    'annual_return_percentage': 'annual_return_percentage::FLOAT8',
 }
 
+
+def _projection_columns(projection: str) -> Tuple[str, ...]:
+    """
+    Look up the columns of a read projection
+    
+    Args:
+        projection: One of 'summary', 'valuation' or 'full'
+        
+    Returns:
+        Column names in select order
+    """
+    try:
+        return _PROJECTIONS[projection]
+    except KeyError:
+        raise ValueError(f"Unknown projection {projection!r}; expected one of {', '.join(_PROJECTIONS)}") from None
+
+
+def _invalidate_valuation_cache():
+    """Bump the data version and drop cached valuations after a write"""
+    global _data_version, _last_write_at
+    with _valuation_cache_lock:
+        _data_version += 1
+        _last_write_at = time.monotonic()
+        _valuation_cache.clear()
+
+
+def _cached_valuation(as_of: date, build: Optional[Callable[[], 'PortfolioView']] = None) -> Optional['PortfolioView']:
+    """
+    Look up the cached valuation for a date, building and caching it on a miss
+    
+    Args:
+        as_of: Valuation date
+        build: Builds the valuation on a miss (optional; without it a miss returns None)
+        
+    Returns:
+        The cached or newly built PortfolioView, or None on a miss without build
+    """
+    started = time.monotonic()
+    with _valuation_cache_lock:
+        key = (as_of, _data_version)
+        entry = _valuation_cache.get(key)
+    if entry is not None and started - entry[1] < _VALUATION_CACHE_TTL:
+        return entry[0]
+    if build is None:
+        return None
+    
+    portfolio = build()
+    
+    with _valuation_cache_lock:
+        # Skip caching if a write bumped the version while records were read
+        if key[1] == _data_version:
+            _valuation_cache.pop(key, None)
+            if len(_valuation_cache) >= _VALUATION_CACHE_SIZE:
+                _valuation_cache.pop(next(iter(_valuation_cache)))
+            # Aged from when the read started, so the TTL bounds how stale the data is
+            _valuation_cache[key] = (portfolio, started)
+    return portfolio
+
+
+# Process-wide connection pools keyed on (database_url, sslcert), shared by every
+# session's InvestmentService and AuthenticationService
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+# Pool defaults, overridable under [cockroachdb] in secrets.toml
+_POOL_DEFAULTS = {
+    'pool_min_size': 1,
+    'pool_max_size': 10,
+    'pool_timeout': 10.0,
+    'pool_health_check_interval': 30.0,
+    'transaction_max_retries': 5
+}
+
+# Backoff between transaction retries: full jitter over an exponential window
+_RETRY_BACKOFF_BASE = 0.05
+_RETRY_BACKOFF_CAP = 2.0
+
+
+class CockroachConnectionPool:
+    """
+    Thread-safe CockroachDB connection pool shared across Streamlit sessions
+    
+    Wraps psycopg2's ThreadedConnectionPool, which raises as soon as it is
+    exhausted, with a semaphore so callers wait up to ``timeout`` seconds for a
+    free connection. Connections idle for longer than ``health_check_interval``
+    are pinged before being handed out, and broken ones are replaced.
+    """
+    
+    def __init__(self, database_url: str, sslcert: Optional[str] = None, min_size: int = 1,
+                 max_size: int = 10, timeout: float = 10.0, health_check_interval: float = 30.0,
+                 max_retries: int = 5):
+        """
+        Open the pool and its first ``min_size`` connections
+        
+        Args:
+            database_url: PostgreSQL connection string
+            sslcert: Path to the CA certificate used for verify-full TLS (optional)
+            min_size: Connections opened up front and kept open when idle
+            max_size: Upper bound on open connections
+            timeout: Seconds to wait for a free connection before raising PoolError
+            health_check_interval: Idle seconds after which a connection is pinged before reuse
+            max_retries: Retries of a transaction that fails with a serialization error (40001)
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        
+        connect_kwargs = {'connect_timeout': 10}
+        if sslcert and os.path.exists(sslcert):
+            connect_kwargs.update(sslmode='verify-full', sslrootcert=sslcert)
+        
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_retries = max_retries
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._stats = {
+            'checkouts': 0, 'waits': 0, 'timeouts': 0, 'health_check_failures': 0,
+            'transactions': 0, 'transaction_retries': 0, 'transactions_retried': 0,
+            'transaction_retries_exhausted': 0
+        }
+        
+        try:
+            self._pool = pool.ThreadedConnectionPool(min_size, max_size, database_url, **connect_kwargs)
+            logger.info(f"CockroachDB connection pool opened (min={min_size}, max={max_size})")
+        except Error as e:
+            logger.error(f"Error opening CockroachDB connection pool: {e}")
+            raise
+    
+    def _is_healthy(self, connection) -> bool:
+        """Switch a connection to autocommit and ping it if it has sat idle past the health-check interval"""
+        if connection.closed:
+            return False
+        try:
+            # Before the ping: psycopg2 would otherwise wrap it in a transaction,
+            # and autocommit can't be changed inside one
+            connection.autocommit = True
+        except Error as e:
+            logger.warning(f"Discarding unusable CockroachDB connection: {e}")
+            return False
+        idle_since = self._last_used.get(id(connection))
+        if idle_since is not None and time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            return True
+        except Error as e:
+            logger.warning(f"Discarding unhealthy CockroachDB connection: {e}")
+            return False
+    
+    def getconn(self):
+        """
+        Borrow a connection, waiting up to the pool timeout for a free slot
+        
+        Returns:
+            An autocommit psycopg2 connection; hand it back with putconn()
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['waits'] += 1
+            if not self._slots.acquire(timeout=self.timeout):
+                with self._lock:
+                    self._stats['timeouts'] += 1
+                logger.error(f"Timed out after {self.timeout}s waiting for a CockroachDB connection")
+                raise pool.PoolError(f"Timed out after {self.timeout}s waiting for a database connection")
+        
+        connection = None
+        try:
+            while True:
+                connection = self._pool.getconn()
+                if self._is_healthy(connection):
+                    break
+                with self._lock:
+                    self._stats['health_check_failures'] += 1
+                    self._last_used.pop(id(connection), None)
+                self._pool.putconn(connection, close=True)
+                connection = None
+        except Exception:
+            if connection is not None:
+                self._pool.putconn(connection, close=True)
+            self._slots.release()
+            raise
+        
+        with self._lock:
+            self._stats['checkouts'] += 1
+        return connection
+    
+    def putconn(self, connection):
+        """Return a borrowed connection, closing it if it was broken while in use"""
+        broken = bool(connection.closed)
+        if not broken:
+            # Roll back anything left open and restore autocommit for the next borrower
+            try:
+                if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+                connection.autocommit = True
+            except Error:
+                broken = True
+        
+        with self._lock:
+            if broken:
+                self._last_used.pop(id(connection), None)
+            else:
+                self._last_used[id(connection)] = time.monotonic()
+        try:
+            self._pool.putconn(connection, close=broken)
+        finally:
+            self._slots.release()
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        connection = self.getconn()
+        try:
+            yield connection
+        finally:
+            self.putconn(connection)
+    
+    def run_transaction(self, work: Callable, cursor_factory=None, max_retries: Optional[int] = None):
+        """
+        Run ``work(cursor)`` in a transaction, retrying on CockroachDB serialization errors
+        
+        Uses the ``cockroach_restart`` savepoint protocol: a 40001 error rolls back
+        to the savepoint and the work is re-run after an exponential backoff with
+        full jitter. ``work`` may therefore run more than once and must not have
+        side effects outside the transaction.
+        
+        Args:
+            work: Callable taking a cursor; its return value is returned once committed
+            cursor_factory: psycopg2 cursor factory for the cursor passed to work (optional)
+            max_retries: Override for the pool's retry limit (optional)
+            
+        Returns:
+            The value returned by work on the attempt that committed
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        retries = 0
+        
+        with self.connection() as connection:
+            connection.autocommit = False
+            cursor = connection.cursor(cursor_factory=cursor_factory)
+            try:
+                cursor.execute("SAVEPOINT cockroach_restart")
+                while True:
+                    try:
+                        result = work(cursor)
+                        cursor.execute("RELEASE SAVEPOINT cockroach_restart")
+                        connection.commit()
+                        break
+                    except errors.SerializationFailure as e:
+                        if retries >= max_retries:
+                            self._record_retries_exhausted(retries, e)
+                            raise
+                        cursor.execute("ROLLBACK TO SAVEPOINT cockroach_restart")
+                        retries += 1
+                        self._backoff(retries, max_retries, e)
+            except Exception:
+                if not connection.closed:
+                    connection.rollback()
+                raise
+            finally:
+                cursor.close()
+                # Back to autocommit for run_statement callers; putconn covers a failed rollback
+                if connection.info.transaction_status == extensions.TRANSACTION_STATUS_IDLE:
+                    connection.autocommit = True
+                self._record_transaction(retries)
+        return result
+    
+    def run_statement(self, query: str, params=None, cursor_factory=None, fetch: bool = False,
+                      max_retries: Optional[int] = None):
+        """
+        Run a single statement as an implicit transaction, retrying on serialization errors
+        
+        A single autocommit statement is one round trip, and CockroachDB retries it
+        server-side where it can; any 40001 that still reaches the client is retried
+        here with the same backoff and metrics as run_transaction.
+        
+        Args:
+            query: SQL statement
+            params: Statement parameters (optional)
+            cursor_factory: psycopg2 cursor factory (optional)
+            fetch: Return the first result row (e.g. from RETURNING) instead of the row count
+            max_retries: Override for the pool's retry limit (optional)
+            
+        Returns:
+            The first result row (or None) if fetch is set, otherwise the affected row count
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        retries = 0
+        
+        with self.connection() as connection:
+            try:
+                while True:
+                    cursor = connection.cursor(cursor_factory=cursor_factory)
+                    try:
+                        cursor.execute(query, params)
+                        return cursor.fetchone() if fetch else cursor.rowcount
+                    except errors.SerializationFailure as e:
+                        if retries >= max_retries:
+                            self._record_retries_exhausted(retries, e)
+                            raise
+                        retries += 1
+                        self._backoff(retries, max_retries, e)
+                    finally:
+                        cursor.close()
+            finally:
+                self._record_transaction(retries)
+    
+    def _backoff(self, retries: int, max_retries: int, error: Exception):
+        """Count a retry and sleep for a full-jitter exponential backoff"""
+        with self._lock:
+            self._stats['transaction_retries'] += 1
+        backoff = min(_RETRY_BACKOFF_CAP, _RETRY_BACKOFF_BASE * 2 ** retries)
+        logger.warning(f"Retrying transaction ({retries}/{max_retries}) after serialization error: {error}")
+        time.sleep(random.uniform(0, backoff))
+    
+    def _record_retries_exhausted(self, retries: int, error: Exception):
+        """Count a transaction that failed after using up its retries"""
+        with self._lock:
+            self._stats['transaction_retries_exhausted'] += 1
+        logger.error(f"Transaction failed after {retries} retries: {error}")
+    
+    def _record_transaction(self, retries: int):
+        """Count a finished transaction and whether it needed retries"""
+        with self._lock:
+            self._stats['transactions'] += 1
+            if retries:
+                self._stats['transactions_retried'] += 1
+    
+    def stats(self) -> Dict:
+        """
+        Get pool usage counters
+        
+        Returns:
+            Dict with open/in-use connection counts, checkout, wait, timeout and
+            health-check counters, and transaction retry counters
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['open'] = len(self._pool._pool) + len(self._pool._used)
+        stats['in_use'] = len(self._pool._used)
+        stats['max_size'] = self.max_size
+        return stats
+    
+    def close(self):
+        """Close every connection in the pool"""
+        self._pool.closeall()
+        logger.info("CockroachDB connection pool closed")
+
+
+def _pool_settings() -> Dict:
+    """Read pool sizing and timeouts from secrets, falling back to defaults"""
+    settings = dict(_POOL_DEFAULTS)
+    for key in settings:
+        try:
+            settings[key] = type(settings[key])(st.secrets["cockroachdb"][key])
+        except (KeyError, AttributeError, FileNotFoundError):
+            pass
+    return settings
+
+
+def get_connection_pool(database_url: str, sslcert: Optional[str] = None) -> CockroachConnectionPool:
+    """
+    Get the process-wide pool for a database, creating it on first use
+    
+    Args:
+        database_url: PostgreSQL connection string
+        sslcert: Path to the CA certificate (optional)
+    
+    Returns:
+        The shared CockroachConnectionPool for this database_url and certificate
+    """
+    key = (database_url, sslcert)
+    with _connection_pools_lock:
+        connection_pool = _connection_pools.get(key)
+        if connection_pool is None:
+            settings = _pool_settings()
+            connection_pool = CockroachConnectionPool(
+                database_url,
+                sslcert=sslcert,
+                min_size=settings['pool_min_size'],
+                max_size=settings['pool_max_size'],
+                timeout=settings['pool_timeout'],
+                health_check_interval=settings['pool_health_check_interval'],
+                max_retries=settings['transaction_max_retries']
+            )
+            _connection_pools[key] = connection_pool
+        return connection_pool
+
+
+def close_connection_pools():
+    """Close every process-wide pool (for shutdown and tests)"""
+    with _connection_pools_lock:
+        for connection_pool in _connection_pools.values():
+            connection_pool.close()
+        _connection_pools.clear()
+
+
 class InvestmentService:
-    def __init__(self, database_url=None, host=None, port=None, user=None, password=None, database=None, sslmode='verify-full', sslcert=None):
+    def __init__(self, database_url=None, host=None, port=None, user=None, password=None, database=None, sslmode='verify-full', sslcert=None,
+                 read_staleness=None):
         """
         Initialize CockroachDB service with credentials
         
         Can use either:
         1. database_url (full PostgreSQL connection string)
         2. Individual parameters (host, port, user, password, database)
+        
+        read_staleness sets how portfolio-wide reads are served:
+        - None or 0: consistent reads from the leaseholder (default)
+        - "follower": AS OF SYSTEM TIME follower_read_timestamp(), served by the nearest replica
+        - seconds (e.g. 10): AS OF SYSTEM TIME that many seconds in the past
         """
         
         # Use provided database_url or construct from parameters and secrets
@@ -69,72 +510,24 @@ class InvestmentService:
         
         self.database_url = database_url
         self.sslcert = sslcert or os.path.join(os.path.dirname(__file__), 'root.crt')
-        self.connection = None
+        
+        if read_staleness is None:
+            try:
+                read_staleness = st.secrets["cockroachdb"]["read_staleness"]
+            except (KeyError, AttributeError, FileNotFoundError):
+                read_staleness = None
+        if read_staleness not in (None, "follower"):
+            read_staleness = float(read_staleness)
+            if read_staleness < 0:
+                raise ValueError(f"read_staleness must be 'follower' or non-negative seconds, got {read_staleness}")
+        self.read_staleness = read_staleness or None
+        
+        self.pool = None
         self.connect()
-        self.create_table()
     
     def connect(self):
-        """Establish CockroachDB (PostgreSQL) connection"""
-        try:
-            # Add SSL certificate path if it exists
-            if os.path.exists(self.sslcert):
-                self.connection = psycopg2.connect(
-                    self.database_url,
-                    sslmode='verify-full',
-                    sslrootcert=self.sslcert,
-                    connect_timeout=10
-                )
-            else:
-                self.connection = psycopg2.connect(
-                    self.database_url,
-                    connect_timeout=10
-                )
-            
-            self.connection.autocommit = True
-            logger.info("CockroachDB connection successful")
-        except Error as e:
-            logger.error(f"Error connecting to CockroachDB: {e}")
-            raise
-    
-    def create_table(self):
-        """Create investment table if it doesn't exist (only once per session)"""
-        global _tables_created
-        
-        # Skip if already created in this session
-        if _tables_created['investment']:
-            logger.debug("Investment table already created this session")
-            return
-        
-        try:
-            cursor = self.connection.cursor()
-            
-            # Create table with PostgreSQL syntax
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS investment (
-                investment_id UUID PRIMARY KEY,
-                investment_amount DECIMAL(15, 2) NOT NULL,
-                investment_date DATE NOT NULL,
-                annual_return_percentage DECIMAL(5, 2) NOT NULL,
-                investment_comments TEXT,
-                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-            );
-            """
-            cursor.execute(create_table_query)
-            
-            # Create index
-            try:
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_investment_date ON investment (investment_date)")
-            except Error as e:
-                logger.warning(f"Index creation notice: {e}")
-            
-            self.connection.commit()
-            cursor.close()
-            _tables_created['investment'] = True
-            logger.info("Investment table created or already exists")
-        except Error as e:
-            logger.error(f"Error creating table: {e}")
-            raise
+        """Attach to the process-wide CockroachDB connection pool"""
+        self.pool = get_connection_pool(self.database_url, self.sslcert)
     
     def create_investment(self, investment_amount: float, investment_date: str, 
                          annual_return_percentage: float, investment_comments: str = "") -> Dict:
@@ -146,22 +539,21 @@ class InvestmentService:
             investment_date: Date of investment (YYYY-MM-DD format)
             annual_return_percentage: Annual return percentage
             investment_comments: Comments about the investment
-            
+        
         Returns:
             Created investment record with investment_id
         """
         investment_id = str(uuid.uuid4())
         
         try:
-            cursor = self.connection.cursor()
             insert_query = """
             INSERT INTO investment 
             (investment_id, investment_amount, investment_date, annual_return_percentage, investment_comments)
             VALUES (%s, %s, %s, %s, %s)
             """
-            cursor.execute(insert_query, (investment_id, investment_amount, investment_date, annual_return_percentage, investment_comments))
-            self.connection.commit()
-            cursor.close()
+            params = (investment_id, investment_amount, investment_date, annual_return_percentage, investment_comments)
+            self.pool.run_statement(insert_query, params)
+            _invalidate_valuation_cache()
             
             logger.info(f"Investment created: {investment_id}")
             return {
@@ -176,45 +568,200 @@ class InvestmentService:
             logger.error(f"Error creating investment: {e}")
             raise
     
-    def read_investment(self, investment_id: str) -> Optional[Dict]:
+    def _as_of_clause(self) -> str:
+        """
+        Get the AS OF SYSTEM TIME clause for portfolio-wide reads
+        
+        Returns:
+            The clause for the configured staleness, or "" for a consistent read when
+            stale reads are off or this process wrote within the staleness window
+        """
+        if self.read_staleness is None:
+            return ""
+        if self.read_staleness == "follower":
+            clause, window = "AS OF SYSTEM TIME follower_read_timestamp()", _FOLLOWER_READ_LAG
+        else:
+            clause, window = f"AS OF SYSTEM TIME '-{self.read_staleness:g}s'", self.read_staleness
+        if time.monotonic() - _last_write_at < window:
+            return ""
+        return clause
+    
+    def read_investment(self, investment_id: str, projection: str = 'full') -> Optional[Dict]:
         """
         Read a specific investment record
         
         Args:
             investment_id: Investment ID to retrieve
-            
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'
+        
         Returns:
-            Investment record or None if not found
+            Investment record with the projection's columns, or None if not found
         """
+        columns = ", ".join(_projection_columns(projection))
         try:
-            cursor = self.connection.cursor(cursor_factory=extras.RealDictCursor)
-            select_query = "SELECT * FROM investment WHERE investment_id = %s"
-            cursor.execute(select_query, (investment_id,))
-            result = cursor.fetchone()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor(cursor_factory=extras.RealDictCursor)
+                select_query = f"SELECT {columns} FROM investment WHERE investment_id = %s"
+                cursor.execute(select_query, (investment_id,))
+                result = cursor.fetchone()
+                cursor.close()
             return result
         except Error as e:
             logger.error(f"Error reading investment: {e}")
             raise
     
-    def read_all_investments(self) -> List[Dict]:
+    def read_all_investments(self, projection: str = 'full') -> List[Dict]:
         """
         Read all investment records
         
+        Args:
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'
+        
         Returns:
-            List of all investment records
+            List of all investment records with the projection's columns
         """
+        columns = ", ".join(_projection_columns(projection))
         try:
-            cursor = self.connection.cursor(cursor_factory=extras.RealDictCursor)
-            select_query = "SELECT * FROM investment ORDER BY investment_date DESC"
-            cursor.execute(select_query)
-            results = cursor.fetchall()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor(cursor_factory=extras.RealDictCursor)
+                select_query = f"SELECT {columns} FROM investment {self._as_of_clause()} ORDER BY investment_date DESC"
+                cursor.execute(select_query)
+                results = cursor.fetchall()
+                cursor.close()
             return results if results else []
         except Error as e:
             logger.error(f"Error reading investments: {e}")
             raise
     
+    def read_all_investment_records(self) -> List['Investment']:
+        """
+        Read all investment records as typed Investment records
+        
+        Returns:
+            List of Investment records, newest investment date first
+        """
+        try:
+            # Plain tuple cursor; numeric columns are cast so no Decimal objects are built
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                select_query = f"""
+                    SELECT investment_id::STRING, investment_amount::FLOAT8, investment_date,
+                           annual_return_percentage::FLOAT8, investment_comments
+                    FROM investment {self._as_of_clause()} ORDER BY investment_date DESC
+                """
+                cursor.execute(select_query)
+                results = [Investment._make(row) for row in cursor.fetchall()]
+                cursor.close()
+            return results
+        except Error as e:
+            logger.error(f"Error reading investment records: {e}")
+            raise
+    
+    def read_investments_page(self, after: Optional[Tuple[date, str]] = None, limit: int = 50,
+                              projection: str = 'full') -> List['Investment']:
+        """
+        Read one page of investment records using keyset pagination
+        
+        Args:
+            after: (investment_date, investment_id) of the last record on the previous page,
+                or None for the first page
+            limit: Maximum number of records to return
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'; record
+                fields outside the projection are None
+            
+        Returns:
+            Up to limit Investment records, newest investment date first, ties by investment_id
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+        
+        columns = [column for column in _projection_columns(projection) if column in Investment._fields]
+        select_list = ", ".join(_RECORD_COLUMN_CASTS.get(column, column) for column in columns)
+        padding = (None,) * (len(Investment._fields) - len(columns))
+        
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                if after is None:
+                    where_clause = ""
+                    params = (limit,)
+                else:
+                    # Dates run DESC and ids ASC, so the seek is spelled out instead of a tuple comparison
+                    where_clause = "WHERE investment_date < %s OR (investment_date = %s AND investment_id > %s)"
+                    params = (after[0], after[0], after[1], limit)
+                select_query = f"""
+                    SELECT {select_list}
+                    FROM investment {self._as_of_clause()} {where_clause}
+                    ORDER BY investment_date DESC, investment_id
+                    LIMIT %s
+                """
+                cursor.execute(select_query, params)
+                results = [Investment._make(row + padding) for row in cursor.fetchall()]
+                cursor.close()
+            return results
+        except Error as e:
+            logger.error(f"Error reading investment page: {e}")
+            raise
+    
+    def get_portfolio_summary(self, as_of: Optional[date] = None) -> 'PortfolioSummary':
+        """
+        Get the headline portfolio totals, computed in the database
+        
+        Uses the cached portfolio view when one exists for the date; otherwise one
+        aggregate query returns a single row, whatever the portfolio size.
+        
+        Args:
+            as_of: Valuation date (defaults to today)
+            
+        Returns:
+            PortfolioSummary valued as of the given date
+        """
+        as_of = as_of or date.today()
+        portfolio = _cached_valuation(as_of)
+        if portfolio is not None:
+            return PortfolioSummary.from_view(portfolio)
+        
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                # Same formula as calculate_portfolio_values_paise: each current value is
+                # rounded to the paise before summing, and future dates keep the principal
+                summary_query = f"""
+                    SELECT COUNT(*),
+                           COALESCE(SUM((investment_amount * 100)::INT8), 0),
+                           COALESCE(SUM(CASE
+                               WHEN investment_date > %s::DATE THEN (investment_amount * 100)::INT8
+                               ELSE ROUND(
+                                   investment_amount::FLOAT8 * 100
+                                   * POWER(1 + annual_return_percentage::FLOAT8 / 100,
+                                           (%s::DATE - investment_date)::FLOAT8 / 365.25)
+                               )::INT8
+                           END), 0)
+                    FROM investment {self._as_of_clause()}
+                """
+                cursor.execute(summary_query, (as_of, as_of))
+                count, invested, current_value = cursor.fetchone()
+                cursor.close()
+            return PortfolioSummary.from_paise(int(count), int(invested), int(current_value), as_of=as_of)
+        except Error as e:
+            logger.error(f"Error computing portfolio summary: {e}")
+            raise
+    
+    def get_portfolio_view(self, as_of: Optional[date] = None) -> 'PortfolioView':
+        """
+        Get the valued portfolio, served from the valuation cache when possible
+        
+        Args:
+            as_of: Valuation date (defaults to today)
+        
+        Returns:
+            PortfolioView valued as of the given date
+        """
+        as_of = as_of or date.today()
+        return _cached_valuation(
+            as_of, lambda: build_portfolio_view(self.read_all_investment_records(), as_of=as_of)
+        )
+    
     def update_investment(self, investment_id: str, investment_amount: Optional[float] = None,
                          investment_date: Optional[str] = None, 
                          annual_return_percentage: Optional[float] = None,
@@ -228,17 +775,11 @@ class InvestmentService:
             investment_date: New investment date (optional)
             annual_return_percentage: New annual return percentage (optional)
             investment_comments: New comments (optional)
-            
+        
         Returns:
             Updated investment record or None if not found
         """
-        # Check if investment exists
-        existing = self.read_investment(investment_id)
-        if not existing:
-            return None
-        
         try:
-            cursor = self.connection.cursor()
             update_parts = []
             params = []
             
@@ -258,17 +799,17 @@ class InvestmentService:
                 update_parts.append("investment_comments = %s")
                 params.append(investment_comments)
             
-            if update_parts:
-                update_parts.append("updated_at = CURRENT_TIMESTAMP")
-                update_query = f"UPDATE investment SET {', '.join(update_parts)} WHERE investment_id = %s"
-                params.append(investment_id)
-                cursor.execute(update_query, params)
-                self.connection.commit()
+            if not update_parts:
+                return self.read_investment(investment_id)
             
-            cursor.close()
-            
-            # Return updated record
-            return self.read_investment(investment_id)
+            # RETURNING folds the existence check and read-back into the write
+            update_parts.append("updated_at = CURRENT_TIMESTAMP")
+            update_query = f"UPDATE investment SET {', '.join(update_parts)} WHERE investment_id = %s RETURNING *"
+            params.append(investment_id)
+            updated = self.pool.run_statement(update_query, params, cursor_factory=extras.RealDictCursor, fetch=True)
+            if updated is not None:
+                _invalidate_valuation_cache()
+            return updated
         except Error as e:
             logger.error(f"Error updating investment: {e}")
             raise
@@ -279,21 +820,15 @@ class InvestmentService:
         
         Args:
             investment_id: Investment ID to delete
-            
+        
         Returns:
             True if deleted, False if not found
         """
-        # Check if investment exists
-        existing = self.read_investment(investment_id)
-        if not existing:
-            return False
-        
         try:
-            cursor = self.connection.cursor()
-            delete_query = "DELETE FROM investment WHERE investment_id = %s"
-            cursor.execute(delete_query, (investment_id,))
-            self.connection.commit()
-            cursor.close()
+            delete_query = "DELETE FROM investment WHERE investment_id = %s RETURNING investment_id"
+            if self.pool.run_statement(delete_query, (investment_id,), fetch=True) is None:
+                return False
+            _invalidate_valuation_cache()
             
             logger.info(f"Investment deleted: {investment_id}")
             return True
@@ -302,14 +837,44 @@ class InvestmentService:
             raise
     
     def close(self):
-        """Close CockroachDB connection"""
-        if self.connection:
-            self.connection.close()
-            logger.info("CockroachDB connection closed")
+        """Detach from the shared pool; its connections stay open for other sessions"""
+        self.pool = None
+
+
+class Investment(NamedTuple):
+    """Compact typed investment record with native date and float fields"""
+    investment_id: str
+    investment_amount: float
+    investment_date: Optional[date]
+    annual_return_percentage: float
+    investment_comments: Optional[str] = None
+    
+    @classmethod
+    def from_row(cls, row: Dict) -> 'Investment':
+        """
+        Convert an investment row dict into a typed record
+        
+        Args:
+            row: Investment record as returned by read_investment/read_all_investments
+        
+        Returns:
+            Investment record
+        """
+        inv_date = row.get('investment_date')
+        if isinstance(inv_date, str):
+            inv_date = date.fromisoformat(inv_date) if inv_date else None
+        
+        return cls(
+            investment_id=str(row.get('investment_id', '')),
+            investment_amount=float(row.get('investment_amount', 0)),
+            investment_date=inv_date,
+            annual_return_percentage=float(row.get('annual_return_percentage', 0)),
+            investment_comments=row.get('investment_comments')
+        )
 
 
 def calculate_current_value(investment_amount: float, annual_return_percentage: float, 
-                           investment_date: str) -> float:
+                           investment_date: Union[str, date], as_of: Optional[date] = None) -> float:
     """
     Calculate current value of investment based on compound interest
     
@@ -319,16 +884,18 @@ def calculate_current_value(investment_amount: float, annual_return_percentage:
     Args:
         investment_amount: Initial investment amount
         annual_return_percentage: Annual return percentage (e.g., 5 for 5%)
-        investment_date: Investment date (YYYY-MM-DD format)
-        
+        investment_date: Investment date (date object or YYYY-MM-DD string)
+        as_of: Valuation date (defaults to today)
+    
     Returns:
         Current value of investment
     """
-    from datetime import datetime
-    
-    # Parse investment date
-    inv_date = datetime.strptime(investment_date, "%Y-%m-%d").date()
-    today = datetime.now().date()
+    # Driver and Investment record dates are used as-is; only strings are parsed
+    if isinstance(investment_date, str):
+        inv_date = datetime.strptime(investment_date, "%Y-%m-%d").date()
+    else:
+        inv_date = investment_date
+    today = as_of or datetime.now().date()
     
     # Calculate actual days passed (as a timedelta object for precision)
     time_delta = today - inv_date
@@ -357,7 +924,7 @@ def calculate_profit_loss(current_value: float, investment_amount: float) -> flo
     Args:
         current_value: Current value of investment
         investment_amount: Initial investment amount
-        
+    
     Returns:
         Profit/Loss amount
     """
@@ -371,7 +938,7 @@ def calculate_return_percentage(current_value: float, investment_amount: float)
     Args:
         current_value: Current value of investment
         investment_amount: Initial investment amount
-        
+    
     Returns:
         Return percentage
     """
@@ -381,6 +948,236 @@ def calculate_return_percentage(current_value: float, investment_amount: float)
     return round(((current_value - investment_amount) / investment_amount) * 100, 2)
 
 
+PAISE_PER_RUPEE = 100
+
+
+def to_paise(rupees) -> np.ndarray:
+    """
+    Convert rupee amounts to fixed-point integer paise
+    
+    Args:
+        rupees: Amount or sequence of amounts in rupees (float or Decimal)
+    
+    Returns:
+        int64 NumPy array of paise
+    """
+    return np.rint(np.asarray(rupees, dtype=np.float64) * PAISE_PER_RUPEE).astype(np.int64)
+
+
+def from_paise(paise) -> np.ndarray:
+    """
+    Convert fixed-point integer paise to rupees
+    
+    Args:
+        paise: Amount or sequence of amounts in paise
+    
+    Returns:
+        float64 NumPy array of rupees
+    """
+    return np.asarray(paise, dtype=np.int64) / PAISE_PER_RUPEE
+
+
+def calculate_portfolio_values_paise(investment_paise, annual_return_percentages,
+                                     investment_dates, as_of: Optional[date] = None):
+    """
+    Calculate current value, profit/loss and return percentage for a whole portfolio in paise
+    
+    Fixed-point core of the valuation engine: each current value is rounded to
+    the paise once, and profit/loss and any totals over the results are exact
+    int64 arithmetic.
+    
+    Args:
+        investment_paise: Sequence of initial investment amounts in paise
+        annual_return_percentages: Sequence of annual return percentages (e.g., 5 for 5%)
+        investment_dates: Sequence of investment dates (date objects or YYYY-MM-DD strings)
+        as_of: Valuation date (defaults to today)
+    
+    Returns:
+        Tuple of NumPy arrays (current_values_paise, profit_loss_paise, return_percentages)
+    """
+    amounts = np.asarray(investment_paise, dtype=np.int64)
+    annual_rates = np.asarray(annual_return_percentages, dtype=np.float64) / 100
+    inv_dates = np.asarray(investment_dates, dtype='datetime64[D]')
+    today = np.datetime64(as_of or datetime.now().date(), 'D')
+    
+    # Missing or future dates keep the principal, as in calculate_current_value
+    days_passed = (today - inv_dates).astype(np.float64)
+    not_started = np.isnat(inv_dates) | (days_passed < 0)
+    years_passed = np.where(not_started, 0.0, days_passed) / 365.25
+    
+    current_values = np.where(
+        not_started,
+        amounts,
+        np.rint(amounts * np.power(1 + annual_rates, years_passed)).astype(np.int64)
+    )
+    profit_loss = current_values - amounts
+    
+    return_percentages = np.zeros(len(amounts))
+    np.divide(profit_loss, amounts, out=return_percentages, where=amounts != 0)
+    return_percentages = np.round(return_percentages * 100, 2)
+    
+    return current_values, profit_loss, return_percentages
+
+
+def calculate_portfolio_values(investment_amounts, annual_return_percentages,
+                               investment_dates, as_of: Optional[date] = None):
+    """
+    Calculate current value, profit/loss and return percentage for a whole portfolio
+    
+    Vectorized counterpart of calculate_current_value, calculate_profit_loss and
+    calculate_return_percentage: whole columns are valued in one fixed-point
+    NumPy pass (calculate_portfolio_values_paise) instead of once per investment.
+    
+    Args:
+        investment_amounts: Sequence of initial investment amounts
+        annual_return_percentages: Sequence of annual return percentages (e.g., 5 for 5%)
+        investment_dates: Sequence of investment dates (date objects or YYYY-MM-DD strings)
+        as_of: Valuation date (defaults to today)
+    
+    Returns:
+        Tuple of NumPy arrays (current_values, profit_loss, return_percentages)
+    """
+    current_values, profit_loss, return_percentages = calculate_portfolio_values_paise(
+        to_paise(investment_amounts), annual_return_percentages, investment_dates, as_of=as_of
+    )
+    return from_paise(current_values), from_paise(profit_loss), return_percentages
+
+
+@dataclass(frozen=True)
+class PortfolioRow:
+    """One valued investment of a PortfolioView"""
+    investment_id: str
+    investment_amount: float
+    investment_date: Optional[date]
+    annual_return_percentage: float
+    current_value: float
+    profit_loss: float
+    return_percentage: float
+    investment_comments: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PortfolioView:
+    """Valued portfolio shared by the metric cards, charts, tables and pages of one rerun"""
+    rows: List[PortfolioRow]
+    total_invested: float
+    total_current_value: float
+    total_profit_loss: float
+    total_return_percentage: float
+    as_of: Optional[date] = None
+    
+    @property
+    def count(self) -> int:
+        """Number of investments in the portfolio"""
+        return len(self.rows)
+
+
+@dataclass(frozen=True)
+class PortfolioSummary:
+    """Headline portfolio totals for the Dashboard metric cards"""
+    total_invested: float
+    total_current_value: float
+    total_profit_loss: float
+    total_return_percentage: float
+    count: int
+    as_of: Optional[date] = None
+    
+    @classmethod
+    def from_paise(cls, count: int, total_invested_paise: int, total_current_value_paise: int,
+                   as_of: Optional[date] = None) -> 'PortfolioSummary':
+        """
+        Build a summary from exact paise totals
+        
+        Args:
+            count: Number of investments
+            total_invested_paise: Sum of investment amounts in paise
+            total_current_value_paise: Sum of per-investment current values, each rounded to the paise
+            as_of: Valuation date
+            
+        Returns:
+            PortfolioSummary in rupees
+        """
+        return cls(
+            total_invested=total_invested_paise / PAISE_PER_RUPEE,
+            total_current_value=total_current_value_paise / PAISE_PER_RUPEE,
+            total_profit_loss=(total_current_value_paise - total_invested_paise) / PAISE_PER_RUPEE,
+            total_return_percentage=calculate_return_percentage(total_current_value_paise, total_invested_paise),
+            count=count,
+            as_of=as_of
+        )
+    
+    @classmethod
+    def from_view(cls, portfolio: 'PortfolioView') -> 'PortfolioSummary':
+        """
+        Take the totals of an already valued portfolio
+        
+        Args:
+            portfolio: PortfolioView from build_portfolio_view()
+            
+        Returns:
+            PortfolioSummary with the view's totals
+        """
+        return cls(
+            total_invested=portfolio.total_invested,
+            total_current_value=portfolio.total_current_value,
+            total_profit_loss=portfolio.total_profit_loss,
+            total_return_percentage=portfolio.total_return_percentage,
+            count=portfolio.count,
+            as_of=portfolio.as_of
+        )
+
+
+def build_portfolio_view(investments: List[Investment], as_of: Optional[date] = None) -> PortfolioView:
+    """
+    Value a list of investment records once and build the portfolio view model
+    
+    Args:
+        investments: Investment records as returned by read_all_investment_records()
+        as_of: Valuation date (defaults to today)
+    
+    Returns:
+        PortfolioView with one row per investment and precomputed totals
+    """
+    # Amounts enter the engine as paise once; totals below are exact integer sums
+    amounts = to_paise([inv.investment_amount for inv in investments])
+    current_values, profit_losses, return_pcts = calculate_portfolio_values_paise(
+        amounts,
+        [inv.annual_return_percentage for inv in investments],
+        [inv.investment_date for inv in investments],
+        as_of=as_of
+    )
+    
+    rows = [
+        PortfolioRow(
+            investment_id=inv.investment_id,
+            investment_amount=inv.investment_amount,
+            investment_date=inv.investment_date,
+            annual_return_percentage=inv.annual_return_percentage,
+            current_value=current_value,
+            profit_loss=profit_loss,
+            return_percentage=return_pct,
+            investment_comments=inv.investment_comments
+        )
+        for inv, current_value, profit_loss, return_pct in zip(
+            investments,
+            from_paise(current_values).tolist(),
+            from_paise(profit_losses).tolist(),
+            return_pcts.tolist()
+        )
+    ]
+    
+    total_invested = int(amounts.sum())
+    total_current_value = int(current_values.sum())
+    return PortfolioView(
+        rows=rows,
+        total_invested=total_invested / PAISE_PER_RUPEE,
+        total_current_value=total_current_value / PAISE_PER_RUPEE,
+        total_profit_loss=(total_current_value - total_invested) / PAISE_PER_RUPEE,
+        total_return_percentage=calculate_return_percentage(total_current_value, total_invested),
+        as_of=as_of or datetime.now().date()
+    )
+
+
 # ==================== USER AUTHENTICATION FUNCTIONS ====================
 
 import hashlib
@@ -437,73 +1234,12 @@ class AuthenticationService:
         
         self.database_url = database_url
         self.sslcert = sslcert or os.path.join(os.path.dirname(__file__), 'root.crt')
-        self.connection = None
+        self.pool = None
         self.connect()
-        self.create_users_table()
     
     def connect(self):
-        """Establish CockroachDB (PostgreSQL) connection"""
-        try:
-            if os.path.exists(self.sslcert):
-                self.connection = psycopg2.connect(
-                    self.database_url,
-                    sslmode='verify-full',
-                    sslrootcert=self.sslcert,
-                    connect_timeout=10
-                )
-            else:
-                self.connection = psycopg2.connect(
-                    self.database_url,
-                    connect_timeout=10
-                )
-            
-            self.connection.autocommit = True
-            logger.info("CockroachDB connection successful for auth service")
-        except Error as e:
-            logger.error(f"Error connecting to CockroachDB: {e}")
-            raise
-    
-    def create_users_table(self):
-        """Create users table if it doesn't exist (only once per session)"""
-        global _tables_created
-        
-        # Skip if already created in this session
-        if _tables_created['users']:
-            logger.debug("Users table already created this session")
-            return
-        
-        try:
-            cursor = self.connection.cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS users (
-                user_id UUID PRIMARY KEY,
-                username VARCHAR(50) UNIQUE NOT NULL,
-                email VARCHAR(100) UNIQUE NOT NULL,
-                password_hash VARCHAR(255) NOT NULL,
-                full_name VARCHAR(100),
-                role VARCHAR(20) NOT NULL DEFAULT 'user',
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-            );
-            """
-            cursor.execute(create_table_query)
-            
-            # Create indexes
-            try:
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_username ON users (username)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_email ON users (email)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_role ON users (role)")
-            except Error as e:
-                logger.warning(f"Index creation notice: {e}")
-            
-            self.connection.commit()
-            cursor.close()
-            _tables_created['users'] = True
-            logger.info("Users table created or already exists")
-        except Error as e:
-            logger.error(f"Error creating users table: {e}")
-            raise
+        """Attach to the process-wide CockroachDB connection pool"""
+        self.pool = get_connection_pool(self.database_url, self.sslcert)
     
     @staticmethod
     def hash_password(password: str) -> str:
@@ -521,7 +1257,7 @@ class AuthenticationService:
             password: Password (will be hashed)
             full_name: Full name
             role: User role ('user' or 'admin')
-            
+        
         Returns:
             User data with user_id
         """
@@ -529,15 +1265,12 @@ class AuthenticationService:
             user_id = str(uuid.uuid4())
             password_hash = self.hash_password(password)
             
-            cursor = self.connection.cursor()
             insert_query = """
             INSERT INTO users 
             (user_id, username, email, password_hash, full_name, role, is_active)
             VALUES (%s, %s, %s, %s, %s, %s, FALSE)
             """
-            cursor.execute(insert_query, (user_id, username, email, password_hash, full_name, role))
-            self.connection.commit()
-            cursor.close()
+            self.pool.run_statement(insert_query, (user_id, username, email, password_hash, full_name, role))
             
             logger.info(f"User registered (inactive): {username}")
             return {
@@ -560,16 +1293,17 @@ class AuthenticationService:
         Args:
             username: Username
             password: Password
-            
+        
         Returns:
             User data if authenticated, None otherwise
         """
         try:
-            cursor = self.connection.cursor(cursor_factory=extras.RealDictCursor)
-            select_query = "SELECT * FROM users WHERE username = %s"
-            cursor.execute(select_query, (username,))
-            user = cursor.fetchone()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor(cursor_factory=extras.RealDictCursor)
+                select_query = "SELECT * FROM users WHERE username = %s"
+                cursor.execute(select_query, (username,))
+                user = cursor.fetchone()
+                cursor.close()
             
             if user:
                 password_hash = self.hash_password(password)
@@ -594,16 +1328,17 @@ class AuthenticationService:
         Args:
             username: Username
             password: Password
-            
+        
         Returns:
             Dict with 'exists', 'password_correct', and 'is_active' status
         """
         try:
-            cursor = self.connection.cursor(cursor_factory=extras.RealDictCursor)
-            select_query = "SELECT * FROM users WHERE username = %s"
-            cursor.execute(select_query, (username,))
-            user = cursor.fetchone()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor(cursor_factory=extras.RealDictCursor)
+                select_query = "SELECT * FROM users WHERE username = %s"
+                cursor.execute(select_query, (username,))
+                user = cursor.fetchone()
+                cursor.close()
             
             if not user:
                 return {'exists': False, 'password_correct': False, 'is_active': False}
@@ -624,11 +1359,12 @@ class AuthenticationService:
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
         try:
-            cursor = self.connection.cursor(cursor_factory=extras.RealDictCursor)
-            select_query = "SELECT * FROM users WHERE user_id = %s"
-            cursor.execute(select_query, (user_id,))
-            user = cursor.fetchone()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor(cursor_factory=extras.RealDictCursor)
+                select_query = "SELECT * FROM users WHERE user_id = %s"
+                cursor.execute(select_query, (user_id,))
+                user = cursor.fetchone()
+                cursor.close()
             return user
         except Error as e:
             logger.error(f"Error getting user: {e}")
@@ -637,11 +1373,12 @@ class AuthenticationService:
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Get user by username"""
         try:
-            cursor = self.connection.cursor(cursor_factory=extras.RealDictCursor)
-            select_query = "SELECT * FROM users WHERE username = %s"
-            cursor.execute(select_query, (username,))
-            user = cursor.fetchone()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor(cursor_factory=extras.RealDictCursor)
+                select_query = "SELECT * FROM users WHERE username = %s"
+                cursor.execute(select_query, (username,))
+                user = cursor.fetchone()
+                cursor.close()
             return user
         except Error as e:
             logger.error(f"Error getting user: {e}")
@@ -650,11 +1387,12 @@ class AuthenticationService:
     def get_all_users(self) -> List[Dict]:
         """Get all users"""
         try:
-            cursor = self.connection.cursor(cursor_factory=extras.RealDictCursor)
-            select_query = "SELECT user_id, username, email, full_name, role, is_active, created_at FROM users ORDER BY created_at DESC"
-            cursor.execute(select_query)
-            users = cursor.fetchall()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor(cursor_factory=extras.RealDictCursor)
+                select_query = "SELECT user_id, username, email, full_name, role, is_active, created_at FROM users ORDER BY created_at DESC"
+                cursor.execute(select_query)
+                users = cursor.fetchall()
+                cursor.close()
             return users if users else []
         except Error as e:
             logger.error(f"Error getting users: {e}")
@@ -663,11 +1401,8 @@ class AuthenticationService:
     def update_user_role(self, user_id: str, role: str) -> Optional[Dict]:
         """Update user role"""
         try:
-            cursor = self.connection.cursor()
             update_query = "UPDATE users SET role = %s, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s"
-            cursor.execute(update_query, (role, user_id))
-            self.connection.commit()
-            cursor.close()
+            self.pool.run_statement(update_query, (role, user_id))
             
             logger.info(f"User role updated: {user_id}")
             return self.get_user_by_id(user_id)
@@ -677,18 +1412,20 @@ class AuthenticationService:
     
     def toggle_user_status(self, user_id: str) -> Optional[Dict]:
         """Toggle user active status"""
+        def toggle(cursor) -> bool:
+            # Read and flip in one transaction so concurrent toggles can't cancel out
+            cursor.execute("SELECT is_active FROM users WHERE user_id = %s FOR UPDATE", (user_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return False
+            update_query = "UPDATE users SET is_active = %s, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s"
+            cursor.execute(update_query, (not row[0], user_id))
+            return True
+        
         try:
-            user = self.get_user_by_id(user_id)
-            if not user:
+            if not self.pool.run_transaction(toggle):
                 return None
             
-            new_status = not user['is_active']
-            cursor = self.connection.cursor()
-            update_query = "UPDATE users SET is_active = %s, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s"
-            cursor.execute(update_query, (new_status, user_id))
-            self.connection.commit()
-            cursor.close()
-            
             logger.info(f"User status toggled: {user_id}")
             return self.get_user_by_id(user_id)
         except Error as e:
@@ -698,11 +1435,8 @@ class AuthenticationService:
     def delete_user(self, user_id: str) -> bool:
         """Delete user"""
         try:
-            cursor = self.connection.cursor()
             delete_query = "DELETE FROM users WHERE user_id = %s"
-            cursor.execute(delete_query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            self.pool.run_statement(delete_query, (user_id,))
             
             logger.info(f"User deleted: {user_id}")
             return True
@@ -712,21 +1446,22 @@ class AuthenticationService:
     
     def change_password(self, user_id: str, old_password: str, new_password: str) -> bool:
         """Change user password"""
-        try:
-            user = self.get_user_by_id(user_id)
-            if not user:
-                return False
-            
-            old_password_hash = self.hash_password(old_password)
-            if user['password_hash'] != old_password_hash:
+        old_password_hash = self.hash_password(old_password)
+        new_password_hash = self.hash_password(new_password)
+        
+        def change(cursor) -> bool:
+            # Check the old password against the row being updated, not an earlier read
+            cursor.execute("SELECT password_hash FROM users WHERE user_id = %s FOR UPDATE", (user_id,))
+            row = cursor.fetchone()
+            if row is None or row[0] != old_password_hash:
                 return False
-            
-            new_password_hash = self.hash_password(new_password)
-            cursor = self.connection.cursor()
             update_query = "UPDATE users SET password_hash = %s, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s"
             cursor.execute(update_query, (new_password_hash, user_id))
-            self.connection.commit()
-            cursor.close()
+            return True
+        
+        try:
+            if not self.pool.run_transaction(change):
+                return False
             
             logger.info(f"Password changed for user: {user_id}")
             return True
@@ -0,0 +1,211 @@
+"""
+Versioned schema migrations for the Investment Dashboard - CockroachDB Edition
+
+Each migration is applied once and recorded in the schema_migrations table, so
+the services never run DDL when a session starts. A migration's statements and
+its schema_migrations row commit in one transaction. CockroachDB can still
+commit DDL non-atomically when a schema change fails late (error XXA00), so
+every statement is written to be idempotent and a rerun finishes the job.
+Apply pending migrations at deploy time:
+
+    python migrations.py            # apply everything pending
+    python migrations.py status     # list applied and pending versions
+"""
+import argparse
+import logging
+import sys
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+from psycopg2 import Error
+
+from cockroach_service import InvestmentService, close_connection_pools
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    """One schema change, committed together with its schema_migrations row"""
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+# Append new migrations; never edit or renumber one that has shipped
+MIGRATIONS = [
+    Migration(1, "Create investment table", (
+        """
+        CREATE TABLE IF NOT EXISTS investment (
+            investment_id UUID PRIMARY KEY,
+            investment_amount DECIMAL(15, 2) NOT NULL,
+            investment_date DATE NOT NULL,
+            annual_return_percentage DECIMAL(5, 2) NOT NULL,
+            investment_comments TEXT,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_investment_date ON investment (investment_date)",
+    )),
+    Migration(2, "Create users table", (
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id UUID PRIMARY KEY,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            full_name VARCHAR(100),
+            role VARCHAR(20) NOT NULL DEFAULT 'user',
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_username ON users (username)",
+        "CREATE INDEX IF NOT EXISTS idx_email ON users (email)",
+        "CREATE INDEX IF NOT EXISTS idx_role ON users (role)",
+    )),
+    Migration(3, "Add keyset pagination index", (
+        "CREATE INDEX IF NOT EXISTS idx_investment_date_id ON investment (investment_date DESC, investment_id)",
+    )),
+    # Spreads date-ordered inserts across shard buckets instead of one hot range,
+    # and stores the valuation columns so date scans need no index join
+    Migration(4, "Replace idx_investment_date with a hash-sharded covering index", (
+        """
+        CREATE INDEX IF NOT EXISTS idx_investment_date_hash ON investment (investment_date)
+        USING HASH STORING (investment_amount, annual_return_percentage)
+        """,
+        "DROP INDEX IF EXISTS investment@idx_investment_date",
+    )),
+    # The keyset index from migration 3 also led with the sequential date, so
+    # inserts still hit one range; one hash-sharded index now serves keyset pages
+    # and the covered valuation scans
+    Migration(5, "Replace the date indexes with one hash-sharded covering keyset index", (
+        """
+        CREATE INDEX IF NOT EXISTS idx_investment_date_id_hash ON investment (investment_date DESC, investment_id)
+        USING HASH STORING (investment_amount, annual_return_percentage)
+        """,
+        "DROP INDEX IF EXISTS investment@idx_investment_date_id",
+        "DROP INDEX IF EXISTS investment@idx_investment_date_hash",
+    )),
+]
+
+
+def ensure_migrations_table(connection):
+    """
+    Create the schema_migrations bookkeeping table if it doesn't exist
+    
+    Args:
+        connection: Connection checked out from the pool
+    """
+    cursor = connection.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT8 PRIMARY KEY,
+            description STRING NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    connection.commit()
+    cursor.close()
+
+
+def applied_versions(connection) -> Set[int]:
+    """
+    Get the versions already recorded in schema_migrations
+    
+    Args:
+        connection: Connection checked out from the pool
+    
+    Returns:
+        Set of applied migration versions
+    """
+    ensure_migrations_table(connection)
+    cursor = connection.cursor()
+    cursor.execute("SELECT version FROM schema_migrations")
+    versions = {row[0] for row in cursor.fetchall()}
+    connection.commit()
+    cursor.close()
+    return versions
+
+
+def pending_migrations(connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Get the migrations not yet applied, in version order
+    
+    Args:
+        connection: Connection checked out from the pool
+        target: Highest version to include (defaults to the latest)
+    
+    Returns:
+        List of pending migrations
+    """
+    applied = applied_versions(connection)
+    return [
+        migration for migration in sorted(MIGRATIONS)
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def migrate(connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations in order, one transaction per migration
+    
+    Args:
+        connection: Connection checked out from the pool
+        target: Highest version to apply (defaults to the latest)
+    
+    Returns:
+        List of migrations applied by this call
+    """
+    pending = pending_migrations(connection, target)
+    # Pool connections are autocommit, which would commit each statement on its own
+    autocommit = connection.autocommit
+    connection.autocommit = False
+    cursor = connection.cursor()
+    try:
+        for migration in pending:
+            logger.info(f"Applying migration {migration.version}: {migration.description}")
+            for statement in migration.statements:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (migration.version, migration.description)
+            )
+            connection.commit()
+    except Error as e:
+        connection.rollback()
+        logger.error(f"Error applying migrations: {e}")
+        raise
+    finally:
+        cursor.close()
+        connection.autocommit = autocommit
+    return pending
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; connects with the same settings as the app"""
+    parser = argparse.ArgumentParser(description="Apply Investment Dashboard schema migrations")
+    parser.add_argument("command", nargs="?", choices=["migrate", "status"], default="migrate")
+    parser.add_argument("--target", type=int, help="highest migration version to apply")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
+    service = InvestmentService()
+    try:
+        with service.pool.connection() as connection:
+            if args.command == "status":
+                applied = applied_versions(connection)
+                for migration in sorted(MIGRATIONS):
+                    state = "applied" if migration.version in applied else "pending"
+                    print(f"{migration.version:>4}  {state:<8} {migration.description}")
+            else:
+                applied = migrate(connection, args.target)
+                print(f"✅ Applied {len(applied)} migration(s)" if applied else "✅ Schema is up to date")
+    finally:
+        service.close()
+        close_connection_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+"""
+Unit tests for CockroachDB-based Investment Dashboard
+"""
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from psycopg2 import OperationalError, ProgrammingError, errors, extensions, pool
+from cockroach_service import AuthenticationService, CockroachConnectionPool
+import benchmark_indexes
+import migrations
+import portfolio_analytics
+from portfolio_analytics import (
+    build_real_estate_scenarios,
+    project_portfolio_monte_carlo,
+    real_estate_scenario,
+    real_estate_break_even_price
+)
+
+
+class FakeConnection:
+    """
+    psycopg2 connection stand-in that keeps the driver's transaction rules: outside
+    autocommit the first statement opens a transaction, and autocommit can't be
+    changed while one is open
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self.closed = 0
+        self._autocommit = False
+        self.info = Mock(transaction_status=extensions.TRANSACTION_STATUS_IDLE)
+        self.statements = []
+        self.fail_with = None
+    
+    @property
+    def autocommit(self):
+        return self._autocommit
+    
+    @autocommit.setter
+    def autocommit(self, value):
+        if self.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            raise ProgrammingError("set_session cannot be used inside a transaction")
+        self._autocommit = value
+    
+    def cursor(self, cursor_factory=None):
+        cursor = Mock()
+        cursor.execute.side_effect = self.execute
+        cursor.fetchall.return_value = []
+        return cursor
+    
+    def execute(self, query, params=None):
+        if self.fail_with:
+            raise self.fail_with
+        if not self._autocommit:
+            self.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+        self.statements.append(query)
+    
+    def commit(self):
+        # Like the driver, only sends anything when a transaction is open
+        if self.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            self.statements.append("COMMIT")
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    
+    def rollback(self):
+        if self.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            self.statements.append("ROLLBACK")
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    
+    def close(self):
+        self.closed = 1
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test the process-wide connection pool wrapper"""
+    
+    def setUp(self):
+        patcher = patch('psycopg2.connect', side_effect=FakeConnection)
+        self.connect = patcher.start()
+        self.addCleanup(patcher.stop)
+        sleep_patcher = patch('cockroach_service.time.sleep')
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+        self.pool = CockroachConnectionPool("postgresql://h/d", min_size=1, max_size=2, timeout=0.01)
+        self.addCleanup(self.pool.close)
+    
+    def test_new_connection_checked_out_in_autocommit(self):
+        """Test a fresh connection is pinged outside a transaction and handed out"""
+        connection = self.pool.getconn()
+        
+        self.assertTrue(connection.autocommit)
+        self.assertEqual(connection.statements, ["SELECT 1"])
+        self.assertEqual(connection.info.transaction_status, extensions.TRANSACTION_STATUS_IDLE)
+        self.assertEqual(self.pool.stats()['checkouts'], 1)
+        self.assertEqual(self.pool.stats()['in_use'], 1)
+        
+        self.pool.putconn(connection)
+        self.assertEqual(self.pool.stats()['in_use'], 0)
+    
+    def test_recently_used_connection_not_pinged(self):
+        """Test only connections idle past the health-check interval are pinged"""
+        with self.pool.connection() as connection:
+            pass
+        with self.pool.connection() as connection:
+            pass
+        self.assertEqual(connection.statements, ["SELECT 1"])
+        
+        self.pool.health_check_interval = 0
+        with self.pool.connection() as connection:
+            pass
+        self.assertEqual(connection.statements, ["SELECT 1", "SELECT 1"])
+    
+    def test_unhealthy_connection_replaced(self):
+        """Test a connection that fails its ping is closed and a new one opened"""
+        with self.pool.connection() as broken:
+            pass
+        broken.fail_with = OperationalError("server closed the connection unexpectedly")
+        self.pool.health_check_interval = 0
+        
+        with self.pool.connection() as connection:
+            self.assertIsNot(connection, broken)
+        
+        self.assertTrue(broken.closed)
+        self.assertEqual(self.pool.stats()['health_check_failures'], 1)
+        self.assertEqual(self.pool.stats()['in_use'], 0)
+    
+    def test_putconn_restores_autocommit(self):
+        """Test a connection returned mid-transaction is rolled back and reset for the next borrower"""
+        with self.pool.connection() as connection:
+            connection.autocommit = False
+            connection.cursor().execute("UPDATE investment SET investment_amount = 1")
+        
+        self.assertEqual(connection.statements[-1], "ROLLBACK")
+        self.assertTrue(connection.autocommit)
+        with self.pool.connection() as reused:
+            self.assertIs(reused, connection)
+    
+    def test_waits_then_times_out(self):
+        """Test an exhausted pool waits for the timeout instead of failing at once"""
+        self.pool.getconn()
+        self.pool.getconn()
+        
+        with self.assertRaises(pool.PoolError):
+            self.pool.getconn()
+        self.assertEqual(self.pool.stats()['waits'], 1)
+        self.assertEqual(self.pool.stats()['timeouts'], 1)
+        self.assertEqual(self.pool.stats()['in_use'], 2)
+
+
+class TestTransactions(unittest.TestCase):
+    """Test transactions and single statements on pooled connections"""
+    
+    def setUp(self):
+        patcher = patch('psycopg2.connect', side_effect=FakeConnection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sleep_patcher = patch('cockroach_service.time.sleep')
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+        self.pool = CockroachConnectionPool("postgresql://h/d", min_size=1, max_size=1)
+        self.addCleanup(self.pool.close)
+    
+    def test_transaction_leaves_connection_in_autocommit(self):
+        """Test a statement run after a transaction is not left inside an open one"""
+        self.pool.run_transaction(lambda cursor: cursor.execute("UPDATE users SET role = 'admin'"))
+        self.pool.run_statement("DELETE FROM users")
+        
+        with self.pool.connection() as connection:
+            self.assertTrue(connection.autocommit)
+            self.assertEqual(connection.info.transaction_status, extensions.TRANSACTION_STATUS_IDLE)
+        self.assertEqual(connection.statements, [
+            "SELECT 1", "SAVEPOINT cockroach_restart", "UPDATE users SET role = 'admin'",
+            "RELEASE SAVEPOINT cockroach_restart", "COMMIT", "DELETE FROM users"
+        ])
+    
+    def test_serialization_failure_retried(self):
+        """Test a 40001 error rolls back to the savepoint and re-runs the work"""
+        attempts = []
+        
+        def work(cursor):
+            attempts.append(cursor)
+            if len(attempts) == 1:
+                raise errors.SerializationFailure("restart transaction")
+            return "done"
+        
+        self.assertEqual(self.pool.run_transaction(work), "done")
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(self.pool.stats()['transaction_retries'], 1)
+        self.assertEqual(self.pool.stats()['transactions_retried'], 1)
+    
+    def test_failed_transaction_rolled_back(self):
+        """Test an error in the work rolls the transaction back and leaves the pool usable"""
+        def work(cursor):
+            cursor.execute("UPDATE users SET role = 'admin'")
+            raise ValueError("bad input")
+        
+        with self.assertRaises(ValueError):
+            self.pool.run_transaction(work)
+        with self.pool.connection() as connection:
+            self.assertTrue(connection.autocommit)
+        self.assertEqual(connection.statements[-1], "ROLLBACK")
+
+
+class TestUserWrites(unittest.TestCase):
+    """Test read-modify-write user changes run as one transaction"""
+    
+    def setUp(self):
+        self.cursor = Mock()
+        self.service = AuthenticationService.__new__(AuthenticationService)
+        self.service.pool = Mock()
+        self.service.pool.run_transaction.side_effect = lambda work: work(self.cursor)
+        self.service.get_user_by_id = Mock(return_value={'user_id': 'u1', 'is_active': False})
+    
+    def test_toggle_user_status(self):
+        """Test the status is read with FOR UPDATE and flipped in the same transaction"""
+        self.cursor.fetchone.return_value = (True,)
+        
+        self.assertEqual(self.service.toggle_user_status('u1'), {'user_id': 'u1', 'is_active': False})
+        self.assertIn("FOR UPDATE", self.cursor.execute.call_args_list[0][0][0])
+        self.assertEqual(self.cursor.execute.call_args[0][1], (False, 'u1'))
+    
+    def test_toggle_missing_user(self):
+        """Test toggling an unknown user changes nothing"""
+        self.cursor.fetchone.return_value = None
+        
+        self.assertIsNone(self.service.toggle_user_status('missing'))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+    
+    def test_change_password(self):
+        """Test the password only changes when the old one matches the locked row"""
+        self.cursor.fetchone.return_value = (AuthenticationService.hash_password('old'),)
+        
+        self.assertFalse(self.service.change_password('u1', 'wrong', 'new'))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+        self.assertTrue(self.service.change_password('u1', 'old', 'new'))
+        self.assertEqual(self.cursor.execute.call_args[0][1], (AuthenticationService.hash_password('new'), 'u1'))
+    
+    def test_single_statement_writes_use_run_statement(self):
+        """Test registration, role changes and deletes get the pool's serialization retries"""
+        self.service.register_user('alice', 'alice@example.com', 'secret')
+        self.service.update_user_role('u1', 'admin')
+        self.assertTrue(self.service.delete_user('u1'))
+        
+        queries = [call[0][0] for call in self.service.pool.run_statement.call_args_list]
+        self.assertIn("INSERT INTO users", queries[0])
+        self.assertEqual(self.service.pool.run_statement.call_args_list[1][0][1], ('admin', 'u1'))
+        self.assertIn("DELETE FROM users", queries[2])
+        self.service.pool.connection.assert_not_called()
+
+
+class TestMigrations(unittest.TestCase):
+    """Test the versioned migration runner"""
+    
+    def setUp(self):
+        self.connection = FakeConnection()
+        self.connection.autocommit = True
+    
+    def test_each_migration_is_one_transaction(self):
+        """Test a migration's statements and its version row commit together"""
+        applied = migrations.migrate(self.connection, target=3)
+        
+        self.assertEqual([migration.version for migration in applied], [1, 2, 3])
+        statements = self.connection.statements
+        for migration in applied:
+            start = statements.index(migration.statements[0])
+            end = start + len(migration.statements)
+            self.assertEqual(statements[start:end], list(migration.statements))
+            self.assertIn("INSERT INTO schema_migrations", statements[end])
+            self.assertEqual(statements[end + 1], "COMMIT")
+        self.assertTrue(self.connection.autocommit)
+    
+    def test_failed_migration_rolled_back(self):
+        """Test a failure part-way through a migration rolls back its earlier statements"""
+        def execute(query, params=None):
+            if "idx_email" in query:
+                raise errors.InsufficientPrivilege("permission denied")
+            FakeConnection.execute(self.connection, query, params)
+        self.connection.execute = execute
+        
+        with self.assertRaises(errors.InsufficientPrivilege):
+            migrations.migrate(self.connection)
+        
+        statements = self.connection.statements
+        self.assertIn("idx_username", statements[-2])
+        self.assertEqual(statements[-1], "ROLLBACK")
+        self.assertEqual(statements.count("COMMIT"), 1)
+        self.assertTrue(self.connection.autocommit)
+    
+    def test_benchmark_matches_migrated_indexes(self):
+        """Test the benchmark's hash-sharded layout is the date index the migrations deploy"""
+        def definition(statement):
+            return " ".join(statement.split()).split(" ON ", 1)[1]
+        migration = next(migration for migration in migrations.MIGRATIONS if migration.version == 5)
+        layout = benchmark_indexes.LAYOUTS['hash_sharded']
+        
+        self.assertEqual([definition(statement.format(table='investment')) for statement in layout],
+                         [definition(migration.statements[0])])
+
+
+class TestRealEstateScenarios(unittest.TestCase):
+    """Test the real estate calculator's scenario grid"""
+    
+    def setUp(self):
+        # Rs 10 lakh share of a 3,000 sq ft flat bought at Rs 24,000/sq ft with a 50% partner
+        self.scenarios = build_real_estate_scenarios(1_000_000, 200_000, 3000, 24000)
+    
+    def test_purchase_price_breaks_even(self):
+        """Test the property shows no gain at the original price"""
+        scenario = real_estate_scenario(self.scenarios, 24000)
+        
+        self.assertEqual(scenario['share_profit'], 0)
+        self.assertEqual(scenario['share_current_value'], 1_000_000)
+        self.assertEqual(scenario['overall_invested'], 2_000_000)
+        self.assertEqual(scenario['advantage_vs_mutual_fund'], -200_000)
+    
+    def test_price_on_grid(self):
+        """Test every figure at a grid price"""
+        scenario = real_estate_scenario(self.scenarios, 30000)
+        
+        self.assertAlmostEqual(scenario['price_change_percentage'], 25.0)
+        self.assertAlmostEqual(scenario['property_profit'], 18_000_000)
+        self.assertAlmostEqual(scenario['share_profit'], 9_000_000)
+        self.assertAlmostEqual(scenario['share_roi'], 900.0)
+        self.assertAlmostEqual(scenario['overall_current_value'], 20_000_000)
+        self.assertAlmostEqual(scenario['overall_roi'], 900.0)
+        self.assertAlmostEqual(scenario['advantage_vs_mutual_fund'], 8_800_000)
+    
+    def test_prices_between_and_beyond_grid(self):
+        """Test prices off the grid are exact, including a total loss and above the grid's top"""
+        self.assertAlmostEqual(real_estate_scenario(self.scenarios, 24050)['share_profit'], 75_000)
+        self.assertAlmostEqual(real_estate_scenario(self.scenarios, 0)['share_profit'], -36_000_000)
+        self.assertAlmostEqual(real_estate_scenario(self.scenarios, 0)['price_change_percentage'], -100.0)
+        self.assertAlmostEqual(real_estate_scenario(self.scenarios, 100_000)['share_profit'], 114_000_000)
+    
+    def test_break_even_price(self):
+        """Test the price where the property share matches the mutual fund profit or loss"""
+        self.assertAlmostEqual(real_estate_break_even_price(self.scenarios), 24000 + 200_000 / 1500)
+        
+        losing_fund = build_real_estate_scenarios(1_000_000, -150_000, 3000, 24000)
+        self.assertAlmostEqual(real_estate_break_even_price(losing_fund), 23900)
+    
+    def test_zero_inputs(self):
+        """Test an empty portfolio, a zero area and a zero purchase price don't divide by zero"""
+        empty = real_estate_scenario(build_real_estate_scenarios(0, 0, 3000, 24000), 30000)
+        self.assertEqual(empty['share_roi'], 0.0)
+        self.assertEqual(empty['overall_roi'], 0.0)
+        
+        self.assertIsNone(real_estate_break_even_price(build_real_estate_scenarios(1_000_000, 0, 0, 24000)))
+        
+        free = real_estate_scenario(build_real_estate_scenarios(100, 0, 3000, 0), 50)
+        self.assertAlmostEqual(free['share_profit'], 75_000)
+        self.assertEqual(free['price_change_percentage'], 0.0)
+    
+    def test_cached_grid_not_shared(self):
+        """Test a cached grid is handed out as a copy"""
+        self.scenarios['share_profit'] = 0
+        
+        again = build_real_estate_scenarios(1_000_000, 200_000, 3000, 24000)
+        self.assertAlmostEqual(real_estate_scenario(again, 30000)['share_profit'], 9_000_000)
+
+
+class TestMonteCarloPool(unittest.TestCase):
+    """Test large Monte Carlo runs share one spawned process pool"""
+    
+    def setUp(self):
+        self.portfolio = SimpleNamespace(rows=[
+            SimpleNamespace(current_value=1500.0, annual_return_percentage=10.0),
+            SimpleNamespace(current_value=600.0, annual_return_percentage=6.0),
+        ])
+        self.addCleanup(portfolio_analytics._shutdown_projection_pool)
+        portfolio_analytics._projection_cache.clear()
+    
+    @patch('portfolio_analytics._PROJECTION_POOL_MIN_CELLS', 0)
+    @patch('portfolio_analytics._PROJECTION_BATCH_CELLS', 10_000)
+    def test_shared_spawned_pool(self):
+        """Test the pool is created once with the spawn start method and matches an in-process run"""
+        in_process = project_portfolio_monte_carlo(self.portfolio, years=10, n_paths=2000, workers=1)
+        
+        portfolio_analytics._projection_cache.clear()
+        pooled = project_portfolio_monte_carlo(self.portfolio, years=10, n_paths=2000, workers=2)
+        pool = portfolio_analytics._projection_executor
+        portfolio_analytics._projection_cache.clear()
+        project_portfolio_monte_carlo(self.portfolio, years=10, n_paths=2000, workers=2)
+        
+        self.assertTrue(pooled.equals(in_process))
+        self.assertIs(portfolio_analytics._projection_executor, pool)
+        self.assertEqual(pool._mp_context.get_start_method(), "spawn")
+        
+        portfolio_analytics._shutdown_projection_pool()
+        self.assertIsNone(portfolio_analytics._projection_executor)
+
+
+if __name__ == '__main__':
+    unittest.main()
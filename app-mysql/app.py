@@ -14,8 +14,10 @@ from mysql_service import (
     AuthenticationService,
     calculate_current_value, 
     calculate_profit_loss,
-    calculate_return_percentage
+    calculate_return_percentage,
+    build_portfolio_view
 )
+from portfolio_analytics import calculate_portfolio_growth, calculate_portfolio_xirr, project_portfolio_monte_carlo
 from auth_pages import show_login_page, show_admin_page, show_profile_page
 
 # Configure logging
@@ -48,6 +50,53 @@ def show_inactive_user_message():
     Please contact an administrator to activate your account.
     """)
 
+
+# Investments per page on the View All, Update and Delete pages
+INVESTMENTS_PAGE_SIZE = 25
+
+
+def show_investments_page(key: str, projection: str = 'full'):
+    """
+    Fetch the current page of investments and draw Previous/Next controls
+    
+    Pages are read with keyset pagination; the session keeps the (date, id)
+    each visited page starts after, so only one page is ever loaded.
+    
+    Args:
+        key: Session-state key holding this view's page cursors
+        projection: Columns to fetch - 'summary', 'valuation' or 'full'
+        
+    Returns:
+        Tuple of (records on the current page, number of records on earlier pages)
+    """
+    cursors = st.session_state.setdefault(key, [None])
+    # One extra row tells whether there is a next page
+    records = st.session_state.service.read_investments_page(
+        after=cursors[-1], limit=INVESTMENTS_PAGE_SIZE + 1, projection=projection
+    )
+    has_next = len(records) > INVESTMENTS_PAGE_SIZE
+    records = records[:INVESTMENTS_PAGE_SIZE]
+    
+    if not records and len(cursors) > 1:
+        # Everything on this page was deleted; go back one
+        cursors.pop()
+        st.rerun()
+    
+    if len(cursors) > 1 or has_next:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("◀ Previous", key=f"{key}_previous", disabled=len(cursors) == 1, use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            st.caption(f"Page {len(cursors)}")
+        with col3:
+            if st.button("Next ▶", key=f"{key}_next", disabled=not has_next, use_container_width=True):
+                cursors.append((records[-1].investment_date, records[-1].investment_id))
+                st.rerun()
+    
+    return records, (len(cursors) - 1) * INVESTMENTS_PAGE_SIZE
+
 # MySQL Configuration from Streamlit Secrets
 # For local development: credentials are read from .streamlit/secrets.toml
 # For Streamlit Cloud: add secrets via the Streamlit Cloud console
@@ -435,27 +484,16 @@ if selected == "📊 Dashboard":
         show_inactive_user_message()
     else:
         try:
-            investments = st.session_state.service.read_all_investments()
+            # Headline totals come from one aggregate query, so the cards render
+            # before the full valuation that the charts and table need
+            summary = st.session_state.service.get_portfolio_summary()
             
-            if not investments:
+            if summary.count == 0:
                 st.info("📭 No investments found. Create one to get started!")
             else:
-                # Calculate metrics
-                total_invested = 0
-                total_current_value = 0
-                total_profit_loss = 0
-                
-                for inv in investments:
-                    amount = float(inv.get('investment_amount', 0))
-                    annual_return = float(inv.get('annual_return_percentage', 0))
-                    inv_date = inv.get('investment_date', '').strftime('%Y-%m-%d') if isinstance(inv.get('investment_date'), date) else inv.get('investment_date', '')
-                    
-                    total_invested += amount
-                    
-                    if inv_date:
-                        current_val = calculate_current_value(amount, annual_return, inv_date)
-                        total_current_value += current_val
-                        total_profit_loss += calculate_profit_loss(current_val, amount)
+                total_invested = summary.total_invested
+                total_current_value = summary.total_current_value
+                total_profit_loss = summary.total_profit_loss
                 
                 # Display key metrics with custom gradient cards
                 col1, col2, col3, col4 = st.columns(4)
@@ -478,52 +516,143 @@ if selected == "📊 Dashboard":
                     """, unsafe_allow_html=True)
                 
                 with col3:
-                    overall_return = calculate_return_percentage(total_current_value, total_invested)
-                    st.markdown(f"""
-                        <div class="metric-card metric-card-alt2">
-                            <div class="metric-label">📊 Overall Return</div>
-                            <div class="metric-value">{overall_return:.2f}%</div>
-                        </div>
-                    """, unsafe_allow_html=True)
+                    # Filled in once the XIRR is known
+                    overall_return_card = st.empty()
                 
                 with col4:
                     st.markdown(f"""
                         <div class="metric-card metric-card-alt3">
                             <div class="metric-label">🎯 Total Holdings</div>
-                            <div class="metric-value">{len(investments)}</div>
+                            <div class="metric-value">{summary.count}</div>
                         </div>
                     """, unsafe_allow_html=True)
                 
                 st.markdown("<br>", unsafe_allow_html=True)
                 
+                # Value the portfolio once; every section below renders from this view
+                portfolio = st.session_state.service.get_portfolio_view()
+                portfolio_xirr, position_xirrs = calculate_portfolio_xirr(portfolio)
+                
+                overall_return = summary.total_return_percentage
+                xirr_text = f"XIRR {portfolio_xirr:.2f}% p.a." if pd.notna(portfolio_xirr) else "XIRR —"
+                overall_return_card.markdown(f"""
+                    <div class="metric-card metric-card-alt2">
+                        <div class="metric-label">📊 Overall Return</div>
+                        <div class="metric-value">{overall_return:.2f}%</div>
+                        <div style="font-size: 14px; opacity: 0.9;">{xirr_text}</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
                 # Prepare detailed data for charts
-                chart_data = []
-                for inv in investments:
-                    amount = float(inv.get('investment_amount', 0))
-                    annual_return = float(inv.get('annual_return_percentage', 0))
-                    inv_date = inv.get('investment_date', '')
-                    if isinstance(inv_date, date):
-                        inv_date_str = inv_date.strftime('%Y-%m-%d')
-                    else:
-                        inv_date_str = inv_date
-                    
-                    current_val = calculate_current_value(amount, annual_return, inv_date_str)
-                    profit_loss = calculate_profit_loss(current_val, amount)
-                    return_pct = calculate_return_percentage(current_val, amount)
-                    
-                    chart_data.append({
-                        'id': inv.get('investment_id', '')[:8],
-                        'amount': amount,
-                        'current_value': current_val,
-                        'profit_loss': profit_loss,
-                        'return_pct': return_pct,
-                        'annual_return': annual_return,
-                        'date': inv_date_str
-                    })
+                chart_data = [
+                    {
+                        'id': row.investment_id[:8],
+                        'amount': row.investment_amount,
+                        'current_value': row.current_value,
+                        'profit_loss': row.profit_loss,
+                        'return_pct': row.return_percentage,
+                        'annual_return': row.annual_return_percentage,
+                        'date': row.investment_date
+                    }
+                    for row in portfolio.rows
+                ]
                 
                 # Create visualizations
                 st.markdown("<h2 style='color: #1f2937; margin-top: 30px;'>📊 Investment Analysis</h2>", unsafe_allow_html=True)
                 
+                # Chart: Portfolio Growth since the first investment
+                growth_df = calculate_portfolio_growth(portfolio.rows, as_of=portfolio.as_of)
+                if not growth_df.empty:
+                    st.markdown("""
+                        <div class="chart-container">
+                            <h3 style='margin: 0 0 10px 0; color: #667eea;'>📈 Portfolio Growth</h3>
+                            <p style='color: #666; margin: 0 0 15px 0; font-size: 13px;'>Daily value vs invested capital since the first investment</p>
+                        </div>
+                    """, unsafe_allow_html=True)
+                    growth_chart_df = growth_df.rename(columns={
+                        'date': 'Date', 'invested': 'Invested', 'current_value': 'Current Value'
+                    })
+                    
+                    fig_growth = px.line(
+                        growth_chart_df,
+                        x='Date',
+                        y=['Invested', 'Current Value'],
+                        labels={'value': 'Amount (₹)', 'variable': ''},
+                        color_discrete_map={'Invested': '#636EFA', 'Current Value': '#00CC96'}
+                    )
+                    fig_growth.update_layout(height=400, hovermode='x unified')
+                    st.plotly_chart(fig_growth, use_container_width=True)
+                
+                # Monte Carlo projection of today's portfolio value
+                st.markdown("""
+                    <div class="chart-container">
+                        <h3 style='margin: 0 0 10px 0; color: #667eea;'>🔮 Monte Carlo Projection</h3>
+                        <p style='color: #666; margin: 0 0 15px 0; font-size: 13px;'>Percentile bands of simulated portfolio value</p>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    projection_years = st.slider("Projection horizon (years)", min_value=1, max_value=30, value=10)
+                with col2:
+                    volatility_percentage = st.number_input(
+                        "Annual volatility (%)",
+                        min_value=0.0,
+                        max_value=100.0,
+                        value=15.0,
+                        step=1.0,
+                        help="Standard deviation of each year's return around the investment's annual return"
+                    )
+                with col3:
+                    n_paths = st.selectbox("Scenarios", [1_000, 10_000, 100_000], index=1, format_func=lambda n: f"{n:,}")
+                
+                projection_df = project_portfolio_monte_carlo(
+                    portfolio,
+                    years=projection_years,
+                    volatility_percentage=volatility_percentage,
+                    n_paths=n_paths
+                )
+                
+                fig_projection = go.Figure()
+                for upper, lower, band_name, band_color in [
+                    ('p95', 'p5', '5th-95th percentile', 'rgba(102, 126, 234, 0.2)'),
+                    ('p75', 'p25', '25th-75th percentile', 'rgba(102, 126, 234, 0.4)')
+                ]:
+                    fig_projection.add_trace(go.Scatter(
+                        x=projection_df['year'], y=projection_df[upper],
+                        line=dict(width=0), showlegend=False, hoverinfo='skip'
+                    ))
+                    fig_projection.add_trace(go.Scatter(
+                        x=projection_df['year'], y=projection_df[lower],
+                        fill='tonexty', fillcolor=band_color, line=dict(width=0), name=band_name,
+                        hoverinfo='skip'
+                    ))
+                fig_projection.add_trace(go.Scatter(
+                    x=projection_df['year'], y=projection_df['p50'], name='Median',
+                    line=dict(color='#667eea', width=3),
+                    hovertemplate='Year %{x}: ₹%{y:,.0f}<extra>Median</extra>'
+                ))
+                fig_projection.add_trace(go.Scatter(
+                    x=projection_df['year'], y=projection_df['deterministic'], name='Compounded at annual return',
+                    line=dict(color='#43e97b', dash='dash'),
+                    hovertemplate='Year %{x}: ₹%{y:,.0f}<extra>Compounded</extra>'
+                ))
+                fig_projection.update_layout(
+                    height=450,
+                    xaxis_title="Years from today",
+                    yaxis_title="Portfolio Value (₹)",
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)'
+                )
+                st.plotly_chart(fig_projection, use_container_width=True)
+                
+                final_year = projection_df.iloc[-1]
+                st.caption(
+                    f"After {projection_years} years: median ₹{final_year['p50']:,.0f}, "
+                    f"5th-95th percentile ₹{final_year['p5']:,.0f} - ₹{final_year['p95']:,.0f} "
+                    f"({n_paths:,} scenarios)"
+                )
+                
                 col1, col2 = st.columns(2)
                 
                 # Chart 1: Portfolio Composition (Pie Chart)
@@ -629,41 +758,40 @@ if selected == "📊 Dashboard":
                     <p style='color: #666; margin-bottom: 20px;'>Complete list of all your investments</p>
                 """, unsafe_allow_html=True)
                 
-                # Display investments table
-                display_data = []
-                for inv in investments:
-                    amount = float(inv.get('investment_amount', 0))
-                    annual_return = float(inv.get('annual_return_percentage', 0))
-                    inv_date = inv.get('investment_date', '')
-                    if isinstance(inv_date, date):
-                        inv_date = inv_date.strftime('%Y-%m-%d')
-                    
-                    current_val = calculate_current_value(amount, annual_return, inv_date)
-                    profit_loss = calculate_profit_loss(current_val, amount)
-                    return_pct = calculate_return_percentage(current_val, amount)
-                    
-                    # Calculate days passed
-                    inv_date_obj = datetime.strptime(inv_date, '%Y-%m-%d').date()
-                    days_passed = (date.today() - inv_date_obj).days
-                    
-                    # Current date
-                    current_date = datetime.now().strftime('%Y-%m-%d')
-                    
-                    display_data.append({
-                        'Investment ID': inv.get('investment_id', '')[:8] + '...',
-                        'Amount': f"₹{amount:,.2f}",
-                        'Date': inv_date,
-                        'Days Passed': days_passed,
-                        'Current Date': current_date,
-                        'Annual Return %': f"{annual_return:.2f}%",
-                        'Current Value': f"₹{current_val:,.2f}",
-                        'Profit/Loss': f"₹{profit_loss:,.2f}",
-                        'Return %': f"{return_pct:.2f}%",
-                        'Comments': inv.get('investment_comments', 'N/A')
-                    })
-                
-                df = pd.DataFrame(display_data)
-                st.dataframe(df, use_container_width=True)
+                # Display investments table; columns stay numeric so they sort
+                # by value, and column_config handles the formatting
+                # The valuation scan is index-only, so comments come from their own read
+                rows = portfolio.rows
+                comments = st.session_state.service.read_investment_comments()
+                today = date.today()
+                df = pd.DataFrame({
+                    'Investment ID': [row.investment_id[:8] + '...' for row in rows],
+                    'Amount': [row.investment_amount for row in rows],
+                    'Date': pd.to_datetime([row.investment_date for row in rows]),
+                    'Days Passed': [(today - row.investment_date).days for row in rows],
+                    'Current Date': pd.Timestamp(today),
+                    'Annual Return %': [row.annual_return_percentage for row in rows],
+                    'Current Value': [row.current_value for row in rows],
+                    'Profit/Loss': [row.profit_loss for row in rows],
+                    'Return %': [row.return_percentage for row in rows],
+                    'XIRR %': position_xirrs,
+                    'Comments': [comments.get(row.investment_id) for row in rows]
+                })
+                st.dataframe(
+                    df,
+                    use_container_width=True,
+                    column_config={
+                        'Amount': st.column_config.NumberColumn("Amount (₹)", format="localized"),
+                        'Date': st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+                        'Days Passed': st.column_config.NumberColumn(format="%d"),
+                        'Current Date': st.column_config.DateColumn("Current Date", format="YYYY-MM-DD"),
+                        'Annual Return %': st.column_config.NumberColumn(format="%.2f%%"),
+                        'Current Value': st.column_config.NumberColumn("Current Value (₹)", format="localized"),
+                        'Profit/Loss': st.column_config.NumberColumn("Profit/Loss (₹)", format="localized"),
+                        'Return %': st.column_config.NumberColumn(format="%.2f%%"),
+                        'XIRR %': st.column_config.NumberColumn(format="%.2f%%")
+                    }
+                )
         
         except Exception as e:
             st.error(f"❌ Error loading dashboard: {str(e)}")
@@ -760,28 +888,26 @@ elif selected == "👁️ View All":
         st.header("All Investments")
         
         try:
-            investments = st.session_state.service.read_all_investments()
+            records, offset = show_investments_page("view_all_cursors")
+            portfolio = build_portfolio_view(records)
             
-            if not investments:
+            if not portfolio.rows:
                 st.info("📭 No investments found. Create one to get started!")
             else:
                 # Display investments
-                for idx, inv in enumerate(investments, 1):
+                for idx, row in enumerate(portfolio.rows, offset + 1):
                     with st.expander(
-                        f"📈 Investment #{idx} - {inv.get('investment_date', 'N/A')}", 
+                        f"📈 Investment #{idx} - {row.investment_date}", 
                         expanded=False
                     ):
                         col1, col2, col3 = st.columns(3)
                         
-                        amount = float(inv.get('investment_amount', 0))
-                        annual_return = float(inv.get('annual_return_percentage', 0))
-                        inv_date = inv.get('investment_date', '')
-                        if isinstance(inv_date, date):
-                            inv_date = inv_date.strftime('%Y-%m-%d')
-                        
-                        current_val = calculate_current_value(amount, annual_return, inv_date)
-                        profit_loss = calculate_profit_loss(current_val, amount)
-                        return_pct = calculate_return_percentage(current_val, amount)
+                        amount = row.investment_amount
+                        annual_return = row.annual_return_percentage
+                        inv_date = row.investment_date
+                        current_val = row.current_value
+                        profit_loss = row.profit_loss
+                        return_pct = row.return_percentage
                         
                         with col1:
                             st.metric("Investment Amount", f"₹{amount:,.2f}")
@@ -796,7 +922,7 @@ elif selected == "👁️ View All":
                         with col2:
                             st.metric("Return %", f"{return_pct:.2f}%")
                         with col3:
-                            st.metric("Investment Date", inv_date)
+                            st.metric("Investment Date", str(inv_date))
                         
                         # New fields: Current Date and Days Passed
                         col1, col2, col3 = st.columns(3)
@@ -804,14 +930,13 @@ elif selected == "👁️ View All":
                             current_date = datetime.now().strftime('%Y-%m-%d')
                             st.metric("Current Date", current_date)
                         with col2:
-                            inv_date_obj = datetime.strptime(inv_date, '%Y-%m-%d').date()
-                            days_passed = (date.today() - inv_date_obj).days
+                            days_passed = (date.today() - inv_date).days
                             st.metric("Days Passed", f"{days_passed} days")
                         with col3:
                             st.write("")  # Empty column for alignment
                         
                         # Display comments if available
-                        comments = inv.get('investment_comments', '')
+                        comments = row.investment_comments
                         if comments:
                             st.info(f"💬 **Comments:** {comments}")
                         
@@ -836,7 +961,7 @@ elif selected == "👁️ View All":
                             fig_mini_bar.update_layout(height=250, showlegend=False)
                             st.plotly_chart(fig_mini_bar, use_container_width=True)
                         
-                        st.info(f"**ID:** `{inv.get('investment_id')}`")
+                        st.info(f"**ID:** `{row.investment_id}`")
                 
         except Exception as e:
             st.error(f"❌ Error loading investments: {str(e)}")
@@ -851,20 +976,16 @@ elif selected == "✏️ Update":
         st.header("Update Investment")
         
         try:
-            investments = st.session_state.service.read_all_investments()
+            records, _ = show_investments_page("update_cursors", projection='summary')
             
-            if not investments:
+            if not records:
                 st.info("📭 No investments found to update!")
             else:
                 # Create selection options
-                investment_options = {}
-                for inv in investments:
-                    inv_date = inv.get('investment_date', '')
-                    if isinstance(inv_date, date):
-                        inv_date = inv_date.strftime('%Y-%m-%d')
-                    amount = float(inv.get('investment_amount', 0))
-                    display_key = f"{inv_date} - ₹{amount:,.2f}"
-                    investment_options[display_key] = inv.get('investment_id')
+                investment_options = {
+                    f"{row.investment_date} - ₹{row.investment_amount:,.2f}": row.investment_id
+                    for row in records
+                }
                 
                 selected_display = st.selectbox(
                     "Select an investment to update",
@@ -986,23 +1107,19 @@ elif selected == "🗑️ Delete":
         st.header("Delete Investment")
         
         try:
-            investments = st.session_state.service.read_all_investments()
+            records, _ = show_investments_page("delete_cursors", projection='summary')
             
-            if not investments:
+            if not records:
                 st.info("📭 No investments found to delete!")
             else:
                 col1, col2 = st.columns([3, 1])
                 
                 with col1:
                     # Create selection options
-                    investment_options = {}
-                    for inv in investments:
-                        inv_date = inv.get('investment_date', '')
-                        if isinstance(inv_date, date):
-                            inv_date = inv_date.strftime('%Y-%m-%d')
-                        amount = float(inv.get('investment_amount', 0))
-                        display_key = f"{inv_date} - ₹{amount:,.2f}"
-                        investment_options[display_key] = inv.get('investment_id')
+                    investment_options = {
+                        f"{row.investment_date} - ₹{row.investment_amount:,.2f}": row.investment_id
+                        for row in records
+                    }
                     
                     selected_display = st.selectbox(
                         "Select an investment to delete",
@@ -1012,7 +1129,7 @@ elif selected == "🗑️ Delete":
                 
                 if selected_display:
                     selected_id = investment_options[selected_display]
-                    selected_investment = st.session_state.service.read_investment(selected_id)
+                    selected_investment = st.session_state.service.read_investment(selected_id, projection='valuation')
                     
                     if selected_investment:
                         st.warning(f"⚠️ You are about to delete investment: `{selected_id}`")
@@ -0,0 +1,193 @@
+"""
+Benchmark the covering valuation index on MySQL
+
+Compares the plain idx_investment_date the schema used to have with the
+covering idx_investment_valuation from migration 5, on scratch tables shaped
+like investment. Each layout runs the service's whole-table valuation reads
+(the streamed column scan and the portfolio summary aggregate) and reports
+their EXPLAIN access path and p50/p95 latency:
+
+    python benchmark_indexes.py --rows 200000 --scans 10
+
+Connects with the same settings as the app. With the covering index EXPLAIN
+shows "Using index" and the clustered rows are never read; with the plain
+index the scan reads every row from the clustered index instead.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from mysql_service import (
+    InvestmentService,
+    close_connection_pools,
+    _PORTFOLIO_SUMMARY_QUERY,
+    _VALUATION_SCAN_QUERY,
+)
+
+# Date index on the scratch table for each layout; {table} is substituted
+LAYOUTS = {
+    'date_only': "CREATE INDEX {table}_date ON {table} (investment_date)",
+    'covering': (
+        "CREATE INDEX {table}_valuation ON {table} "
+        "(investment_date, investment_amount, annual_return_percentage, investment_id)"
+    ),
+}
+
+# The service's valuation reads, with the parameters each one takes
+QUERIES = {
+    'column scan': (_VALUATION_SCAN_QUERY, ()),
+    'summary': (_PORTFOLIO_SUMMARY_QUERY, (date.today(), date.today())),
+}
+
+
+def create_table(service: InvestmentService, table: str, layout: str):
+    """
+    Create an empty scratch copy of the investment table with a layout's date index
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        layout: Key of LAYOUTS
+    """
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(f"""
+            CREATE TABLE {table} (
+                investment_id VARCHAR(36) PRIMARY KEY,
+                investment_amount DECIMAL(15, 2) NOT NULL,
+                investment_date DATE NOT NULL,
+                annual_return_percentage DECIMAL(5, 2) NOT NULL,
+                investment_comments TEXT,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB
+        """)
+        cursor.execute(LAYOUTS[layout].format(table=table))
+        cursor.close()
+
+
+def insert_rows(service: InvestmentService, table: str, rows: int, batch_size: int, days: int):
+    """
+    Fill a scratch table with random investments, committing one batch at a time
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        rows: Total rows to insert
+        batch_size: Rows per multi-row INSERT
+        days: Investment dates are spread over this many days ending today
+    """
+    today = date.today()
+    rng = random.Random(42)
+    insert_query = f"""
+        INSERT INTO {table} (investment_id, investment_amount, investment_date,
+                             annual_return_percentage, investment_comments)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        for start in range(0, rows, batch_size):
+            batch = [
+                # Comments give rows a realistic width, which the covering scan skips
+                (str(uuid.uuid4()), round(rng.uniform(1000, 500000), 2),
+                 today - timedelta(days=rng.randrange(days)), round(rng.uniform(0, 15), 2), "x" * rng.randrange(200))
+                for _ in range(min(batch_size, rows - start))
+            ]
+            cursor.executemany(insert_query, batch)
+            connection.commit()
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+        cursor.close()
+
+
+def scan_latencies(service: InvestmentService, table: str, scans: int) -> Dict:
+    """
+    Explain and time each valuation read against a scratch table
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        scans: Number of timed runs per query
+    
+    Returns:
+        Dict of query name to p50/p95 latency in milliseconds, the index EXPLAIN
+        chose and whether the access is index-only
+    """
+    results = {}
+    with service.pool.connection() as connection:
+        explain_cursor = connection.cursor(dictionary=True)
+        # Raw rows keep Python-side type conversion out of the timings
+        cursor = connection.cursor(raw=True)
+        for name, (query, params) in QUERIES.items():
+            query = query.replace("FROM investment", f"FROM {table}")
+            explain_cursor.execute("EXPLAIN " + query, params)
+            plan = explain_cursor.fetchall()[0]
+            
+            latencies = []
+            for _ in range(scans):
+                started = time.perf_counter()
+                cursor.execute(query, params)
+                cursor.fetchall()
+                latencies.append((time.perf_counter() - started) * 1000)
+            latencies.sort()
+            results[name] = {
+                'p50_ms': statistics.median(latencies),
+                'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                'key': plan['key'] or '-',
+                'index_only': 'Using index' in (plan['Extra'] or ''),
+            }
+        explain_cursor.close()
+        cursor.close()
+    return results
+
+
+def drop_table(service: InvestmentService, table: str):
+    """Drop a scratch table"""
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the covering investment valuation index")
+    parser.add_argument("--rows", type=int, default=200000, help="rows inserted per layout")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per insert")
+    parser.add_argument("--days", type=int, default=3650, help="spread of investment dates, ending today")
+    parser.add_argument("--scans", type=int, default=10, help="timed runs of each query")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch tables afterwards")
+    args = parser.parse_args(argv)
+    
+    service = InvestmentService()
+    results = {}
+    try:
+        for layout in LAYOUTS:
+            table = f"bench_investment_{layout}"
+            print(f"⏳ {layout}: inserting {args.rows} rows...")
+            create_table(service, table, layout)
+            insert_rows(service, table, args.rows, args.batch_size, args.days)
+            results[layout] = scan_latencies(service, table, args.scans)
+            if not args.keep:
+                drop_table(service, table)
+    finally:
+        service.close()
+        close_connection_pools()
+    
+    print()
+    print(f"{'layout':<10} {'query':<12} {'p50 ms':>9} {'p95 ms':>9}  {'index':<36} index-only")
+    for layout, queries in results.items():
+        for name, result in queries.items():
+            print(f"{layout:<10} {name:<12} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f}  "
+                  f"{result['key']:<36} {'yes' if result['index_only'] else 'no'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
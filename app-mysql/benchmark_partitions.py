@@ -0,0 +1,232 @@
+"""
+Benchmark RANGE partitioning by investment year on MySQL
+
+Loads the same multi-million-row dataset into two scratch tables shaped like
+investment, one plain and one partitioned by YEAR(investment_date) as in the
+optional layout of mysql_schema.sql, then runs the service's date-range read
+(read_investments_between) over a year and a quarter on each. Reports the
+partitions EXPLAIN reads, the rows it expects to examine and p50/p95 latency:
+
+    python benchmark_partitions.py --rows 2000000 --years 10 --scans 5
+
+Connects with the same settings as the app. Loading two million rows takes a
+few minutes; --keep leaves the tables for re-runs with --reuse.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from migrations import partition_clause
+from mysql_service import (
+    Investment,
+    InvestmentService,
+    close_connection_pools,
+    _INVESTMENTS_BETWEEN_QUERY,
+    _PROJECTIONS,
+)
+
+TABLES = {
+    'plain': "bench_investment_plain",
+    'partitioned': "bench_investment_partitioned",
+}
+
+
+def create_table(service: InvestmentService, table: str, partitions: Optional[str] = None):
+    """
+    Create an empty scratch copy of the investment table with the production indexes
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        partitions: PARTITION BY clause, or None for a plain table
+    """
+    # Partitioned tables need the partitioning column in the primary key
+    primary_key = "investment_id, investment_date" if partitions else "investment_id"
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(f"""
+            CREATE TABLE {table} (
+                investment_id VARCHAR(36) NOT NULL,
+                investment_amount DECIMAL(15, 2) NOT NULL,
+                investment_date DATE NOT NULL,
+                annual_return_percentage DECIMAL(5, 2) NOT NULL,
+                investment_comments TEXT,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY ({primary_key}),
+                INDEX idx_investment_valuation
+                    (investment_date, investment_amount, annual_return_percentage, investment_id),
+                INDEX idx_investment_date_id (investment_date DESC, investment_id)
+            ) ENGINE=InnoDB
+            {partitions or ""}
+        """)
+        cursor.close()
+
+
+def load_rows(service: InvestmentService, table: str, rows: int, batch_size: int, first_day: date, days: int):
+    """
+    Fill a scratch table with random investments, committing one batch at a time
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        rows: Total rows to insert
+        batch_size: Rows per multi-row INSERT
+        first_day: Earliest investment date
+        days: Investment dates are spread over this many days from first_day
+    """
+    rng = random.Random(42)
+    insert_query = f"""
+        INSERT INTO {table} (investment_id, investment_amount, investment_date,
+                             annual_return_percentage, investment_comments)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        for start in range(0, rows, batch_size):
+            batch = [
+                (str(uuid.uuid4()), round(rng.uniform(1000, 500000), 2),
+                 first_day + timedelta(days=rng.randrange(days)), round(rng.uniform(0, 15), 2), "x" * rng.randrange(200))
+                for _ in range(min(batch_size, rows - start))
+            ]
+            cursor.executemany(insert_query, batch)
+            connection.commit()
+            if (start // batch_size) % 100 == 0:
+                print(f"   {start + len(batch)}/{rows} rows")
+        cursor.close()
+
+
+def copy_rows(service: InvestmentService, source: str, target: str):
+    """Copy every row of one scratch table into another, so both layouts hold the same data"""
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"INSERT INTO {target} SELECT * FROM {source}")
+        connection.commit()
+        cursor.close()
+
+
+def analyze(service: InvestmentService, table: str):
+    """Refresh a scratch table's index statistics"""
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+        cursor.close()
+
+
+def range_latencies(service: InvestmentService, table: str, projection: str, start: date, end: date,
+                    scans: int) -> Dict:
+    """
+    Explain and time the service's date-range read against a scratch table
+    
+    Args:
+        service: Connected InvestmentService
+        table: Scratch table name
+        projection: Projection whose columns are selected
+        start: First investment date of the range
+        end: Day after the range
+        scans: Number of timed runs
+    
+    Returns:
+        Dict with p50/p95 latency in milliseconds, the partitions EXPLAIN reads,
+        its row estimate and the rows returned
+    """
+    columns = [column for column in _PROJECTIONS[projection] if column in Investment._fields]
+    query = _INVESTMENTS_BETWEEN_QUERY.format(columns=", ".join(columns)).replace("FROM investment", f"FROM {table}")
+    with service.pool.connection() as connection:
+        explain_cursor = connection.cursor(dictionary=True)
+        explain_cursor.execute("EXPLAIN " + query, (start, end))
+        plan = explain_cursor.fetchall()[0]
+        explain_cursor.close()
+        
+        # Raw rows keep Python-side type conversion out of the timings
+        cursor = connection.cursor(raw=True)
+        latencies = []
+        row_count = 0
+        for _ in range(scans):
+            started = time.perf_counter()
+            cursor.execute(query, (start, end))
+            row_count = len(cursor.fetchall())
+            latencies.append((time.perf_counter() - started) * 1000)
+        cursor.close()
+    
+    latencies.sort()
+    partitions = (plan.get('partitions') or '-').split(',')
+    return {
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'partitions': partitions[0] if len(partitions) == 1 else f"{len(partitions)} partitions",
+        'estimated_rows': plan['rows'],
+        'rows': row_count,
+    }
+
+
+def drop_table(service: InvestmentService, table: str):
+    """Drop a scratch table"""
+    with service.pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark year partitioning of the investment table")
+    parser.add_argument("--rows", type=int, default=2000000, help="rows in each scratch table")
+    parser.add_argument("--years", type=int, default=10, help="years of investment dates, ending this year")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per insert")
+    parser.add_argument("--scans", type=int, default=5, help="timed runs of each query")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch tables afterwards")
+    parser.add_argument("--reuse", action="store_true", help="reuse scratch tables left by --keep")
+    args = parser.parse_args(argv)
+    
+    this_year = date.today().year
+    first_day = date(this_year - args.years + 1, 1, 1)
+    report_year = this_year - 1
+    ranges = {
+        f"year {report_year}": (date(report_year, 1, 1), date(report_year + 1, 1, 1)),
+        f"Q1 {report_year}": (date(report_year, 1, 1), date(report_year, 4, 1)),
+    }
+    
+    service = InvestmentService()
+    results = []
+    try:
+        if not args.reuse:
+            print(f"⏳ Loading {args.rows} rows over {args.years} years...")
+            create_table(service, TABLES['plain'])
+            load_rows(service, TABLES['plain'], args.rows, args.batch_size, first_day, (date.today() - first_day).days + 1)
+            create_table(service, TABLES['partitioned'], partition_clause(first_day.year, this_year + 2))
+            copy_rows(service, TABLES['plain'], TABLES['partitioned'])
+        for table in TABLES.values():
+            analyze(service, table)
+        
+        for label, (start, end) in ranges.items():
+            for projection in ('full', 'valuation'):
+                for layout, table in TABLES.items():
+                    result = range_latencies(service, table, projection, start, end, args.scans)
+                    results.append((label, projection, layout, result))
+        
+        if not args.keep:
+            for table in TABLES.values():
+                drop_table(service, table)
+    finally:
+        service.close()
+        close_connection_pools()
+    
+    print()
+    print(f"{'range':<10} {'projection':<10} {'layout':<12} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'est. rows':>10} {'rows':>8}  partitions")
+    for label, projection, layout, result in results:
+        print(f"{label:<10} {projection:<10} {layout:<12} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+              f"{result['estimated_rows']:>10} {result['rows']:>8}  {result['partitions']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
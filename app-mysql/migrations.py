@@ -0,0 +1,322 @@
+"""
+Versioned schema migrations for the Investment Dashboard - MySQL Edition
+
+Each migration is applied once and recorded in the schema_migrations table, so
+the services never run DDL when a session starts. Apply pending migrations at
+deploy time:
+
+    python migrations.py            # apply everything pending
+    python migrations.py status     # list applied and pending versions
+    python migrations.py partitions # add upcoming yearly partitions only
+
+Both migrate and partitions also keep a year-partitioned investment table (the
+optional layout in mysql_schema.sql) PARTITION_YEARS_AHEAD years ahead.
+
+Connection settings come from the MYSQL_HOST, MYSQL_PORT, MYSQL_USER,
+MYSQL_PASSWORD and MYSQL_DATABASE environment variables (as the docker-compose
+migrate service sets them), falling back to .streamlit/secrets.toml.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import date
+from typing import Dict, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from mysql.connector import Error, errorcode
+
+from mysql_service import InvestmentService, close_connection_pools
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    """One schema change, recorded under its version once all statements succeed"""
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+# Append new migrations; never edit or renumber one that has shipped
+MIGRATIONS = [
+    Migration(1, "Create investment table", (
+        """
+        CREATE TABLE IF NOT EXISTS investment (
+            investment_id VARCHAR(36) PRIMARY KEY,
+            investment_amount DECIMAL(15, 2) NOT NULL,
+            investment_date DATE NOT NULL,
+            annual_return_percentage DECIMAL(5, 2) NOT NULL,
+            investment_comments TEXT,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP NOT NULL DEFAULT '0000-00-00 00:00:00',
+            INDEX idx_investment_date (investment_date)
+        ) ENGINE=InnoDB DEFAULT CHARSET=latin1
+        """,
+    )),
+    Migration(2, "Create users table", (
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id VARCHAR(36) PRIMARY KEY,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            full_name VARCHAR(100),
+            role VARCHAR(20) NOT NULL DEFAULT 'user',
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP NOT NULL DEFAULT '0000-00-00 00:00:00',
+            KEY idx_username (username),
+            KEY idx_email (email),
+            KEY idx_role (role)
+        ) ENGINE=InnoDB DEFAULT CHARSET=latin1
+        """,
+    )),
+    Migration(3, "Add investment_comments to tables created before comments", (
+        "ALTER TABLE investment ADD COLUMN investment_comments TEXT",
+    )),
+    Migration(4, "Add keyset pagination index", (
+        "CREATE INDEX idx_investment_date_id ON investment (investment_date DESC, investment_id)",
+    )),
+    # Covers the date-ordered valuation reads so they never visit the clustered
+    # index; its leading investment_date makes idx_investment_date redundant
+    Migration(5, "Replace idx_investment_date with a covering valuation index", (
+        """
+        CREATE INDEX idx_investment_valuation ON investment
+        (investment_date, investment_amount, annual_return_percentage, investment_id)
+        """,
+        "DROP INDEX idx_investment_date ON investment",
+    )),
+]
+
+# Errors meaning a statement's change is already in place, as on databases the
+# services set up before migrations existed. MySQL DDL commits implicitly, so
+# this is also what makes re-running a half-applied migration safe.
+_ALREADY_APPLIED_ERRORS = {
+    errorcode.ER_DUP_FIELDNAME,
+    errorcode.ER_DUP_KEYNAME,
+    errorcode.ER_CANT_DROP_FIELD_OR_KEY,
+}
+
+
+def ensure_migrations_table(connection):
+    """
+    Create the schema_migrations bookkeeping table if it doesn't exist
+    
+    Args:
+        connection: Open MySQL connection
+    """
+    cursor = connection.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB
+    """)
+    cursor.close()
+
+
+def applied_versions(connection) -> Set[int]:
+    """
+    Get the versions already recorded in schema_migrations
+    
+    Args:
+        connection: Open MySQL connection
+    
+    Returns:
+        Set of applied migration versions
+    """
+    ensure_migrations_table(connection)
+    cursor = connection.cursor()
+    cursor.execute("SELECT version FROM schema_migrations")
+    versions = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    return versions
+
+
+def pending_migrations(connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Get the migrations not yet applied, in version order
+    
+    Args:
+        connection: Open MySQL connection
+        target: Highest version to include (defaults to the latest)
+    
+    Returns:
+        List of pending migrations
+    """
+    applied = applied_versions(connection)
+    return [
+        migration for migration in sorted(MIGRATIONS)
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def migrate(connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations in order, recording each as it completes
+    
+    Args:
+        connection: Open MySQL connection
+        target: Highest version to apply (defaults to the latest)
+    
+    Returns:
+        List of migrations applied by this call
+    """
+    pending = pending_migrations(connection, target)
+    cursor = connection.cursor()
+    try:
+        for migration in pending:
+            logger.info(f"Applying migration {migration.version}: {migration.description}")
+            for statement in migration.statements:
+                try:
+                    cursor.execute(statement)
+                except Error as e:
+                    if e.errno not in _ALREADY_APPLIED_ERRORS:
+                        raise
+                    logger.info(f"Migration {migration.version} already in place: {e.msg}")
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (migration.version, migration.description)
+            )
+            connection.commit()
+    except Error as e:
+        logger.error(f"Error applying migrations: {e}")
+        raise
+    finally:
+        cursor.close()
+    return pending
+
+
+# Yearly partitions kept ahead of the current year on a partitioned investment table
+PARTITION_YEARS_AHEAD = 2
+
+
+def partition_clause(first_year: int, last_year: int) -> str:
+    """
+    Build the PARTITION BY clause for a year-partitioned investment table
+    
+    Args:
+        first_year: Earliest year with its own partition; older dates go to p_past
+        last_year: Latest year with its own partition; later dates go to p_future
+    
+    Returns:
+        PARTITION BY RANGE (YEAR(investment_date)) clause
+    """
+    partitions = [f"PARTITION p_past VALUES LESS THAN ({first_year})"]
+    partitions += [f"PARTITION p{year} VALUES LESS THAN ({year + 1})" for year in range(first_year, last_year + 1)]
+    partitions.append("PARTITION p_future VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (YEAR(investment_date)) (\n    " + ",\n    ".join(partitions) + "\n)"
+
+
+def maintain_partitions(connection, table: str = "investment", years_ahead: int = PARTITION_YEARS_AHEAD,
+                        today: Optional[date] = None) -> List[str]:
+    """
+    Add yearly partitions so a partitioned table has one for each year up to years_ahead
+    
+    New years are split off the MAXVALUE partition. Only that partition's rows are
+    copied, and it normally holds none, so the split stays cheap however large the
+    table is. Tables that are not partitioned are left alone.
+    
+    Args:
+        connection: Open MySQL connection
+        table: Table partitioned by RANGE (YEAR(investment_date))
+        years_ahead: Years after the current one that must have a partition
+        today: Reference date (defaults to today)
+    
+    Returns:
+        Names of the partitions added
+    """
+    today = today or date.today()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT partition_name, partition_description
+            FROM information_schema.partitions
+            WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+        """, (table,))
+        bounds = dict(cursor.fetchall())
+        if not bounds:
+            return []
+        
+        catch_all = next((name for name, bound in bounds.items() if bound == "MAXVALUE"), None)
+        next_year = max((int(bound) for bound in bounds.values() if bound != "MAXVALUE"), default=today.year)
+        added = []
+        for year in range(next_year, today.year + years_ahead + 1):
+            definition = f"PARTITION p{year} VALUES LESS THAN ({year + 1})"
+            if catch_all:
+                cursor.execute(
+                    f"ALTER TABLE {table} REORGANIZE PARTITION {catch_all} "
+                    f"INTO ({definition}, PARTITION {catch_all} VALUES LESS THAN MAXVALUE)"
+                )
+            else:
+                cursor.execute(f"ALTER TABLE {table} ADD PARTITION ({definition})")
+            logger.info(f"Added partition p{year} to {table}")
+            added.append(f"p{year}")
+        return added
+    except Error as e:
+        logger.error(f"Error maintaining partitions: {e}")
+        raise
+    finally:
+        cursor.close()
+
+
+# InvestmentService argument for each connection environment variable
+_ENVIRONMENT_SETTINGS = {
+    'MYSQL_HOST': 'host',
+    'MYSQL_PORT': 'port',
+    'MYSQL_USER': 'user',
+    'MYSQL_PASSWORD': 'password',
+    'MYSQL_DATABASE': 'database',
+}
+
+
+def connection_settings(environ: Optional[Mapping[str, str]] = None) -> Dict:
+    """
+    Read connection settings from the environment
+    
+    Args:
+        environ: Environment to read (defaults to os.environ)
+    
+    Returns:
+        InvestmentService keyword arguments for the variables that are set; the
+        service reads the rest from secrets
+    """
+    environ = os.environ if environ is None else environ
+    settings = {argument: environ[name] for name, argument in _ENVIRONMENT_SETTINGS.items() if environ.get(name)}
+    if 'port' in settings:
+        settings['port'] = int(settings['port'])
+    return settings
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; connects with the environment's settings, or the app's secrets"""
+    parser = argparse.ArgumentParser(description="Apply Investment Dashboard schema migrations")
+    parser.add_argument("command", nargs="?", choices=["migrate", "status", "partitions"], default="migrate")
+    parser.add_argument("--target", type=int, help="highest migration version to apply")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
+    service = InvestmentService(**connection_settings())
+    try:
+        with service.pool.connection() as connection:
+            if args.command == "status":
+                applied = applied_versions(connection)
+                for migration in sorted(MIGRATIONS):
+                    state = "applied" if migration.version in applied else "pending"
+                    print(f"{migration.version:>4}  {state:<8} {migration.description}")
+            else:
+                if args.command == "migrate":
+                    applied = migrate(connection, args.target)
+                    print(f"✅ Applied {len(applied)} migration(s)" if applied else "✅ Schema is up to date")
+                added = maintain_partitions(connection)
+                if added:
+                    print(f"✅ Added partitions {', '.join(added)}")
+    finally:
+        service.close()
+        close_connection_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 -- MySQL Schema for Investment Dashboard
 -- Run this script to create the database and tables
+-- Deployments should apply migrations.py afterwards; it records versions in
+-- schema_migrations and skips changes this script has already made
 
 -- Create database if not exists
 CREATE DATABASE IF NOT EXISTS investment_db;
@@ -16,13 +18,45 @@ CREATE TABLE IF NOT EXISTS investment (
     investment_comments TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    INDEX idx_investment_date (investment_date),
+    INDEX idx_investment_valuation (investment_date, investment_amount, annual_return_percentage, investment_id),
+    INDEX idx_investment_date_id (investment_date DESC, investment_id),
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Add comments column if it doesn't exist (for existing tables)
 ALTER TABLE investment ADD COLUMN IF NOT EXISTS investment_comments TEXT;
 
+-- ==================== OPTIONAL: PARTITION BY INVESTMENT YEAR ====================
+-- For multi-million-row tables, partitioning investment by year lets date-range
+-- queries read only the years they ask for. MySQL requires the partitioning
+-- column in every unique key, so the primary key becomes
+-- (investment_id, investment_date); lookups by id alone then probe each
+-- partition's primary key. Converting rebuilds the table, so run it in a
+-- maintenance window. Uncomment and adjust the first year to your oldest data:
+--
+-- ALTER TABLE investment
+--     DROP PRIMARY KEY,
+--     ADD PRIMARY KEY (investment_id, investment_date)
+-- PARTITION BY RANGE (YEAR(investment_date)) (
+--     PARTITION p_past VALUES LESS THAN (2020),
+--     PARTITION p2020 VALUES LESS THAN (2021),
+--     PARTITION p2021 VALUES LESS THAN (2022),
+--     PARTITION p2022 VALUES LESS THAN (2023),
+--     PARTITION p2023 VALUES LESS THAN (2024),
+--     PARTITION p2024 VALUES LESS THAN (2025),
+--     PARTITION p2025 VALUES LESS THAN (2026),
+--     PARTITION p2026 VALUES LESS THAN (2027),
+--     PARTITION p2027 VALUES LESS THAN (2028),
+--     PARTITION p_future VALUES LESS THAN MAXVALUE
+-- );
+--
+-- Every `python migrations.py` run (including the docker-compose migrate service)
+-- then splits new years off p_future, keeping partitions two years ahead.
+-- `python migrations.py partitions` does only that, e.g. from a yearly cron job.
+-- Filter on the bare column (investment_date >= '2024-01-01' AND
+-- investment_date < '2025-01-01'), never YEAR(investment_date) = 2024, or the
+-- optimizer cannot prune partitions.
+
 -- Display table structure
 DESCRIBE investment;
 
@@ -1,22 +1,670 @@
 """
 MySQL service module for Investment table operations
+
+The schema is managed by migrations.py, which is run at deploy time.
 """
-import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode, pooling
+from mysql.connector.constants import ClientFlag
 import uuid
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, date
+from typing import Callable, List, Dict, Optional, NamedTuple, Tuple, Union
+from contextlib import contextmanager
+from dataclasses import dataclass
+import numpy as np
 import logging
+import threading
+import time
 import streamlit as st
 
 logger = logging.getLogger(__name__)
 
-# Track if tables have been created to avoid running on every initialization
-_tables_created = {
-    'investment': False,
-    'users': False
+# Process-wide valuation cache keyed on (as-of date, data version). Writes from
+# this process bump the version; entries also expire after _VALUATION_CACHE_TTL
+# seconds so writes from other app instances and direct loads show up too.
+_valuation_cache = {}
+# The Dashboard's comments map, cached beside the valuation: keyed on the data
+# version and aged by the same TTL
+_comments_cache = {}
+_valuation_cache_lock = threading.Lock()
+_data_version = 0
+_VALUATION_CACHE_SIZE = 16
+_VALUATION_CACHE_TTL = 30.0
+
+# Columns fetched by each read projection: 'summary' for pickers and labels,
+# 'valuation' for everything the calculations need, 'full' for the whole row.
+# 'summary' and 'valuation' are covered by idx_investment_valuation, so their
+# whole-table reads scan only that index.
+_PROJECTIONS = {
+    'summary': ('investment_id', 'investment_amount', 'investment_date'),
+    'valuation': ('investment_id', 'investment_amount', 'investment_date', 'annual_return_percentage'),
+    'full': ('investment_id', 'investment_amount', 'investment_date', 'annual_return_percentage',
+             'investment_comments', 'created_at', 'updated_at'),
+}
+
+# Fixed statements run through the pool's per-connection prepared cursors. They
+# stay module constants because a prepared cursor re-prepares whenever it is
+# handed a different query string object.
+_READ_INVESTMENT_QUERIES = {
+    projection: f"SELECT {', '.join(columns)} FROM investment WHERE investment_id = %s"
+    for projection, columns in _PROJECTIONS.items()
+}
+_INSERT_INVESTMENT_QUERY = """
+    INSERT INTO investment
+    (investment_id, investment_amount, investment_date, annual_return_percentage, investment_comments)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+_DELETE_INVESTMENT_QUERY = "DELETE FROM investment WHERE investment_id = %s"
+_INSERT_USER_QUERY = """
+    INSERT INTO users
+    (user_id, username, email, password_hash, full_name, role, is_active)
+    VALUES (%s, %s, %s, %s, %s, %s, FALSE)
+"""
+_SELECT_USER_BY_ID_QUERY = "SELECT * FROM users WHERE user_id = %s"
+_SELECT_USER_BY_USERNAME_QUERY = "SELECT * FROM users WHERE username = %s"
+
+# Whole-table valuation reads. Both touch only columns of idx_investment_valuation
+# (investment_date, investment_amount, annual_return_percentage, investment_id),
+# so EXPLAIN shows "Using index" and the clustered rows are never read; keep any
+# column added here in that index.
+_VALUATION_SCAN_QUERY = """
+    SELECT investment_id, investment_amount, investment_date, annual_return_percentage
+    FROM investment ORDER BY investment_date DESC
+"""
+# Comments for the Dashboard table, read apart from the covered valuation scan
+_INVESTMENT_COMMENTS_QUERY = """
+    SELECT investment_id, investment_comments
+    FROM investment
+    WHERE investment_comments IS NOT NULL AND investment_comments <> ''
+"""
+# Date-range read; {columns} is the projection's column list
+_INVESTMENTS_BETWEEN_QUERY = """
+    SELECT {columns}
+    FROM investment
+    WHERE investment_date >= %s AND investment_date < %s
+    ORDER BY investment_date DESC
+"""
+# Same formula as calculate_portfolio_values_paise: each current value is
+# rounded to the paise before summing, and future dates keep the principal.
+# The e0 literals keep the divisions in double precision like NumPy; DECIMAL
+# division would round the years to div_precision_increment (4) places.
+_PORTFOLIO_SUMMARY_QUERY = """
+    SELECT COUNT(*),
+           COALESCE(SUM(ROUND(investment_amount * 100)), 0),
+           COALESCE(SUM(CASE
+               WHEN investment_date > %s THEN ROUND(investment_amount * 100)
+               ELSE ROUND(
+                   investment_amount * 100
+                   * POW(1 + annual_return_percentage / 100e0, DATEDIFF(%s, investment_date) / 365.25e0)
+               )
+           END), 0)
+    FROM investment
+"""
+
+
+def _projection_columns(projection: str) -> Tuple[str, ...]:
+    """
+    Look up the columns of a read projection
+    
+    Args:
+        projection: One of 'summary', 'valuation' or 'full'
+        
+    Returns:
+        Column names in select order
+    """
+    try:
+        return _PROJECTIONS[projection]
+    except KeyError:
+        raise ValueError(f"Unknown projection {projection!r}; expected one of {', '.join(_PROJECTIONS)}") from None
+
+
+def _invalidate_valuation_cache():
+    """Bump the data version and drop cached valuations after a write"""
+    global _data_version
+    with _valuation_cache_lock:
+        _data_version += 1
+        _valuation_cache.clear()
+        _comments_cache.clear()
+
+
+def _cached_valuation(as_of: date, build: Optional[Callable[[], 'PortfolioView']] = None) -> Optional['PortfolioView']:
+    """
+    Look up the cached valuation for a date, building and caching it on a miss
+    
+    Args:
+        as_of: Valuation date
+        build: Builds the valuation on a miss (optional; without it a miss returns None)
+        
+    Returns:
+        The cached or newly built PortfolioView, or None on a miss without build
+    """
+    started = time.monotonic()
+    with _valuation_cache_lock:
+        key = (as_of, _data_version)
+        entry = _valuation_cache.get(key)
+    if entry is not None and started - entry[1] < _VALUATION_CACHE_TTL:
+        return entry[0]
+    if build is None:
+        return None
+    
+    portfolio = build()
+    
+    with _valuation_cache_lock:
+        # Skip caching if a write bumped the version while records were read
+        if key[1] == _data_version:
+            _valuation_cache.pop(key, None)
+            if len(_valuation_cache) >= _VALUATION_CACHE_SIZE:
+                _valuation_cache.pop(next(iter(_valuation_cache)))
+            # Aged from when the read started, so the TTL bounds how stale the data is
+            _valuation_cache[key] = (portfolio, started)
+    return portfolio
+
+
+def _cached_comments(build: Callable[[], Dict[str, str]]) -> Dict[str, str]:
+    """
+    Look up the cached comments map, building and caching it on a miss
+    
+    Args:
+        build: Reads the comments on a miss
+        
+    Returns:
+        The cached or newly read dict of investment_id to comment text
+    """
+    started = time.monotonic()
+    with _valuation_cache_lock:
+        version = _data_version
+        entry = _comments_cache.get(version)
+    if entry is not None and started - entry[1] < _VALUATION_CACHE_TTL:
+        return entry[0]
+    
+    comments = build()
+    
+    with _valuation_cache_lock:
+        if version == _data_version:
+            _comments_cache.clear()
+            _comments_cache[version] = (comments, started)
+    return comments
+
+
+# Process-wide connection pools keyed on the connection settings, shared by every
+# session's InvestmentService and AuthenticationService, and the replica routers
+# keyed on the primary's settings
+_connection_pools = {}
+_replica_routers = {}
+_connection_pools_lock = threading.Lock()
+
+# Pool defaults, overridable under [mysql] in secrets.toml
+_POOL_DEFAULTS = {
+    'pool_size': 5,
+    'pool_timeout': 10.0
 }
 
+# Read replica routing defaults, overridable under [mysql] in secrets.toml. A
+# replica is used only while at most replica_max_lag seconds behind as of a check
+# at most replica_lag_check_interval seconds old, so reads stay on the primary for
+# their sum after a write to keep the writer's own changes visible.
+_REPLICA_DEFAULTS = {
+    'replica_max_lag': 5.0,
+    'replica_lag_check_interval': 5.0,
+    'read_your_writes_window': 10.0,
+    'replica_allow_unchecked_lag': False
+}
+
+# Errors for a lag check the replica's user may not run: the missing REPLICATION
+# CLIENT privilege, or a login the replica refuses
+_LAG_CHECK_DENIED_ERRNOS = (errorcode.ER_SPECIFIC_ACCESS_DENIED_ERROR, errorcode.ER_ACCESS_DENIED_ERROR)
+
+# Options every pooled connection is opened with
+_POOL_CONNECTION_OPTIONS = {
+    "autocommit": True,
+    # Report matched rather than changed rows, so an UPDATE that leaves
+    # values as they were still counts as finding the record
+    "client_flags": [ClientFlag.FOUND_ROWS]
+}
+
+
+class MySQLPool:
+    """
+    Thread-safe MySQL connection pool shared across Streamlit sessions
+    
+    Wraps mysql.connector's MySQLConnectionPool, which pings each connection as it
+    is handed out and reconnects it if the server has dropped it (for example after
+    wait_timeout). That pool raises as soon as it is exhausted, so a semaphore makes
+    callers wait up to ``timeout`` seconds for a free connection instead.
+    
+    Each connection also keeps a cache of prepared cursors for the services' fixed
+    queries, so those are parsed by the server once per connection rather than on
+    every call.
+    """
+    
+    def __init__(self, config: Dict, size: int = 5, timeout: float = 10.0):
+        """
+        Open the pool and all ``size`` connections
+        
+        Args:
+            config: mysql.connector connection arguments (host, port, user, password, database)
+            size: Number of pooled connections (at most 32)
+            timeout: Seconds to wait for a free connection before raising PoolError
+        """
+        self.size = size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._connection_ids = {}
+        self._statement_caches = {}
+        self._stats = {'checkouts': 0, 'waits': 0, 'timeouts': 0, 'reconnects': 0}
+        
+        try:
+            # Sessions are not reset on return: COM_RESET_CONNECTION costs a round trip
+            # per checkout and would drop server-side prepared statements. putconn()
+            # clears anything a caller left behind instead.
+            self._pool = pooling.MySQLConnectionPool(
+                pool_name="investment_dashboard",
+                pool_size=size,
+                pool_reset_session=False,
+                **{**config, **_POOL_CONNECTION_OPTIONS}
+            )
+            logger.info(f"MySQL connection pool opened (size={size})")
+        except Error as e:
+            logger.error(f"Error opening MySQL connection pool: {e}")
+            raise
+    
+    def getconn(self):
+        """
+        Borrow a connection, waiting up to the pool timeout for a free slot
+        
+        Returns:
+            A live autocommit connection; hand it back with putconn()
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['waits'] += 1
+            if not self._slots.acquire(timeout=self.timeout):
+                with self._lock:
+                    self._stats['timeouts'] += 1
+                logger.error(f"Timed out after {self.timeout}s waiting for a MySQL connection")
+                raise pooling.PoolError(f"Timed out after {self.timeout}s waiting for a database connection")
+        
+        try:
+            connection = self._pool.get_connection()
+        except Exception:
+            self._slots.release()
+            raise
+        
+        with self._lock:
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+            # A new server thread id means the pool reconnected a dropped connection
+            last_id = self._connection_ids.get(id(connection._cnx))
+            if last_id is not None and last_id != connection.connection_id:
+                self._stats['reconnects'] += 1
+                # Prepared statements died with the old server session
+                self._statement_caches.pop(id(connection._cnx), None)
+        return connection
+    
+    def putconn(self, connection):
+        """Return a borrowed connection, clearing unread results and open transactions"""
+        try:
+            if connection.unread_result:
+                connection.consume_results()
+            if connection.in_transaction:
+                connection.rollback()
+        except Error as e:
+            # The pool reconnects it on the next checkout
+            logger.warning(f"Returning broken MySQL connection to the pool: {e}")
+        
+        with self._lock:
+            self._in_use -= 1
+            self._connection_ids[id(connection._cnx)] = connection.connection_id
+        try:
+            connection.close()
+        finally:
+            self._slots.release()
+    
+    def prepared_cursor(self, connection, query: str, dictionary: bool = False):
+        """
+        Get a borrowed connection's prepared cursor for a fixed query
+        
+        The statement is prepared on first use and reused by later calls on the
+        same connection, which only send the parameters. Callers must pass the same
+        query string object each time (a module constant), fetch every row before
+        returning the connection, and leave the cursor open.
+        
+        Args:
+            connection: Connection borrowed from this pool
+            query: SQL with %s placeholders
+            dictionary: Return rows as dicts instead of tuples
+            
+        Returns:
+            A prepared cursor owned by the connection's statement cache
+        """
+        with self._lock:
+            statements = self._statement_caches.setdefault(id(connection._cnx), {})
+        cursor = statements.get((query, dictionary))
+        if cursor is None:
+            cursor = connection.cursor(prepared=True, dictionary=dictionary)
+            statements[(query, dictionary)] = cursor
+        return cursor
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        connection = self.getconn()
+        try:
+            yield connection
+        finally:
+            self.putconn(connection)
+    
+    def stats(self) -> Dict:
+        """
+        Get pool usage counters
+        
+        Returns:
+            Dict with size and in-use connection counts, and checkout, wait,
+            timeout and reconnect counters, and the number of prepared statements
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_use'] = self._in_use
+            stats['prepared_statements'] = sum(len(statements) for statements in self._statement_caches.values())
+        stats['size'] = self.size
+        return stats
+    
+    def close(self):
+        """Close every idle connection in the pool"""
+        with self._lock:
+            self._statement_caches.clear()
+        self._pool._remove_connections()
+        logger.info("MySQL connection pool closed")
+
+
+def _pool_settings() -> Dict:
+    """Read pool sizing and timeout from secrets, falling back to defaults"""
+    settings = dict(_POOL_DEFAULTS)
+    for key in settings:
+        try:
+            settings[key] = type(settings[key])(st.secrets["mysql"][key])
+        except (KeyError, AttributeError, FileNotFoundError):
+            pass
+    return settings
+
+
+def _config_key(config: Dict) -> Tuple:
+    """Hashable registry key for a set of connection settings"""
+    return tuple(sorted((name, str(value)) for name, value in config.items()))
+
+
+def get_connection_pool(config: Dict) -> MySQLPool:
+    """
+    Get the process-wide pool for a set of connection settings, creating it on first use
+    
+    Args:
+        config: mysql.connector connection arguments
+        
+    Returns:
+        The shared MySQLPool for these settings
+    """
+    key = _config_key(config)
+    with _connection_pools_lock:
+        connection_pool = _connection_pools.get(key)
+        if connection_pool is None:
+            settings = _pool_settings()
+            connection_pool = MySQLPool(config, size=settings['pool_size'], timeout=settings['pool_timeout'])
+            _connection_pools[key] = connection_pool
+        return connection_pool
+
+
+def close_connection_pools():
+    """Close every process-wide pool (for shutdown and tests)"""
+    with _connection_pools_lock:
+        for connection_pool in _connection_pools.values():
+            connection_pool.close()
+        _connection_pools.clear()
+        _replica_routers.clear()
+
+
+class ReplicaRouter:
+    """
+    Routes read-only queries to read replicas, and everything else to the primary
+    
+    Replicas are taken round-robin. Each one's replication lag is checked at most
+    every ``lag_check_interval`` seconds; a replica that is more than ``max_lag``
+    seconds behind, has replication stopped or can't be reached is skipped until
+    its next check. With no usable replica, and for ``read_your_writes_window``
+    seconds after any write through this process, reads go to the primary.
+    A replica whose user lacks the REPLICATION CLIENT privilege is reported once
+    as an error and kept out of rotation, unless ``allow_unchecked_lag`` lets it
+    serve reads without lag checks. A replica given as connection settings has its pool opened at its first lag
+    check, so one that is down at startup is retried rather than failing the router.
+    """
+    
+    def __init__(self, primary: MySQLPool, replicas: List[Union[MySQLPool, Dict]], max_lag: float = 5.0,
+                 lag_check_interval: float = 5.0, read_your_writes_window: float = 10.0,
+                 allow_unchecked_lag: bool = False):
+        """
+        Route reads for a primary and its replicas
+        
+        Args:
+            primary: Pool for the primary server
+            replicas: Pools for the read replicas, or their connection settings to open a pool from
+                on first use, in round-robin order
+            max_lag: Most seconds behind the primary a replica may be and still serve reads
+            lag_check_interval: Seconds between replication lag checks of each replica
+            read_your_writes_window: Seconds after a write during which reads stay on the primary
+            allow_unchecked_lag: Serve reads from a replica whose lag its user may not check
+        """
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.read_your_writes_window = read_your_writes_window
+        self.allow_unchecked_lag = allow_unchecked_lag
+        self._lock = threading.Lock()
+        self._next = 0
+        self._last_write_at = float('-inf')
+        self._health = [{'checked_at': float('-inf'), 'usable': False, 'lag': None, 'denied': False}
+                        for _ in self.replicas]
+        self._stats = {'replica_reads': 0, 'primary_reads': 0, 'fallbacks': 0}
+    
+    def mark_write(self):
+        """Record a committed write, pinning reads to the primary for the read-your-writes window"""
+        with self._lock:
+            self._last_write_at = time.monotonic()
+    
+    @staticmethod
+    def _replication_lag(replica: MySQLPool) -> Optional[float]:
+        """
+        Ask a replica how far behind its source it is
+        
+        Args:
+            replica: Pool for the replica
+            
+        Returns:
+            Seconds behind, or None if replication is not running
+        """
+        with replica.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except Error as e:
+                # Servers before 8.0.22 only know the old spelling
+                if e.errno != errorcode.ER_PARSE_ERROR:
+                    raise
+                cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchall()
+            cursor.close()
+        if not status:
+            # No replication channel: a managed reader endpoint rather than a classic replica
+            return 0.0
+        lag = status[0].get('Seconds_Behind_Source', status[0].get('Seconds_Behind_Master'))
+        return None if lag is None else float(lag)
+    
+    def _replica_pool(self, index: int) -> MySQLPool:
+        """Get a replica's pool, opening it if the replica was given as connection settings"""
+        replica = self.replicas[index]
+        if isinstance(replica, dict):
+            replica = get_connection_pool(replica)
+            with self._lock:
+                self.replicas[index] = replica
+        return replica
+    
+    def _usable(self, index: int) -> bool:
+        """Check a replica's lag if its last check is stale, and report whether it may serve reads"""
+        health = self._health[index]
+        with self._lock:
+            if time.monotonic() - health['checked_at'] < self.lag_check_interval:
+                return health['usable']
+            # Other threads keep the previous verdict while this one checks
+            health['checked_at'] = time.monotonic()
+        
+        denied = unchecked = False
+        try:
+            lag = self._replication_lag(self._replica_pool(index))
+        except Error as e:
+            lag = None
+            denied = e.errno in _LAG_CHECK_DENIED_ERRNOS
+            unchecked = denied and self.allow_unchecked_lag and e.errno == errorcode.ER_SPECIFIC_ACCESS_DENIED_ERROR
+            if not denied:
+                logger.warning(f"MySQL replica {index} unavailable: {e}")
+            elif not health['denied']:
+                # Reported once, not at every check interval
+                outcome = ("serving its reads without lag checks" if unchecked
+                           else "it serves no reads until then, or set replica_allow_unchecked_lag")
+                logger.error(f"MySQL replica {index} refused the lag check ({e}); grant the app's user "
+                             f"REPLICATION CLIENT on it - {outcome}")
+        
+        usable = unchecked or (lag is not None and lag <= self.max_lag)
+        with self._lock:
+            if usable != health['usable']:
+                logger.info(f"MySQL replica {index} {'in' if usable else 'out of'} rotation (lag={lag})")
+            health['lag'] = lag
+            health['denied'] = denied
+            health['usable'] = usable
+        return usable
+    
+    def _choose_replica(self) -> Optional[MySQLPool]:
+        """Take the next usable replica round-robin, or None if none is usable"""
+        if not self.replicas:
+            return None
+        with self._lock:
+            if time.monotonic() - self._last_write_at < self.read_your_writes_window:
+                return None
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+        
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self._usable(index):
+                return self.replicas[index]
+        return None
+    
+    @contextmanager
+    def read_connection(self, primary: bool = False):
+        """
+        Borrow a connection for read-only queries for the duration of a with-block
+        
+        Args:
+            primary: Read from the primary regardless, for read-modify-write callers
+            
+        Yields:
+            (pool, connection) - the pool that lent the connection, for prepared_cursor()
+        """
+        pool = self.primary if primary else (self._choose_replica() or self.primary)
+        try:
+            connection = pool.getconn()
+        except Error as e:
+            if pool is self.primary:
+                raise
+            logger.warning(f"Reading from the MySQL primary; replica checkout failed: {e}")
+            with self._lock:
+                self._health[self.replicas.index(pool)].update(checked_at=time.monotonic(), usable=False)
+                self._stats['fallbacks'] += 1
+            pool = self.primary
+            connection = pool.getconn()
+        
+        with self._lock:
+            self._stats['primary_reads' if pool is self.primary else 'replica_reads'] += 1
+        try:
+            yield pool, connection
+        finally:
+            pool.putconn(connection)
+    
+    def stats(self) -> Dict:
+        """
+        Get routing counters
+        
+        Returns:
+            Dict with replica, primary and fallback read counts, and each replica's
+            last measured lag and whether it is in rotation
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['replicas'] = [{'lag': health['lag'], 'usable': health['usable']} for health in self._health]
+        return stats
+
+
+def _replica_settings(config: Dict) -> Tuple[List[Dict], Dict]:
+    """
+    Read the replica list and routing settings from secrets
+    
+    Replicas are listed as "host" or "host:port" strings, or as tables overriding
+    any of the primary's connection settings.
+    
+    Args:
+        config: The primary's connection settings, inherited by each replica
+        
+    Returns:
+        Tuple of (replica connection settings, routing settings)
+    """
+    settings = dict(_REPLICA_DEFAULTS)
+    for key in settings:
+        try:
+            settings[key] = type(settings[key])(st.secrets["mysql"][key])
+        except (KeyError, AttributeError, FileNotFoundError):
+            pass
+    
+    try:
+        replicas = st.secrets["mysql"]["replicas"]
+    except (KeyError, AttributeError, FileNotFoundError):
+        replicas = []
+    
+    replica_configs = []
+    for replica in replicas:
+        if isinstance(replica, str):
+            host, _, port = replica.partition(":")
+            replica = {"host": host, "port": int(port)} if port else {"host": host}
+        replica_configs.append({**config, **dict(replica)})
+    return replica_configs, settings
+
+
+def get_replica_router(config: Dict) -> ReplicaRouter:
+    """
+    Get the process-wide replica router for a primary, creating it on first use
+    
+    Args:
+        config: The primary's mysql.connector connection arguments
+        
+    Returns:
+        The shared ReplicaRouter; without configured replicas it routes every read to the primary
+    """
+    key = _config_key(config)
+    with _connection_pools_lock:
+        router = _replica_routers.get(key)
+    if router is None:
+        replica_configs, settings = _replica_settings(config)
+        router = ReplicaRouter(
+            get_connection_pool(config),
+            replica_configs,
+            max_lag=settings['replica_max_lag'],
+            lag_check_interval=settings['replica_lag_check_interval'],
+            read_your_writes_window=settings['read_your_writes_window'],
+            allow_unchecked_lag=settings['replica_allow_unchecked_lag']
+        )
+        with _connection_pools_lock:
+            router = _replica_routers.setdefault(key, router)
+    return router
+
+
 class InvestmentService:
     def __init__(self, host=None, port=None, user=None, password=None, database=None):
         """Initialize MySQL service with credentials from secrets.toml or parameters"""
@@ -58,63 +706,14 @@ class InvestmentService:
             "password": password,
             "database": database
         }
-        self.connection = None
+        self.pool = None
+        self.replicas = None
         self.connect()
-        self.create_table()
     
     def connect(self):
-        """Establish MySQL connection - reuse for efficiency"""
-        try:
-            self.connection = mysql.connector.connect(**self.config)
-            self.connection.autocommit = True
-            if self.connection.is_connected():
-                logger.info("MySQL connection successful")
-        except Error as e:
-            logger.error(f"Error connecting to MySQL: {e}")
-            raise
-    
-    def create_table(self):
-        """Create investment table if it doesn't exist (only once per session)"""
-        global _tables_created
-        
-        # Skip if already created in this session
-        if _tables_created['investment']:
-            logger.debug("Investment table already created this session")
-            return
-        
-        try:
-            cursor = self.connection.cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS investment (
-                investment_id VARCHAR(36) PRIMARY KEY,
-                investment_amount DECIMAL(15, 2) NOT NULL,
-                investment_date DATE NOT NULL,
-                annual_return_percentage DECIMAL(5, 2) NOT NULL,
-                investment_comments TEXT,
-                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP NOT NULL DEFAULT '0000-00-00 00:00:00',
-                INDEX idx_investment_date (investment_date)
-            ) ENGINE=InnoDB DEFAULT CHARSET=latin1
-            """
-            cursor.execute(create_table_query)
-            self.connection.commit()
-            
-            # Add comments column to existing table if it doesn't exist
-            try:
-                alter_table_query = "ALTER TABLE investment ADD COLUMN investment_comments TEXT"
-                cursor.execute(alter_table_query)
-                self.connection.commit()
-            except Error as e:
-                # Column might already exist, which is fine
-                if "Duplicate column name" not in str(e):
-                    logger.warning(f"Could not add comments column: {e}")
-            
-            cursor.close()
-            _tables_created['investment'] = True
-            logger.info("Investment table created or already exists")
-        except Error as e:
-            logger.error(f"Error creating table: {e}")
-            raise
+        """Attach to the process-wide MySQL connection pool and replica router"""
+        self.pool = get_connection_pool(self.config)
+        self.replicas = get_replica_router(self.config)
     
     def create_investment(self, investment_amount: float, investment_date: str, 
                          annual_return_percentage: float, investment_comments: str = "") -> Dict:
@@ -133,15 +732,12 @@ class InvestmentService:
         investment_id = str(uuid.uuid4())
         
         try:
-            cursor = self.connection.cursor()
-            insert_query = """
-            INSERT INTO investment 
-            (investment_id, investment_amount, investment_date, annual_return_percentage, investment_comments)
-            VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(insert_query, (investment_id, investment_amount, investment_date, annual_return_percentage, investment_comments))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = self.pool.prepared_cursor(connection, _INSERT_INVESTMENT_QUERY)
+                cursor.execute(_INSERT_INVESTMENT_QUERY, (investment_id, investment_amount, investment_date, annual_return_percentage, investment_comments))
+                connection.commit()
+                self.replicas.mark_write()
+                _invalidate_valuation_cache()
             
             logger.info(f"Investment created: {investment_id}")
             return {
@@ -156,45 +752,273 @@ class InvestmentService:
             logger.error(f"Error creating investment: {e}")
             raise
     
-    def read_investment(self, investment_id: str) -> Optional[Dict]:
+    def read_investment(self, investment_id: str, projection: str = 'full') -> Optional[Dict]:
         """
         Read a specific investment record
         
         Args:
             investment_id: Investment ID to retrieve
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'
             
         Returns:
-            Investment record or None if not found
+            Investment record with the projection's columns, or None if not found
         """
+        _projection_columns(projection)
+        select_query = _READ_INVESTMENT_QUERIES[projection]
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            select_query = "SELECT * FROM investment WHERE investment_id = %s"
-            cursor.execute(select_query, (investment_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            return result
+            with self.replicas.read_connection() as (pool, connection):
+                cursor = pool.prepared_cursor(connection, select_query, dictionary=True)
+                cursor.execute(select_query, (investment_id,))
+                rows = cursor.fetchall()
+            return rows[0] if rows else None
         except Error as e:
             logger.error(f"Error reading investment: {e}")
             raise
     
-    def read_all_investments(self) -> List[Dict]:
+    def read_all_investments(self, projection: str = 'full') -> List[Dict]:
         """
         Read all investment records
         
+        Args:
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'
+            
         Returns:
-            List of all investment records
+            List of all investment records with the projection's columns
         """
+        columns = ", ".join(_projection_columns(projection))
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            select_query = "SELECT * FROM investment ORDER BY investment_date DESC"
-            cursor.execute(select_query)
-            results = cursor.fetchall()
-            cursor.close()
+            with self.replicas.read_connection() as (_, connection):
+                cursor = connection.cursor(dictionary=True)
+                select_query = f"SELECT {columns} FROM investment ORDER BY investment_date DESC"
+                cursor.execute(select_query)
+                results = cursor.fetchall()
+                cursor.close()
             return results
         except Error as e:
             logger.error(f"Error reading investments: {e}")
             raise
     
+    def read_all_investment_records(self) -> List['Investment']:
+        """
+        Read the valuation columns of every investment as typed Investment records
+        
+        Only columns of idx_investment_valuation are selected, so the scan never
+        touches the clustered rows; comments are loaded separately with
+        read_investment_comments() where they are shown.
+        
+        Returns:
+            List of Investment records without comments, newest investment date first
+        """
+        try:
+            # Plain tuple cursor avoids building a dict per row
+            with self.replicas.read_connection() as (_, connection):
+                cursor = connection.cursor()
+                cursor.execute(_VALUATION_SCAN_QUERY)
+                results = [
+                    Investment(row[0], float(row[1]), row[2], float(row[3]))
+                    for row in cursor.fetchall()
+                ]
+                cursor.close()
+            return results
+        except Error as e:
+            logger.error(f"Error reading investment records: {e}")
+            raise
+    
+    def read_investment_comments(self) -> Dict[str, str]:
+        """
+        Read the comments of every investment that has one
+        
+        Served from the cache beside the valuation, so a Dashboard rerun reads
+        the clustered rows only after a write or once the TTL has passed.
+        
+        Returns:
+            Dict of investment_id to comment text
+        """
+        return _cached_comments(self._read_investment_comments)
+    
+    def _read_investment_comments(self) -> Dict[str, str]:
+        """Read the comments map from the database, bypassing the cache"""
+        try:
+            with self.replicas.read_connection() as (_, connection):
+                cursor = connection.cursor()
+                cursor.execute(_INVESTMENT_COMMENTS_QUERY)
+                results = dict(cursor.fetchall())
+                cursor.close()
+            return results
+        except Error as e:
+            logger.error(f"Error reading investment comments: {e}")
+            raise
+    
+    def read_investment_columns(self, batch_size: int = 10000) -> 'InvestmentColumns':
+        """
+        Stream the valuation columns of every investment into NumPy arrays
+        
+        Rows are read unbuffered from a raw cursor, batch_size at a time, and decoded
+        straight into arrays preallocated from a COUNT(*) in the same snapshot. No
+        per-row dict or Decimal/date objects are built, so memory stays at the arrays
+        plus one batch however large the table is.
+        
+        Args:
+            batch_size: Rows fetched from the server per batch
+            
+        Returns:
+            InvestmentColumns, newest investment date first
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        
+        try:
+            with self.replicas.read_connection() as (_, connection):
+                # The count and the scan read one snapshot, so the arrays fit exactly
+                connection.start_transaction(consistent_snapshot=True, readonly=True)
+                cursor = connection.cursor()
+                cursor.execute("SELECT COUNT(*) FROM investment")
+                (count,) = cursor.fetchone()
+                cursor.close()
+                
+                columns = InvestmentColumns.allocate(count)
+                cursor = connection.cursor(raw=True, buffered=False)
+                cursor.execute(_VALUATION_SCAN_QUERY)
+                position = 0
+                rows = cursor.fetchmany(batch_size)
+                while rows:
+                    position = _decode_investment_batch(columns, position, rows)
+                    rows = cursor.fetchmany(batch_size)
+                cursor.close()
+                connection.commit()
+            return columns
+        except Error as e:
+            logger.error(f"Error streaming investment columns: {e}")
+            raise
+    
+    def read_investments_page(self, after: Optional[Tuple[date, str]] = None, limit: int = 50,
+                              projection: str = 'full') -> List['Investment']:
+        """
+        Read one page of investment records using keyset pagination
+        
+        Args:
+            after: (investment_date, investment_id) of the last record on the previous page,
+                or None for the first page
+            limit: Maximum number of records to return
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'; record
+                fields outside the projection are None
+            
+        Returns:
+            Up to limit Investment records, newest investment date first, ties by investment_id
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+        
+        columns = [column for column in _projection_columns(projection) if column in Investment._fields]
+        
+        try:
+            with self.replicas.read_connection() as (_, connection):
+                cursor = connection.cursor()
+                if after is None:
+                    where_clause = ""
+                    params = (limit,)
+                else:
+                    # Dates run DESC and ids ASC, so the seek is spelled out instead of a row
+                    # comparison. The leading bare-column bound lets a year-partitioned table
+                    # prune every partition after the cursor's year.
+                    where_clause = (
+                        "WHERE investment_date <= %s "
+                        "AND (investment_date < %s OR (investment_date = %s AND investment_id > %s))"
+                    )
+                    params = (after[0], after[0], after[0], after[1], limit)
+                select_query = f"""
+                    SELECT {", ".join(columns)}
+                    FROM investment {where_clause}
+                    ORDER BY investment_date DESC, investment_id
+                    LIMIT %s
+                """
+                cursor.execute(select_query, params)
+                results = _investment_records(columns, cursor.fetchall())
+                cursor.close()
+            return results
+        except Error as e:
+            logger.error(f"Error reading investment page: {e}")
+            raise
+    
+    def read_investments_between(self, start: date, end: date, projection: str = 'full') -> List['Investment']:
+        """
+        Read the investments made in a date range
+        
+        The range is a half-open comparison on the bare investment_date column, which
+        the optimizer can turn into an index range and, on a year-partitioned table,
+        into a partition list; wrapping the column in YEAR() or DATE_FORMAT() would
+        defeat both.
+        
+        Args:
+            start: First investment date to include
+            end: Day after the last investment date to include
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'; record
+                fields outside the projection are None
+            
+        Returns:
+            Investment records dated start <= investment_date < end, newest first
+        """
+        columns = [column for column in _projection_columns(projection) if column in Investment._fields]
+        
+        try:
+            with self.replicas.read_connection() as (_, connection):
+                cursor = connection.cursor()
+                cursor.execute(_INVESTMENTS_BETWEEN_QUERY.format(columns=", ".join(columns)), (start, end))
+                results = _investment_records(columns, cursor.fetchall())
+                cursor.close()
+            return results
+        except Error as e:
+            logger.error(f"Error reading investments between {start} and {end}: {e}")
+            raise
+    
+    def get_portfolio_summary(self, as_of: Optional[date] = None) -> 'PortfolioSummary':
+        """
+        Get the headline portfolio totals, computed in the database
+        
+        Uses the cached portfolio view when one exists for the date; otherwise one
+        aggregate query returns a single row, whatever the portfolio size.
+        
+        Args:
+            as_of: Valuation date (defaults to today)
+            
+        Returns:
+            PortfolioSummary valued as of the given date
+        """
+        as_of = as_of or date.today()
+        portfolio = _cached_valuation(as_of)
+        if portfolio is not None:
+            return PortfolioSummary.from_view(portfolio)
+        
+        try:
+            with self.replicas.read_connection() as (_, connection):
+                cursor = connection.cursor()
+                cursor.execute(_PORTFOLIO_SUMMARY_QUERY, (as_of, as_of))
+                count, invested, current_value = cursor.fetchone()
+                cursor.close()
+            return PortfolioSummary.from_paise(int(count), int(invested), int(current_value), as_of=as_of)
+        except Error as e:
+            logger.error(f"Error computing portfolio summary: {e}")
+            raise
+    
+    def get_portfolio_view(self, as_of: Optional[date] = None) -> 'PortfolioView':
+        """
+        Get the valued portfolio, served from the valuation cache when possible
+        
+        On a miss the valuation columns are streamed into NumPy arrays by
+        read_investment_columns() and valued there; PortfolioRow objects are
+        built for every investment only after the valuation.
+        
+        Args:
+            as_of: Valuation date (defaults to today)
+            
+        Returns:
+            PortfolioView valued as of the given date
+        """
+        as_of = as_of or date.today()
+        return _cached_valuation(
+            as_of, lambda: build_portfolio_view_from_columns(self.read_investment_columns(), as_of=as_of)
+        )
+    
     def update_investment(self, investment_id: str, investment_amount: Optional[float] = None,
                          investment_date: Optional[str] = None, 
                          annual_return_percentage: Optional[float] = None,
@@ -212,13 +1036,7 @@ class InvestmentService:
         Returns:
             Updated investment record or None if not found
         """
-        # Check if investment exists
-        existing = self.read_investment(investment_id)
-        if not existing:
-            return None
-        
         try:
-            cursor = self.connection.cursor()
             update_parts = []
             params = []
             
@@ -239,12 +1057,19 @@ class InvestmentService:
                 params.append(investment_comments)
             
             if update_parts:
+                # The matched-row count replaces a separate existence check
                 update_query = f"UPDATE investment SET {', '.join(update_parts)} WHERE investment_id = %s"
                 params.append(investment_id)
-                cursor.execute(update_query, params)
-                self.connection.commit()
-            
-            cursor.close()
+                with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    cursor.execute(update_query, params)
+                    matched = cursor.rowcount
+                    connection.commit()
+                    cursor.close()
+                if matched == 0:
+                    return None
+                self.replicas.mark_write()
+                _invalidate_valuation_cache()
             
             # Return updated record
             return self.read_investment(investment_id)
@@ -262,17 +1087,16 @@ class InvestmentService:
         Returns:
             True if deleted, False if not found
         """
-        # Check if investment exists
-        existing = self.read_investment(investment_id)
-        if not existing:
-            return False
-        
         try:
-            cursor = self.connection.cursor()
-            delete_query = "DELETE FROM investment WHERE investment_id = %s"
-            cursor.execute(delete_query, (investment_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = self.pool.prepared_cursor(connection, _DELETE_INVESTMENT_QUERY)
+                cursor.execute(_DELETE_INVESTMENT_QUERY, (investment_id,))
+                deleted = cursor.rowcount
+                connection.commit()
+            if deleted == 0:
+                return False
+            self.replicas.mark_write()
+            _invalidate_valuation_cache()
             
             logger.info(f"Investment deleted: {investment_id}")
             return True
@@ -281,14 +1105,135 @@ class InvestmentService:
             raise
     
     def close(self):
-        """Close MySQL connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            logger.info("MySQL connection closed")
+        """Detach from the shared pools; their connections stay open for other sessions"""
+        self.pool = None
+        self.replicas = None
+
+
+class Investment(NamedTuple):
+    """Compact typed investment record with native date and float fields"""
+    investment_id: str
+    investment_amount: float
+    investment_date: Optional[date]
+    annual_return_percentage: float
+    investment_comments: Optional[str] = None
+    
+    @classmethod
+    def from_row(cls, row: Dict) -> 'Investment':
+        """
+        Convert an investment row dict into a typed record
+        
+        Args:
+            row: Investment record as returned by read_investment/read_all_investments
+            
+        Returns:
+            Investment record
+        """
+        inv_date = row.get('investment_date')
+        if isinstance(inv_date, str):
+            inv_date = date.fromisoformat(inv_date) if inv_date else None
+        
+        return cls(
+            investment_id=str(row.get('investment_id', '')),
+            investment_amount=float(row.get('investment_amount', 0)),
+            investment_date=inv_date,
+            annual_return_percentage=float(row.get('annual_return_percentage', 0)),
+            investment_comments=row.get('investment_comments')
+        )
+
+
+def _investment_records(columns: List[str], rows: List[Tuple]) -> List[Investment]:
+    """
+    Build Investment records from tuple rows of a projection
+    
+    Args:
+        columns: Selected Investment fields, in select order
+        rows: Rows from a plain cursor
+        
+    Returns:
+        Investment records; fields outside the projection are None
+    """
+    if len(columns) > 3:
+        return [Investment(row[0], float(row[1]), row[2], float(row[3]), *row[4:]) for row in rows]
+    return [Investment(row[0], float(row[1]), row[2], None) for row in rows]
+
+
+# Width of the UUID strings the services store as investment_id
+_INVESTMENT_ID_WIDTH = 36
+
+
+@dataclass(frozen=True)
+class InvestmentColumns:
+    """Valuation columns of many investments as NumPy arrays, one element per investment"""
+    investment_ids: np.ndarray
+    investment_paise: np.ndarray
+    investment_dates: np.ndarray
+    annual_return_percentages: np.ndarray
+    
+    @classmethod
+    def allocate(cls, count: int) -> 'InvestmentColumns':
+        """
+        Preallocate columns for a known number of investments
+        
+        Args:
+            count: Number of investments
+            
+        Returns:
+            InvestmentColumns with uninitialized arrays of length count
+        """
+        return cls(
+            investment_ids=np.empty(count, dtype=f'U{_INVESTMENT_ID_WIDTH}'),
+            investment_paise=np.empty(count, dtype=np.int64),
+            investment_dates=np.empty(count, dtype='datetime64[D]'),
+            annual_return_percentages=np.empty(count, dtype=np.float64)
+        )
+    
+    @property
+    def count(self) -> int:
+        """Number of investments"""
+        return len(self.investment_ids)
+
+
+def _decode_investment_batch(columns: InvestmentColumns, start: int, rows: List[Tuple[bytes, ...]]) -> int:
+    """
+    Decode a batch of raw text-protocol rows into preallocated columns
+    
+    Each column of the batch is joined into one buffer and parsed by NumPy in a
+    single call, so no Decimal, date or str object is built per row. DECIMAL
+    values always arrive with their declared two decimals, so dropping the point
+    gives exact hundredths as integers.
+    
+    Args:
+        columns: Columns to fill
+        start: Position of the batch's first row
+        rows: (investment_id, investment_amount, investment_date, annual_return_percentage)
+            tuples of bytes from a raw cursor
+            
+    Returns:
+        Position after the batch's last row
+    """
+    end = start + len(rows)
+    ids = [row[0] for row in rows]
+    
+    joined_ids = b''.join(ids)
+    if len(joined_ids) == _INVESTMENT_ID_WIDTH * len(rows):
+        columns.investment_ids[start:end] = np.frombuffer(joined_ids, dtype=f'S{_INVESTMENT_ID_WIDTH}')
+    else:
+        columns.investment_ids[start:end] = [bytes(investment_id).decode() for investment_id in ids]
+    columns.investment_paise[start:end] = np.fromstring(
+        b' '.join([row[1] for row in rows]).replace(b'.', b''), dtype=np.int64, sep=' '
+    )
+    columns.investment_dates[start:end] = np.frombuffer(
+        b''.join([row[2] for row in rows]), dtype='S10'
+    ).astype('datetime64[D]')
+    columns.annual_return_percentages[start:end] = np.fromstring(
+        b' '.join([row[3] for row in rows]).replace(b'.', b''), dtype=np.int64, sep=' '
+    ) / 100
+    return end
 
 
 def calculate_current_value(investment_amount: float, annual_return_percentage: float, 
-                           investment_date: str) -> float:
+                           investment_date: Union[str, date], as_of: Optional[date] = None) -> float:
     """
     Calculate current value of investment based on compound interest
     
@@ -298,16 +1243,18 @@ def calculate_current_value(investment_amount: float, annual_return_percentage:
     Args:
         investment_amount: Initial investment amount
         annual_return_percentage: Annual return percentage (e.g., 5 for 5%)
-        investment_date: Investment date (YYYY-MM-DD format)
+        investment_date: Investment date (date object or YYYY-MM-DD string)
+        as_of: Valuation date (defaults to today)
         
     Returns:
         Current value of investment
     """
-    from datetime import datetime
-    
-    # Parse investment date
-    inv_date = datetime.strptime(investment_date, "%Y-%m-%d").date()
-    today = datetime.now().date()
+    # Driver and Investment record dates are used as-is; only strings are parsed
+    if isinstance(investment_date, str):
+        inv_date = datetime.strptime(investment_date, "%Y-%m-%d").date()
+    else:
+        inv_date = investment_date
+    today = as_of or datetime.now().date()
     
     # Calculate actual days passed (as a timedelta object for precision)
     time_delta = today - inv_date
@@ -360,6 +1307,285 @@ def calculate_return_percentage(current_value: float, investment_amount: float)
     return round(((current_value - investment_amount) / investment_amount) * 100, 2)
 
 
+PAISE_PER_RUPEE = 100
+
+
+def to_paise(rupees) -> np.ndarray:
+    """
+    Convert rupee amounts to fixed-point integer paise
+    
+    Args:
+        rupees: Amount or sequence of amounts in rupees (float or Decimal)
+        
+    Returns:
+        int64 NumPy array of paise
+    """
+    return np.rint(np.asarray(rupees, dtype=np.float64) * PAISE_PER_RUPEE).astype(np.int64)
+
+
+def from_paise(paise) -> np.ndarray:
+    """
+    Convert fixed-point integer paise to rupees
+    
+    Args:
+        paise: Amount or sequence of amounts in paise
+        
+    Returns:
+        float64 NumPy array of rupees
+    """
+    return np.asarray(paise, dtype=np.int64) / PAISE_PER_RUPEE
+
+
+def calculate_portfolio_values_paise(investment_paise, annual_return_percentages,
+                                     investment_dates, as_of: Optional[date] = None):
+    """
+    Calculate current value, profit/loss and return percentage for a whole portfolio in paise
+    
+    Fixed-point core of the valuation engine: each current value is rounded to
+    the paise once, and profit/loss and any totals over the results are exact
+    int64 arithmetic.
+    
+    Args:
+        investment_paise: Sequence of initial investment amounts in paise
+        annual_return_percentages: Sequence of annual return percentages (e.g., 5 for 5%)
+        investment_dates: Sequence of investment dates (date objects or YYYY-MM-DD strings)
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        Tuple of NumPy arrays (current_values_paise, profit_loss_paise, return_percentages)
+    """
+    amounts = np.asarray(investment_paise, dtype=np.int64)
+    annual_rates = np.asarray(annual_return_percentages, dtype=np.float64) / 100
+    inv_dates = np.asarray(investment_dates, dtype='datetime64[D]')
+    today = np.datetime64(as_of or datetime.now().date(), 'D')
+    
+    # Missing or future dates keep the principal, as in calculate_current_value
+    days_passed = (today - inv_dates).astype(np.float64)
+    not_started = np.isnat(inv_dates) | (days_passed < 0)
+    years_passed = np.where(not_started, 0.0, days_passed) / 365.25
+    
+    current_values = np.where(
+        not_started,
+        amounts,
+        np.rint(amounts * np.power(1 + annual_rates, years_passed)).astype(np.int64)
+    )
+    profit_loss = current_values - amounts
+    
+    return_percentages = np.zeros(len(amounts))
+    np.divide(profit_loss, amounts, out=return_percentages, where=amounts != 0)
+    return_percentages = np.round(return_percentages * 100, 2)
+    
+    return current_values, profit_loss, return_percentages
+
+
+def calculate_portfolio_values(investment_amounts, annual_return_percentages,
+                               investment_dates, as_of: Optional[date] = None):
+    """
+    Calculate current value, profit/loss and return percentage for a whole portfolio
+    
+    Vectorized counterpart of calculate_current_value, calculate_profit_loss and
+    calculate_return_percentage: whole columns are valued in one fixed-point
+    NumPy pass (calculate_portfolio_values_paise) instead of once per investment.
+    
+    Args:
+        investment_amounts: Sequence of initial investment amounts
+        annual_return_percentages: Sequence of annual return percentages (e.g., 5 for 5%)
+        investment_dates: Sequence of investment dates (date objects or YYYY-MM-DD strings)
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        Tuple of NumPy arrays (current_values, profit_loss, return_percentages)
+    """
+    current_values, profit_loss, return_percentages = calculate_portfolio_values_paise(
+        to_paise(investment_amounts), annual_return_percentages, investment_dates, as_of=as_of
+    )
+    return from_paise(current_values), from_paise(profit_loss), return_percentages
+
+
+@dataclass(frozen=True)
+class PortfolioRow:
+    """One valued investment of a PortfolioView"""
+    investment_id: str
+    investment_amount: float
+    investment_date: Optional[date]
+    annual_return_percentage: float
+    current_value: float
+    profit_loss: float
+    return_percentage: float
+    investment_comments: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PortfolioView:
+    """Valued portfolio shared by the metric cards, charts, tables and pages of one rerun"""
+    rows: List[PortfolioRow]
+    total_invested: float
+    total_current_value: float
+    total_profit_loss: float
+    total_return_percentage: float
+    as_of: Optional[date] = None
+    
+    @property
+    def count(self) -> int:
+        """Number of investments in the portfolio"""
+        return len(self.rows)
+
+
+@dataclass(frozen=True)
+class PortfolioSummary:
+    """Headline portfolio totals for the Dashboard metric cards"""
+    total_invested: float
+    total_current_value: float
+    total_profit_loss: float
+    total_return_percentage: float
+    count: int
+    as_of: Optional[date] = None
+    
+    @classmethod
+    def from_paise(cls, count: int, total_invested_paise: int, total_current_value_paise: int,
+                   as_of: Optional[date] = None) -> 'PortfolioSummary':
+        """
+        Build a summary from exact paise totals
+        
+        Args:
+            count: Number of investments
+            total_invested_paise: Sum of investment amounts in paise
+            total_current_value_paise: Sum of per-investment current values, each rounded to the paise
+            as_of: Valuation date
+            
+        Returns:
+            PortfolioSummary in rupees
+        """
+        return cls(
+            total_invested=total_invested_paise / PAISE_PER_RUPEE,
+            total_current_value=total_current_value_paise / PAISE_PER_RUPEE,
+            total_profit_loss=(total_current_value_paise - total_invested_paise) / PAISE_PER_RUPEE,
+            total_return_percentage=calculate_return_percentage(total_current_value_paise, total_invested_paise),
+            count=count,
+            as_of=as_of
+        )
+    
+    @classmethod
+    def from_view(cls, portfolio: 'PortfolioView') -> 'PortfolioSummary':
+        """
+        Take the totals of an already valued portfolio
+        
+        Args:
+            portfolio: PortfolioView from build_portfolio_view()
+            
+        Returns:
+            PortfolioSummary with the view's totals
+        """
+        return cls(
+            total_invested=portfolio.total_invested,
+            total_current_value=portfolio.total_current_value,
+            total_profit_loss=portfolio.total_profit_loss,
+            total_return_percentage=portfolio.total_return_percentage,
+            count=portfolio.count,
+            as_of=portfolio.as_of
+        )
+
+
+def build_portfolio_view(investments: List[Investment], as_of: Optional[date] = None) -> PortfolioView:
+    """
+    Value a list of investment records once and build the portfolio view model
+    
+    Args:
+        investments: Investment records as returned by read_all_investment_records()
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        PortfolioView with one row per investment and precomputed totals
+    """
+    # Amounts enter the engine as paise once; totals below are exact integer sums
+    amounts = to_paise([inv.investment_amount for inv in investments])
+    current_values, profit_losses, return_pcts = calculate_portfolio_values_paise(
+        amounts,
+        [inv.annual_return_percentage for inv in investments],
+        [inv.investment_date for inv in investments],
+        as_of=as_of
+    )
+    
+    rows = [
+        PortfolioRow(
+            investment_id=inv.investment_id,
+            investment_amount=inv.investment_amount,
+            investment_date=inv.investment_date,
+            annual_return_percentage=inv.annual_return_percentage,
+            current_value=current_value,
+            profit_loss=profit_loss,
+            return_percentage=return_pct,
+            investment_comments=inv.investment_comments
+        )
+        for inv, current_value, profit_loss, return_pct in zip(
+            investments,
+            from_paise(current_values).tolist(),
+            from_paise(profit_losses).tolist(),
+            return_pcts.tolist()
+        )
+    ]
+    
+    return _portfolio_view(rows, int(amounts.sum()), int(current_values.sum()), as_of)
+
+
+def build_portfolio_view_from_columns(columns: InvestmentColumns, as_of: Optional[date] = None) -> PortfolioView:
+    """
+    Value streamed investment columns and build the portfolio view model
+    
+    The valuation runs on the arrays as read, so no typed record or Decimal is
+    built per investment on the way in. The view still holds one PortfolioRow
+    per investment, because the Dashboard charts and table render every row, so
+    its memory grows with the portfolio. Rows carry no comments, since the
+    streamed scan reads only the covered valuation columns.
+    
+    Args:
+        columns: InvestmentColumns from read_investment_columns()
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        PortfolioView with one row per investment and precomputed totals
+    """
+    current_values, profit_losses, return_pcts = calculate_portfolio_values_paise(
+        columns.investment_paise, columns.annual_return_percentages, columns.investment_dates, as_of=as_of
+    )
+    
+    rows = [
+        PortfolioRow(
+            investment_id=investment_id,
+            investment_amount=amount,
+            investment_date=inv_date,
+            annual_return_percentage=annual_return,
+            current_value=current_value,
+            profit_loss=profit_loss,
+            return_percentage=return_pct
+        )
+        for investment_id, amount, inv_date, annual_return, current_value, profit_loss, return_pct in zip(
+            columns.investment_ids.tolist(),
+            from_paise(columns.investment_paise).tolist(),
+            columns.investment_dates.tolist(),
+            columns.annual_return_percentages.tolist(),
+            from_paise(current_values).tolist(),
+            from_paise(profit_losses).tolist(),
+            return_pcts.tolist()
+        )
+    ]
+    
+    return _portfolio_view(rows, int(columns.investment_paise.sum()), int(current_values.sum()), as_of)
+
+
+def _portfolio_view(rows: List[PortfolioRow], total_invested: int, total_current_value: int,
+                    as_of: Optional[date]) -> PortfolioView:
+    """Wrap valued rows and their exact paise totals in a PortfolioView"""
+    return PortfolioView(
+        rows=rows,
+        total_invested=total_invested / PAISE_PER_RUPEE,
+        total_current_value=total_current_value / PAISE_PER_RUPEE,
+        total_profit_loss=(total_current_value - total_invested) / PAISE_PER_RUPEE,
+        total_return_percentage=calculate_return_percentage(total_current_value, total_invested),
+        as_of=as_of or datetime.now().date()
+    )
+
+
 # ==================== USER AUTHENTICATION FUNCTIONS ====================
 
 import hashlib
@@ -395,56 +1621,14 @@ class AuthenticationService:
                 }
         
         self.config = config
-        self.connection = None
+        self.pool = None
+        self.replicas = None
         self.connect()
-        self.create_users_table()
     
     def connect(self):
-        """Establish MySQL connection - reuse for efficiency"""
-        try:
-            self.connection = mysql.connector.connect(**self.config)
-            self.connection.autocommit = True
-            if self.connection.is_connected():
-                logger.info("MySQL connection successful for auth service")
-        except Error as e:
-            logger.error(f"Error connecting to MySQL: {e}")
-            raise
-    
-    def create_users_table(self):
-        """Create users table if it doesn't exist (only once per session)"""
-        global _tables_created
-        
-        # Skip if already created in this session
-        if _tables_created['users']:
-            logger.debug("Users table already created this session")
-            return
-        
-        try:
-            cursor = self.connection.cursor()
-            create_table_query = """
-            CREATE TABLE IF NOT EXISTS users (
-                user_id VARCHAR(36) PRIMARY KEY,
-                username VARCHAR(50) UNIQUE NOT NULL,
-                email VARCHAR(100) UNIQUE NOT NULL,
-                password_hash VARCHAR(255) NOT NULL,
-                full_name VARCHAR(100),
-                role VARCHAR(20) NOT NULL DEFAULT 'user',
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP NOT NULL DEFAULT '0000-00-00 00:00:00',
-                KEY idx_username (username),
-                KEY idx_email (email),
-                KEY idx_role (role)
-            ) ENGINE=InnoDB DEFAULT CHARSET=latin1
-            """
-            cursor.execute(create_table_query)
-            self.connection.commit()
-            cursor.close()
-            _tables_created['users'] = True
-            logger.info("Users table created or already exists")
-        except Error as e:
-            logger.error(f"Error creating users table: {e}")
-            raise
+        """Attach to the process-wide MySQL connection pool and replica router"""
+        self.pool = get_connection_pool(self.config)
+        self.replicas = get_replica_router(self.config)
     
     @staticmethod
     def hash_password(password: str) -> str:
@@ -470,15 +1654,11 @@ class AuthenticationService:
             user_id = str(uuid.uuid4())
             password_hash = self.hash_password(password)
             
-            cursor = self.connection.cursor()
-            insert_query = """
-            INSERT INTO users 
-            (user_id, username, email, password_hash, full_name, role, is_active)
-            VALUES (%s, %s, %s, %s, %s, %s, FALSE)
-            """
-            cursor.execute(insert_query, (user_id, username, email, password_hash, full_name, role))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = self.pool.prepared_cursor(connection, _INSERT_USER_QUERY)
+                cursor.execute(_INSERT_USER_QUERY, (user_id, username, email, password_hash, full_name, role))
+                connection.commit()
+                self.replicas.mark_write()
             
             logger.info(f"User registered (inactive): {username}")
             return {
@@ -506,11 +1686,11 @@ class AuthenticationService:
             User data if authenticated, None otherwise
         """
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            select_query = "SELECT * FROM users WHERE username = %s"
-            cursor.execute(select_query, (username,))
-            user = cursor.fetchone()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = self.pool.prepared_cursor(connection, _SELECT_USER_BY_USERNAME_QUERY, dictionary=True)
+                cursor.execute(_SELECT_USER_BY_USERNAME_QUERY, (username,))
+                rows = cursor.fetchall()
+            user = rows[0] if rows else None
             
             if user:
                 password_hash = self.hash_password(password)
@@ -540,11 +1720,11 @@ class AuthenticationService:
             Dict with 'exists', 'password_correct', and 'is_active' status
         """
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            select_query = "SELECT * FROM users WHERE username = %s"
-            cursor.execute(select_query, (username,))
-            user = cursor.fetchone()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = self.pool.prepared_cursor(connection, _SELECT_USER_BY_USERNAME_QUERY, dictionary=True)
+                cursor.execute(_SELECT_USER_BY_USERNAME_QUERY, (username,))
+                rows = cursor.fetchall()
+            user = rows[0] if rows else None
             
             if not user:
                 return {'exists': False, 'password_correct': False, 'is_active': False}
@@ -562,15 +1742,14 @@ class AuthenticationService:
             logger.error(f"Error checking user status: {e}")
             raise
     
-    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
-        """Get user by ID"""
+    def get_user_by_id(self, user_id: str, primary: bool = False) -> Optional[Dict]:
+        """Get user by ID; pass primary=True to read-modify-write the record"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            select_query = "SELECT * FROM users WHERE user_id = %s"
-            cursor.execute(select_query, (user_id,))
-            user = cursor.fetchone()
-            cursor.close()
-            return user
+            with self.replicas.read_connection(primary=primary) as (pool, connection):
+                cursor = pool.prepared_cursor(connection, _SELECT_USER_BY_ID_QUERY, dictionary=True)
+                cursor.execute(_SELECT_USER_BY_ID_QUERY, (user_id,))
+                rows = cursor.fetchall()
+            return rows[0] if rows else None
         except Error as e:
             logger.error(f"Error getting user: {e}")
             raise
@@ -578,12 +1757,11 @@ class AuthenticationService:
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Get user by username"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            select_query = "SELECT * FROM users WHERE username = %s"
-            cursor.execute(select_query, (username,))
-            user = cursor.fetchone()
-            cursor.close()
-            return user
+            with self.replicas.read_connection() as (pool, connection):
+                cursor = pool.prepared_cursor(connection, _SELECT_USER_BY_USERNAME_QUERY, dictionary=True)
+                cursor.execute(_SELECT_USER_BY_USERNAME_QUERY, (username,))
+                rows = cursor.fetchall()
+            return rows[0] if rows else None
         except Error as e:
             logger.error(f"Error getting user: {e}")
             raise
@@ -591,11 +1769,12 @@ class AuthenticationService:
     def get_all_users(self) -> List[Dict]:
         """Get all users"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            select_query = "SELECT user_id, username, email, full_name, role, is_active, created_at FROM users ORDER BY created_at DESC"
-            cursor.execute(select_query)
-            users = cursor.fetchall()
-            cursor.close()
+            with self.replicas.read_connection() as (_, connection):
+                cursor = connection.cursor(dictionary=True)
+                select_query = "SELECT user_id, username, email, full_name, role, is_active, created_at FROM users ORDER BY created_at DESC"
+                cursor.execute(select_query)
+                users = cursor.fetchall()
+                cursor.close()
             return users
         except Error as e:
             logger.error(f"Error getting users: {e}")
@@ -604,11 +1783,13 @@ class AuthenticationService:
     def update_user_role(self, user_id: str, role: str) -> Optional[Dict]:
         """Update user role"""
         try:
-            cursor = self.connection.cursor()
-            update_query = "UPDATE users SET role = %s WHERE user_id = %s"
-            cursor.execute(update_query, (role, user_id))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                update_query = "UPDATE users SET role = %s WHERE user_id = %s"
+                cursor.execute(update_query, (role, user_id))
+                connection.commit()
+                self.replicas.mark_write()
+                cursor.close()
             
             logger.info(f"User role updated: {user_id}")
             return self.get_user_by_id(user_id)
@@ -619,16 +1800,18 @@ class AuthenticationService:
     def toggle_user_status(self, user_id: str) -> Optional[Dict]:
         """Toggle user active status"""
         try:
-            user = self.get_user_by_id(user_id)
+            user = self.get_user_by_id(user_id, primary=True)
             if not user:
                 return None
             
             new_status = not user['is_active']
-            cursor = self.connection.cursor()
-            update_query = "UPDATE users SET is_active = %s WHERE user_id = %s"
-            cursor.execute(update_query, (new_status, user_id))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                update_query = "UPDATE users SET is_active = %s WHERE user_id = %s"
+                cursor.execute(update_query, (new_status, user_id))
+                connection.commit()
+                self.replicas.mark_write()
+                cursor.close()
             
             logger.info(f"User status toggled: {user_id}")
             return self.get_user_by_id(user_id)
@@ -639,11 +1822,13 @@ class AuthenticationService:
     def delete_user(self, user_id: str) -> bool:
         """Delete user"""
         try:
-            cursor = self.connection.cursor()
-            delete_query = "DELETE FROM users WHERE user_id = %s"
-            cursor.execute(delete_query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                delete_query = "DELETE FROM users WHERE user_id = %s"
+                cursor.execute(delete_query, (user_id,))
+                connection.commit()
+                self.replicas.mark_write()
+                cursor.close()
             
             logger.info(f"User deleted: {user_id}")
             return True
@@ -654,7 +1839,7 @@ class AuthenticationService:
     def change_password(self, user_id: str, old_password: str, new_password: str) -> bool:
         """Change user password"""
         try:
-            user = self.get_user_by_id(user_id)
+            user = self.get_user_by_id(user_id, primary=True)
             if not user:
                 return False
             
@@ -663,11 +1848,13 @@ class AuthenticationService:
                 return False
             
             new_password_hash = self.hash_password(new_password)
-            cursor = self.connection.cursor()
-            update_query = "UPDATE users SET password_hash = %s WHERE user_id = %s"
-            cursor.execute(update_query, (new_password_hash, user_id))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                update_query = "UPDATE users SET password_hash = %s WHERE user_id = %s"
+                cursor.execute(update_query, (new_password_hash, user_id))
+                connection.commit()
+                self.replicas.mark_write()
+                cursor.close()
             
             logger.info(f"Password changed for user: {user_id}")
             return True
@@ -0,0 +1,382 @@
+"""
+Portfolio analytics engines built on Investment records and PortfolioView rows
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date
+from typing import Sequence, Optional, Tuple
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+# Days per compounding block of the growth engine; keeps exp() exponents bounded
+_GROWTH_BLOCK_DAYS = 365
+# Upper bound on (rate groups x days) cells evaluated at once by the growth engine
+_GROWTH_CHUNK_CELLS = 2_000_000
+# XIRR search bracket on log(1 + rate): about -99.3% to +14,700% a year
+_XIRR_LOG_BRACKET = (-5.0, 5.0)
+# Upper bound on (paths x rate groups x years) draws simulated per Monte Carlo batch
+_PROJECTION_BATCH_CELLS = 4_000_000
+# Below this many draws a projection runs in-process instead of on a process pool
+_PROJECTION_POOL_MIN_CELLS = 20_000_000
+
+# Process-wide Monte Carlo results keyed on a hash of the projection inputs
+_projection_cache = {}
+_projection_cache_lock = threading.Lock()
+_PROJECTION_CACHE_SIZE = 32
+
+# Process pool for large Monte Carlo runs, created on first use and shared by
+# every session, and the number of workers it was created with
+_projection_executor = None
+_projection_executor_workers = 0
+_projection_executor_lock = threading.Lock()
+
+
+def calculate_portfolio_growth(investments: Sequence, as_of: Optional[date] = None) -> pd.DataFrame:
+    """
+    Calculate the portfolio's daily value curve from the earliest investment date
+    
+    Every holding with the same annual return grows by the same daily factor g, so
+    holdings are grouped by rate and each group's curve is the running sum of its
+    deposits compounded by g: V(t) = V(t-1) * g + deposits(t). The recurrence is
+    evaluated with cumulative sums one block of days at a time, which costs
+    O(investments + days x distinct rates) instead of one valuation per
+    (investment, day) pair. Values follow calculate_current_value (365.25-day
+    years) without its per-investment rounding.
+    
+    Args:
+        investments: Investment records or PortfolioView rows
+        as_of: Last day of the curve (defaults to today)
+    
+    Returns:
+        DataFrame with one row per day and columns date, invested,
+        current_value and profit_loss. Undated and future-dated investments
+        have no history and are left out.
+    """
+    as_of = as_of or datetime.now().date()
+    end = np.datetime64(as_of, 'D')
+    
+    inv_dates = np.asarray([inv.investment_date for inv in investments], dtype='datetime64[D]')
+    dated = ~np.isnat(inv_dates)
+    dated[dated] = inv_dates[dated] <= end
+    if not dated.any():
+        return pd.DataFrame(columns=['date', 'invested', 'current_value', 'profit_loss'])
+    
+    amounts = np.asarray([inv.investment_amount for inv in investments], dtype=np.float64)[dated]
+    rates = np.asarray([inv.annual_return_percentage for inv in investments], dtype=np.float64)[dated] / 100
+    inv_dates = inv_dates[dated]
+    
+    start = inv_dates.min()
+    n_days = int((end - start).astype(np.int64)) + 1
+    start_days = (inv_dates - start).astype(np.int64)
+    
+    invested = np.cumsum(np.bincount(start_days, weights=amounts, minlength=n_days))
+    
+    n_blocks = -(-n_days // _GROWTH_BLOCK_DAYS)
+    values = np.zeros(n_blocks * _GROWTH_BLOCK_DAYS)
+    
+    # A -100% return wipes the holding out after its first day, as in calculate_current_value
+    wiped = rates <= -1
+    values[:n_days] += np.bincount(start_days[wiped], weights=amounts[wiped], minlength=n_days)
+    
+    unique_rates, groups = np.unique(rates[~wiped], return_inverse=True)
+    log_growth = np.log1p(unique_rates) / 365.25
+    chunk_size = max(1, _GROWTH_CHUNK_CELLS // (n_blocks * _GROWTH_BLOCK_DAYS))
+    for first in range(0, len(unique_rates), chunk_size):
+        values += _grow_rate_groups(
+            log_growth[first:first + chunk_size], groups - first,
+            start_days[~wiped], amounts[~wiped], n_blocks
+        )
+    values = values[:n_days]
+    
+    return pd.DataFrame({
+        'date': np.arange(start, end + 1),
+        'invested': np.round(invested, 2),
+        'current_value': np.round(values, 2),
+        'profit_loss': np.round(values - invested, 2)
+    })
+
+
+def _grow_rate_groups(log_growth: np.ndarray, groups: np.ndarray, start_days: np.ndarray,
+                      amounts: np.ndarray, n_blocks: int) -> np.ndarray:
+    """
+    Summed daily value of a chunk of rate groups over n_blocks blocks of days
+    
+    Args:
+        log_growth: Daily log growth factor per group in the chunk
+        groups: Chunk-relative group index per investment (out of range = other chunk)
+        start_days: Day offset of each investment from the start of the curve
+        amounts: Investment amounts
+        n_blocks: Number of _GROWTH_BLOCK_DAYS blocks to evaluate
+    
+    Returns:
+        Daily value array of length n_blocks * _GROWTH_BLOCK_DAYS
+    """
+    n_groups = len(log_growth)
+    block = _GROWTH_BLOCK_DAYS
+    in_chunk = (groups >= 0) & (groups < n_groups)
+    
+    deposits = np.bincount(
+        groups[in_chunk] * (n_blocks * block) + start_days[in_chunk],
+        weights=amounts[in_chunk],
+        minlength=n_groups * n_blocks * block
+    ).reshape(n_groups, n_blocks, block)
+    
+    # Within a block: value at offset j = g**j * cumsum(deposit(s) * g**-s)
+    offsets = np.arange(block, dtype=np.float64)
+    growth = np.exp(log_growth[:, None] * offsets)
+    within = growth[:, None, :] * np.cumsum(deposits / growth[:, None, :], axis=2)
+    
+    # Carry each block's closing value into the next block
+    carry = np.zeros((n_groups, n_blocks))
+    block_growth = np.exp(log_growth * block)
+    for b in range(1, n_blocks):
+        carry[:, b] = within[:, b - 1, -1] + carry[:, b - 1] * block_growth
+    within += carry[:, :, None] * (growth * np.exp(log_growth)[:, None])[:, None, :]
+    
+    return within.sum(axis=0).ravel()
+
+
+def solve_xirr(cash_flows: np.ndarray, years: np.ndarray, max_iterations: int = 100,
+               tolerance: float = 1e-10) -> np.ndarray:
+    """
+    Solve a batch of XIRR problems at once with a bracketed Newton iteration
+    
+    Each row is one problem: NPV(x) = sum(cash_flow * (1 + x) ** -years) = 0.
+    The iteration runs on y = log(1 + x) for every row together; a Newton step
+    that leaves the row's sign-change bracket falls back to bisection, so every
+    row with a root in the bracket converges.
+    
+    Args:
+        cash_flows: (problems, flows) array, negative for money invested; pad with 0
+        years: (problems, flows) array of flow times in years
+        max_iterations: Iteration cap
+        tolerance: Convergence tolerance on log(1 + rate)
+    
+    Returns:
+        Annual rate per problem (0.1 for 10%), NaN where no root is bracketed
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    years = np.atleast_2d(np.asarray(years, dtype=np.float64))
+    # Discount back from the last flow so (1 + x) ** span stays bounded
+    span = years.max(axis=1, keepdims=True) - years
+    
+    def npv(y):
+        growth = np.exp(y[:, None] * span)
+        return (cash_flows * growth).sum(axis=1), (cash_flows * span * growth).sum(axis=1)
+    
+    lo = np.full(len(cash_flows), _XIRR_LOG_BRACKET[0])
+    hi = np.full(len(cash_flows), _XIRR_LOG_BRACKET[1])
+    f_lo, _ = npv(lo)
+    f_hi, _ = npv(hi)
+    bracketed = f_lo * f_hi < 0
+    
+    # Keep neg on the side where NPV < 0 and pos on the side where NPV > 0
+    neg = np.where(f_lo < 0, lo, hi)
+    pos = np.where(f_lo < 0, hi, lo)
+    y = np.clip(np.log1p(0.1), lo, hi)
+    active = bracketed.copy()
+    
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        value, slope = npv(y)
+        neg = np.where(value < 0, y, neg)
+        pos = np.where(value >= 0, y, pos)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = y - value / slope
+        inside = (newton - neg) * (newton - pos) < 0
+        step = np.where(inside, newton, (neg + pos) / 2) - y
+        
+        y = np.where(active, y + step, y)
+        active &= np.abs(step) > tolerance
+    
+    return np.where(bracketed, np.expm1(y), np.nan)
+
+
+def calculate_portfolio_xirr(portfolio) -> Tuple[float, np.ndarray]:
+    """
+    Calculate the money-weighted annual return (XIRR) of a portfolio and its positions
+    
+    Each investment is a cash outflow on its investment_date; the portfolio (or
+    position) is valued as a single inflow on the view's as-of date. All
+    positions are solved together as one solve_xirr batch of two-flow problems.
+    
+    Args:
+        portfolio: PortfolioView from build_portfolio_view/get_portfolio_view
+    
+    Returns:
+        Tuple (portfolio XIRR %, array of position XIRR %), rounded to 2 decimals.
+        NaN where the return is undefined (no history, or invested on the as-of date).
+    """
+    as_of = np.datetime64(portfolio.as_of or datetime.now().date(), 'D')
+    rows = portfolio.rows
+    amounts = np.asarray([row.investment_amount for row in rows], dtype=np.float64)
+    current_values = np.asarray([row.current_value for row in rows], dtype=np.float64)
+    inv_dates = np.asarray([row.investment_date for row in rows], dtype='datetime64[D]')
+    
+    # Undated and future investments have not produced a return yet
+    held = ~np.isnat(inv_dates)
+    held[held] = inv_dates[held] <= as_of
+    n_held = int(held.sum())
+    
+    position_xirr = np.full(len(rows), np.nan)
+    if n_held == 0:
+        return float('nan'), position_xirr
+    
+    years_held = (as_of - inv_dates[held]).astype(np.float64) / 365.0
+    
+    # One row per position: the outflow, then its value at as_of
+    position_rates = solve_xirr(
+        np.column_stack([-amounts[held], current_values[held]]),
+        np.column_stack([np.zeros(n_held), years_held])
+    )
+    # A holding valued at zero has lost everything
+    position_rates[(current_values[held] == 0) & (amounts[held] > 0)] = -1.0
+    position_xirr[held] = np.round(position_rates * 100, 2)
+    
+    # The whole portfolio: every outflow, then the total value at as_of
+    portfolio_rate = solve_xirr(
+        np.append(-amounts[held], current_values[held].sum()),
+        np.append(years_held.max() - years_held, years_held.max())
+    )[0]
+    
+    return float(np.round(portfolio_rate * 100, 2)), position_xirr
+
+
+def project_portfolio_monte_carlo(portfolio, years: int = 10, volatility_percentage: float = 15.0,
+                                  n_paths: int = 10_000, percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+                                  seed: int = 42, workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Project the portfolio value with Monte Carlo simulated annual returns
+    
+    Each year's return is drawn from a normal distribution around the holding's
+    annual_return_percentage with the given volatility, floored at -100%.
+    Holdings with the same annual return are treated as one asset class and share
+    each path's draws, so the work is paths x distinct rates x years however many
+    holdings there are. Paths are simulated in NumPy batches with their own seeds
+    (results do not depend on the number of workers) and large runs are spread over
+    a shared process pool. Results are cached per hash of the inputs.
+    
+    Args:
+        portfolio: PortfolioView from build_portfolio_view/get_portfolio_view
+        years: Projection horizon in years
+        volatility_percentage: Standard deviation of annual returns (e.g., 15 for 15%)
+        n_paths: Number of simulated paths
+        percentiles: Percentile bands to report
+        seed: Random seed
+        workers: Process pool size (defaults to the CPU count; 1 runs in-process)
+    
+    Returns:
+        DataFrame with one row per year from 0 to years: year, one p<N> column per
+        percentile, and deterministic (compounding at the annual return)
+    """
+    values = np.asarray([row.current_value for row in portfolio.rows], dtype=np.float64)
+    rates = np.asarray([row.annual_return_percentage for row in portfolio.rows], dtype=np.float64) / 100
+    unique_rates, groups = np.unique(rates, return_inverse=True)
+    group_values = np.bincount(groups, weights=values, minlength=len(unique_rates))
+    
+    key = hashlib.sha256(b''.join([
+        unique_rates.tobytes(),
+        group_values.tobytes(),
+        np.asarray([years, volatility_percentage, n_paths, seed], dtype=np.float64).tobytes(),
+        np.asarray(percentiles, dtype=np.float64).tobytes()
+    ])).hexdigest()
+    with _projection_cache_lock:
+        cached = _projection_cache.get(key)
+    if cached is not None:
+        return cached.copy()
+    
+    volatility = volatility_percentage / 100
+    n_groups = max(len(unique_rates), 1)
+    batch_paths = max(1, _PROJECTION_BATCH_CELLS // (n_groups * max(years, 1)))
+    batches = [min(batch_paths, n_paths - start) for start in range(0, n_paths, batch_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    jobs = [(group_values, unique_rates, volatility, years, size, batch_seed)
+            for size, batch_seed in zip(batches, seeds)]
+    
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1 and n_paths * n_groups * years >= _PROJECTION_POOL_MIN_CELLS:
+        pool = _projection_pool(workers)
+        paths = np.concatenate(list(pool.map(_simulate_projection_batch, *zip(*jobs))))
+    else:
+        paths = np.concatenate([_simulate_projection_batch(*job) for job in jobs])
+    
+    bands = np.percentile(paths, percentiles, axis=0)
+    start_value = group_values.sum()
+    projection = pd.DataFrame({'year': np.arange(years + 1)})
+    for pct, band in zip(percentiles, bands):
+        projection[f"p{pct:g}"] = np.round(np.concatenate([[start_value], band]), 2)
+    projection['deterministic'] = np.round(
+        (group_values[:, None] * (1 + unique_rates[:, None]) ** np.arange(years + 1)).sum(axis=0), 2
+    )
+    
+    with _projection_cache_lock:
+        if len(_projection_cache) >= _PROJECTION_CACHE_SIZE:
+            _projection_cache.pop(next(iter(_projection_cache)))
+        _projection_cache[key] = projection
+    return projection.copy()
+
+
+def _projection_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Get the shared Monte Carlo process pool, creating it on first use
+    
+    Workers are spawned rather than forked: a fork of the multithreaded Streamlit
+    server copies any lock another thread holds at that moment (logging, the
+    database pools, the caches), and a worker that then takes it never returns.
+    
+    Args:
+        workers: Number of worker processes wanted; a smaller pool is replaced
+    
+    Returns:
+        The shared ProcessPoolExecutor
+    """
+    global _projection_executor, _projection_executor_workers
+    with _projection_executor_lock:
+        if _projection_executor is None or _projection_executor_workers < workers:
+            if _projection_executor is not None:
+                # Runs already submitted to the old pool still finish
+                _projection_executor.shutdown(wait=False)
+            _projection_executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _projection_executor_workers = workers
+        return _projection_executor
+
+
+@atexit.register
+def _shutdown_projection_pool():
+    """Stop the shared Monte Carlo process pool's workers when the server exits"""
+    global _projection_executor, _projection_executor_workers
+    with _projection_executor_lock:
+        if _projection_executor is not None:
+            _projection_executor.shutdown()
+            _projection_executor = None
+            _projection_executor_workers = 0
+
+
+def _simulate_projection_batch(group_values: np.ndarray, group_rates: np.ndarray, volatility: float,
+                               years: int, n_paths: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Simulate one batch of portfolio paths (module-level so process pools can pickle it)
+    
+    Args:
+        group_values: Current value per rate group
+        group_rates: Mean annual return per rate group (0.1 for 10%)
+        volatility: Standard deviation of annual returns (0.15 for 15%)
+        years: Projection horizon in years
+        n_paths: Number of paths in this batch
+        seed: Seed sequence for this batch
+    
+    Returns:
+        (n_paths, years) array of portfolio values at the end of each year
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(group_rates[None, :, None], volatility, size=(n_paths, len(group_rates), years))
+    growth = np.cumprod(np.maximum(1 + returns, 0), axis=2)
+    return np.einsum('g,pgy->py', group_values, growth)
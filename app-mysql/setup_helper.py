@@ -32,7 +32,7 @@ def check_mysql_connection():
             if result[0] > 0:
                 print("   ✅ Investment table exists")
             else:
-                print("   ⚠️  Investment table not found (will be auto-created)")
+                print("   ⚠️  Investment table not found (run: python migrations.py)")
             
             connection.close()
             return True
@@ -2,12 +2,60 @@
 Unit tests for MySQL-based Investment Dashboard
 """
 import unittest
-from datetime import datetime, date
+from unittest.mock import MagicMock, Mock, patch
+from datetime import datetime, date, timedelta
 from mysql_service import (
+    InvestmentService,
     calculate_current_value,
     calculate_profit_loss,
-    calculate_return_percentage
+    calculate_return_percentage,
+    calculate_portfolio_values,
+    build_portfolio_view,
+    build_portfolio_view_from_columns,
+    Investment,
+    InvestmentColumns,
+    PortfolioSummary,
+    MySQLPool,
+    ReplicaRouter,
+    get_connection_pool,
+    close_connection_pools,
+    _invalidate_valuation_cache,
+    to_paise,
+    from_paise
 )
+import math
+import os
+import numpy as np
+import mysql_service
+from mysql.connector import Error, errorcode
+import migrations
+import portfolio_analytics
+from portfolio_analytics import (
+    calculate_portfolio_growth,
+    calculate_portfolio_xirr,
+    solve_xirr,
+    project_portfolio_monte_carlo
+)
+
+
+def mock_pool(cursor):
+    """Build a stand-in MySQLPool whose connections hand out the given cursor"""
+    pool = MagicMock()
+    connection = pool.connection.return_value.__enter__.return_value
+    connection.cursor.return_value = cursor
+    pool.getconn.return_value = connection
+    pool.prepared_cursor.return_value = cursor
+    return pool
+
+
+def investment_columns(investments):
+    """Build the InvestmentColumns read_investment_columns() would stream for typed records"""
+    return InvestmentColumns(
+        investment_ids=np.array([inv.investment_id for inv in investments], dtype='U36'),
+        investment_paise=to_paise([inv.investment_amount for inv in investments]),
+        investment_dates=np.array([inv.investment_date for inv in investments], dtype='datetime64[D]'),
+        annual_return_percentages=np.array([inv.annual_return_percentage for inv in investments], dtype=np.float64)
+    )
 
 
 class TestCalculations(unittest.TestCase):
@@ -110,6 +158,1014 @@ class TestCalculations(unittest.TestCase):
         self.assertGreater(total_current, total_invested)
 
 
+class TestPortfolioValues(unittest.TestCase):
+    """Test vectorized portfolio valuation"""
+    
+    def test_as_of_date(self):
+        """Test valuation on an explicit as-of date"""
+        current_values, _, _ = calculate_portfolio_values(
+            [1000, 1000], [10, 10], [date(2023, 12, 14), date(2025, 1, 1)], as_of=date(2024, 12, 14)
+        )
+        
+        self.assertEqual(
+            current_values[0],
+            calculate_current_value(1000, 10, "2023-12-14", as_of=date(2024, 12, 14))
+        )
+        self.assertAlmostEqual(current_values[0], 1000 * 1.1 ** (366 / 365.25), delta=0.01)
+        self.assertEqual(current_values[1], 1000)
+    
+    def test_matches_per_investment_calculations(self):
+        """Test batch results match the scalar calculation functions"""
+        investments = [
+            (1000, 5, "2024-12-14"),
+            (2000.5, 10, "2023-06-01"),
+            (1500, 7, date.today().strftime("%Y-%m-%d")),
+        ]
+        
+        current_values, profit_losses, return_pcts = calculate_portfolio_values(
+            [inv[0] for inv in investments],
+            [inv[1] for inv in investments],
+            [inv[2] for inv in investments]
+        )
+        
+        for i, (amount, annual_return, inv_date) in enumerate(investments):
+            expected = calculate_current_value(amount, annual_return, inv_date)
+            self.assertAlmostEqual(current_values[i], expected, delta=0.01)
+            self.assertAlmostEqual(profit_losses[i], calculate_profit_loss(expected, amount), delta=0.01)
+            self.assertAlmostEqual(return_pcts[i], calculate_return_percentage(expected, amount), delta=0.01)
+    
+    def test_accepts_date_objects(self):
+        """Test driver date objects are accepted without string conversion"""
+        inv_date = date.today() - timedelta(days=400)
+        
+        current_values, _, _ = calculate_portfolio_values([1000], [10], [inv_date])
+        expected = calculate_current_value(1000, 10, inv_date.strftime("%Y-%m-%d"))
+        self.assertAlmostEqual(current_values[0], expected, delta=0.01)
+    
+    def test_future_date_keeps_principal(self):
+        """Test future date is valued at the invested amount"""
+        current_values, profit_losses, _ = calculate_portfolio_values([1000], [10], ["2099-12-31"])
+        self.assertEqual(current_values[0], 1000)
+        self.assertEqual(profit_losses[0], 0)
+
+
+class TestPortfolioView(unittest.TestCase):
+    """Test the portfolio view model"""
+    
+    def test_rows_and_totals(self):
+        """Test view rows carry valuations and totals add up"""
+        investments = [
+            Investment('a' * 36, 1000.0, date(2024, 12, 14), 10.0, 'Mutual fund'),
+            Investment('b' * 36, 2000.0, date(2099, 1, 1), 5.0),
+        ]
+        
+        portfolio = build_portfolio_view(investments)
+        
+        self.assertEqual(portfolio.count, 2)
+        self.assertEqual(portfolio.rows[0].investment_date, date(2024, 12, 14))
+        self.assertEqual(portfolio.rows[0].investment_comments, "Mutual fund")
+        self.assertEqual(portfolio.rows[1].current_value, 2000)
+        self.assertEqual(portfolio.total_invested, 3000)
+        self.assertAlmostEqual(
+            portfolio.total_current_value,
+            sum(row.current_value for row in portfolio.rows)
+        )
+        self.assertGreater(portfolio.total_profit_loss, 0)
+    
+    def test_investment_from_row(self):
+        """Test dict rows convert to typed Investment records"""
+        record = Investment.from_row({
+            'investment_id': 'c' * 36, 'investment_amount': '1500.75',
+            'investment_date': '2024-06-15', 'annual_return_percentage': 8.5
+        })
+        
+        self.assertEqual(record, Investment('c' * 36, 1500.75, date(2024, 6, 15), 8.5))
+        self.assertEqual(
+            calculate_current_value(1000, 5, date(2024, 6, 15)),
+            calculate_current_value(1000, 5, "2024-06-15")
+        )
+
+
+class TestFixedPointMoney(unittest.TestCase):
+    """Test the fixed-point paise valuation engine"""
+    
+    def test_paise_round_trip(self):
+        """Test rupee amounts convert to exact paise and back"""
+        paise = to_paise([1500.75, 0.1, 0.2, 99999999.99])
+        
+        self.assertEqual(paise.tolist(), [150075, 10, 20, 9999999999])
+        self.assertEqual(from_paise(paise).tolist(), [1500.75, 0.1, 0.2, 99999999.99])
+    
+    def test_totals_are_exact(self):
+        """Test totals are exact where float accumulation drifts"""
+        portfolio = build_portfolio_view(
+            [Investment(str(i), 0.1, date(2099, 1, 1), 5.0) for i in range(10)]
+        )
+        
+        self.assertNotEqual(sum([0.1] * 10), 1.0)
+        self.assertEqual(portfolio.total_invested, 1.0)
+        self.assertEqual(portfolio.total_current_value, 1.0)
+        self.assertEqual(portfolio.total_profit_loss, 0.0)
+
+
+class TestValuationCache(unittest.TestCase):
+    """Test the process-wide valuation cache"""
+    
+    def setUp(self):
+        _invalidate_valuation_cache()
+        self.service = InvestmentService.__new__(InvestmentService)
+        self.service.read_investment_columns = Mock(return_value=investment_columns([
+            Investment('a' * 36, 1000.0, date(2024, 12, 14), 10.0)
+        ]))
+    
+    def test_reused_until_write(self):
+        """Test the portfolio is read once per day until a write invalidates it"""
+        first = self.service.get_portfolio_view()
+        self.assertIs(self.service.get_portfolio_view(), first)
+        self.assertEqual(self.service.read_investment_columns.call_count, 1)
+        
+        _invalidate_valuation_cache()
+        
+        self.assertIsNot(self.service.get_portfolio_view(), first)
+        self.assertEqual(self.service.read_investment_columns.call_count, 2)
+    
+    def test_keyed_on_as_of(self):
+        """Test each as-of date gets its own valuation"""
+        past = self.service.get_portfolio_view(as_of=date(2024, 12, 14))
+        current = self.service.get_portfolio_view()
+        
+        self.assertEqual(past.total_current_value, 1000)
+        self.assertEqual(past.as_of, date(2024, 12, 14))
+        self.assertGreater(current.total_current_value, 1000)
+    
+    def test_expires_after_ttl(self):
+        """Test entries expire so writes from other app instances show up"""
+        with patch('mysql_service.time.monotonic', side_effect=[0.0, 10.0, 40.0]):
+            first = self.service.get_portfolio_view()
+            self.assertIs(self.service.get_portfolio_view(), first)
+            self.assertIsNot(self.service.get_portfolio_view(), first)
+        self.assertEqual(self.service.read_investment_columns.call_count, 2)
+
+
+class TestMySQLPool(unittest.TestCase):
+    """Test the process-wide connection pool wrapper"""
+    
+    def setUp(self):
+        patcher = patch('mysql_service.pooling.MySQLConnectionPool')
+        self.library_pool = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.connection = Mock(_cnx=Mock(), connection_id=7, unread_result=False, in_transaction=False)
+        self.connection.cursor.side_effect = lambda **options: Mock()
+        self.library_pool.get_connection.return_value = self.connection
+    
+    def test_waits_then_times_out(self):
+        """Test an exhausted pool waits for the timeout instead of failing at once"""
+        pool = MySQLPool({'host': 'h'}, size=1, timeout=0.01)
+        pool.getconn()
+        
+        with self.assertRaises(Error):
+            pool.getconn()
+        self.assertEqual(pool.stats()['waits'], 1)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+    
+    def test_putconn_clears_open_transaction(self):
+        """Test a connection returned mid-transaction is rolled back before reuse"""
+        pool = MySQLPool({'host': 'h'}, size=1)
+        with pool.connection() as connection:
+            connection.in_transaction = True
+        
+        self.connection.rollback.assert_called_once()
+        self.connection.close.assert_called_once()
+        self.assertEqual(pool.stats()['in_use'], 0)
+        with pool.connection():
+            pass
+    
+    def test_counts_reconnects(self):
+        """Test a changed server thread id on checkout is counted as a reconnect"""
+        pool = MySQLPool({'host': 'h'}, size=1)
+        with pool.connection():
+            pass
+        self.connection.connection_id = 8
+        with pool.connection():
+            pass
+        
+        self.assertEqual(pool.stats()['reconnects'], 1)
+        self.assertEqual(pool.stats()['checkouts'], 2)
+    
+    def test_shared_per_config(self):
+        """Test services with the same settings share one pool"""
+        self.addCleanup(close_connection_pools)
+        config = {'host': 'h', 'port': 3306, 'user': 'u', 'password': 'p', 'database': 'd'}
+        
+        self.assertIs(get_connection_pool(config), get_connection_pool(dict(config)))
+        self.assertIsNot(get_connection_pool(config), get_connection_pool({**config, 'database': 'other'}))
+    
+    def test_prepared_cursor_cached_per_connection(self):
+        """Test a fixed query is prepared once per connection and reused"""
+        pool = MySQLPool({'host': 'h'}, size=2)
+        other = Mock(_cnx=Mock(), connection_id=9, unread_result=False, in_transaction=False)
+        self.library_pool.get_connection.side_effect = [self.connection, other, self.connection]
+        
+        with pool.connection() as connection:
+            first = pool.prepared_cursor(connection, "SELECT 1")
+            self.assertIs(pool.prepared_cursor(connection, "SELECT 1"), first)
+            self.assertIsNot(pool.prepared_cursor(connection, "SELECT 1", dictionary=True), first)
+        with pool.connection() as connection:
+            self.assertIsNot(pool.prepared_cursor(connection, "SELECT 1"), first)
+        with pool.connection() as connection:
+            self.assertIs(pool.prepared_cursor(connection, "SELECT 1"), first)
+        
+        self.connection.cursor.assert_any_call(prepared=True, dictionary=False)
+        self.assertEqual(pool.stats()['prepared_statements'], 3)
+    
+    def test_reconnect_drops_prepared_cursors(self):
+        """Test statements prepared on a dropped session are not reused"""
+        pool = MySQLPool({'host': 'h'}, size=1)
+        with pool.connection() as connection:
+            first = pool.prepared_cursor(connection, "SELECT 1")
+        self.connection.connection_id = 8
+        with pool.connection() as connection:
+            self.assertIsNot(pool.prepared_cursor(connection, "SELECT 1"), first)
+
+
+class TestReplicaRouter(unittest.TestCase):
+    """Test read routing across replicas with lag-aware fallback"""
+    
+    def setUp(self):
+        self.primary = MagicMock(name='primary')
+        self.replica_a = MagicMock(name='replica_a')
+        self.replica_b = MagicMock(name='replica_b')
+        self.lags = {id(self.replica_a): 0.0, id(self.replica_b): 0.0}
+        patcher = patch.object(ReplicaRouter, '_replication_lag', side_effect=lambda replica: self.lags[id(replica)])
+        self.replication_lag = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter(self.primary, [self.replica_a, self.replica_b], max_lag=5.0,
+                                    lag_check_interval=60.0, read_your_writes_window=60.0)
+    
+    def read_pool(self, **options):
+        with self.router.read_connection(**options) as (pool, connection):
+            return pool
+    
+    def test_round_robin(self):
+        """Test reads alternate between healthy replicas and lag is checked once per interval"""
+        pools = [self.read_pool() for _ in range(4)]
+        
+        self.assertEqual(pools, [self.replica_a, self.replica_b, self.replica_a, self.replica_b])
+        self.assertEqual(self.replication_lag.call_count, 2)
+        self.assertEqual(self.router.stats()['replica_reads'], 4)
+        self.replica_a.putconn.assert_called_with(self.replica_a.getconn.return_value)
+    
+    def test_lagging_replica_skipped(self):
+        """Test a replica past max_lag or with replication stopped is passed over"""
+        self.lags[id(self.replica_a)] = 30.0
+        self.assertEqual([self.read_pool() for _ in range(2)], [self.replica_b, self.replica_b])
+        
+        self.router.lag_check_interval = 0
+        self.lags[id(self.replica_b)] = None
+        self.assertIs(self.read_pool(), self.primary)
+        self.assertEqual(self.router.stats()['replicas'], [{'lag': 30.0, 'usable': False}, {'lag': None, 'usable': False}])
+    
+    def test_reads_stay_on_primary_after_write(self):
+        """Test the read-your-writes window and explicit primary reads skip replicas"""
+        self.assertIs(self.read_pool(primary=True), self.primary)
+        self.router.mark_write()
+        self.assertIs(self.read_pool(), self.primary)
+        
+        self.router.read_your_writes_window = 0
+        self.assertIs(self.read_pool(), self.replica_a)
+    
+    def test_checkout_failure_falls_back(self):
+        """Test an unreachable replica is taken out of rotation and the read served by the primary"""
+        self.replica_a.getconn.side_effect = Error(msg="Can't connect")
+        
+        self.assertIs(self.read_pool(), self.primary)
+        self.assertEqual([self.read_pool() for _ in range(2)], [self.replica_b, self.replica_b])
+        self.assertEqual(self.router.stats()['fallbacks'], 1)
+    
+    @patch('mysql_service.get_connection_pool')
+    def test_replica_down_at_startup(self, mock_get_pool):
+        """Test a replica given as settings is opened at its first check and retried after a failure"""
+        replica_config = {'host': 'replica-c'}
+        self.lags[id(mock_get_pool.return_value)] = 0.0
+        mock_get_pool.side_effect = [Error(msg="Can't connect"), mock_get_pool.return_value]
+        router = ReplicaRouter(self.primary, [replica_config], lag_check_interval=60.0, read_your_writes_window=0)
+        mock_get_pool.assert_not_called()
+        
+        with router.read_connection() as (pool, connection):
+            self.assertIs(pool, self.primary)
+        self.assertEqual(router.stats()['replicas'], [{'lag': None, 'usable': False}])
+        
+        router.lag_check_interval = 0
+        with router.read_connection() as (pool, connection):
+            self.assertIs(pool, mock_get_pool.return_value)
+        mock_get_pool.assert_called_with(replica_config)
+        self.assertIs(router.replicas[0], mock_get_pool.return_value)
+
+
+class TestReplicationLag(unittest.TestCase):
+    """Test replica lag is read from the replication status"""
+    
+    def test_replication_lag_from_status(self):
+        """Test lag is read from SHOW REPLICA STATUS, with stopped replication as None"""
+        cursor = Mock()
+        replica = mock_pool(cursor)
+        
+        cursor.fetchall.return_value = [{'Seconds_Behind_Source': 3}]
+        self.assertEqual(ReplicaRouter._replication_lag(replica), 3.0)
+        cursor.fetchall.return_value = [{'Seconds_Behind_Master': None}]
+        self.assertIsNone(ReplicaRouter._replication_lag(replica))
+        cursor.fetchall.return_value = []
+        self.assertEqual(ReplicaRouter._replication_lag(replica), 0.0)
+    
+    def test_denied_status_not_retried_with_old_spelling(self):
+        """Test only a syntax error falls back to SHOW SLAVE STATUS"""
+        cursor = Mock()
+        cursor.execute.side_effect = Error(msg="Access denied", errno=errorcode.ER_SPECIFIC_ACCESS_DENIED_ERROR)
+        
+        with self.assertRaises(Error):
+            ReplicaRouter._replication_lag(mock_pool(cursor))
+        cursor.execute.assert_called_once_with("SHOW REPLICA STATUS")
+    
+    def test_lag_check_denied(self):
+        """Test a replica without REPLICATION CLIENT is reported once and kept out of rotation"""
+        primary, replica = MagicMock(name='primary'), MagicMock(name='replica')
+        denied = Error(msg="Access denied; you need the REPLICATION CLIENT privilege",
+                       errno=errorcode.ER_SPECIFIC_ACCESS_DENIED_ERROR)
+        router = ReplicaRouter(primary, [replica], lag_check_interval=0, read_your_writes_window=0)
+        
+        with patch.object(ReplicaRouter, '_replication_lag', side_effect=denied), \
+                self.assertLogs('mysql_service', level='WARNING') as logs:
+            self.assertIs(router._choose_replica(), None)
+            self.assertIs(router._choose_replica(), None)
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].levelname, 'ERROR')
+        self.assertIn("REPLICATION CLIENT", logs.output[0])
+        
+        router.allow_unchecked_lag = True
+        with patch.object(ReplicaRouter, '_replication_lag', side_effect=denied):
+            self.assertIs(router._choose_replica(), replica)
+
+
+class TestWriteRoundTrips(unittest.TestCase):
+    """Test update/delete rely on affected-row counts instead of a prior read"""
+    
+    def setUp(self):
+        self.service = InvestmentService.__new__(InvestmentService)
+        self.cursor = Mock()
+        self.service.pool = mock_pool(self.cursor)
+        self.service.replicas = ReplicaRouter(self.service.pool, [])
+        self.service.read_investment = Mock(return_value={'investment_id': 'a' * 36})
+    
+    def test_update_not_found(self):
+        """Test a missing record costs only the UPDATE"""
+        self.cursor.rowcount = 0
+        
+        self.assertIsNone(self.service.update_investment('a' * 36, investment_amount=10.0))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+        self.service.read_investment.assert_not_called()
+    
+    def test_update_found(self):
+        """Test a matched record is read back once, after the UPDATE"""
+        self.cursor.rowcount = 1
+        
+        result = self.service.update_investment('a' * 36, investment_amount=10.0)
+        
+        self.assertEqual(result, {'investment_id': 'a' * 36})
+        self.assertEqual(self.cursor.execute.call_count, 1)
+        self.service.read_investment.assert_called_once_with('a' * 36)
+    
+    def test_delete(self):
+        """Test delete reports the affected-row count without reading first"""
+        self.cursor.rowcount = 1
+        self.assertTrue(self.service.delete_investment('a' * 36))
+        
+        self.cursor.rowcount = 0
+        self.assertFalse(self.service.delete_investment('a' * 36))
+        self.service.read_investment.assert_not_called()
+
+
+class TestPreparedStatements(unittest.TestCase):
+    """Test the fixed CRUD and user queries go through prepared cursors"""
+    
+    def setUp(self):
+        self.service = InvestmentService.__new__(InvestmentService)
+        self.cursor = Mock()
+        self.service.pool = mock_pool(self.cursor)
+        self.service.replicas = ReplicaRouter(self.service.pool, [])
+    
+    def test_read_investment_reuses_query_object(self):
+        """Test repeated reads hand the cache the same query object, so it is not re-prepared"""
+        self.cursor.fetchall.return_value = [{'investment_id': 'a' * 36}]
+        
+        self.assertEqual(self.service.read_investment('a' * 36), {'investment_id': 'a' * 36})
+        self.service.read_investment('b' * 36)
+        
+        first, second = self.service.pool.prepared_cursor.call_args_list
+        self.assertIs(first.args[1], second.args[1])
+        self.assertEqual(first.kwargs, {'dictionary': True})
+        self.assertIs(self.cursor.execute.call_args.args[0], first.args[1])
+        self.assertEqual(self.cursor.execute.call_args.args[1], ('b' * 36,))
+    
+    def test_create_and_delete_use_prepared_cursors(self):
+        """Test inserts and deletes run on cached prepared cursors and leave them open"""
+        self.cursor.rowcount = 1
+        
+        self.service.create_investment(1000.0, '2024-01-02', 10.0)
+        self.service.delete_investment('a' * 36)
+        
+        self.assertEqual(self.service.pool.prepared_cursor.call_count, 2)
+        self.cursor.close.assert_not_called()
+
+
+class TestStreamingColumns(unittest.TestCase):
+    """Test the unbuffered columnar read decodes raw rows into NumPy columns"""
+    
+    ROWS = [
+        (b'a' * 36, b'1000.10', b'2024-01-02', b'10.00'),
+        (bytearray(b'b' * 36), b'-0.05', b'2023-12-31', b'7.25'),
+        (b'legacy-id', b'99999999.99', b'2020-02-29', b'0.00'),
+    ]
+    
+    def setUp(self):
+        self.service = InvestmentService.__new__(InvestmentService)
+        self.cursor = Mock()
+        self.cursor.fetchone.return_value = (3,)
+        self.cursor.fetchmany.side_effect = [self.ROWS[:2], self.ROWS[2:], []]
+        self.service.pool = mock_pool(self.cursor)
+        self.service.replicas = ReplicaRouter(self.service.pool, [])
+    
+    def test_streams_batches_into_columns(self):
+        """Test batches fill arrays sized from the count, in one snapshot"""
+        columns = self.service.read_investment_columns(batch_size=2)
+        
+        connection = self.service.pool.connection.return_value.__enter__.return_value
+        connection.start_transaction.assert_called_once_with(consistent_snapshot=True, readonly=True)
+        connection.cursor.assert_called_with(raw=True, buffered=False)
+        self.cursor.fetchmany.assert_called_with(2)
+        
+        self.assertEqual(columns.investment_ids.tolist(), ['a' * 36, 'b' * 36, 'legacy-id'])
+        self.assertEqual(columns.investment_paise.tolist(), [100010, -5, 9999999999])
+        self.assertEqual(columns.investment_dates.tolist(), [date(2024, 1, 2), date(2023, 12, 31), date(2020, 2, 29)])
+        self.assertEqual(columns.annual_return_percentages.tolist(), [10.0, 7.25, 0.0])
+    
+    def test_view_matches_row_view(self):
+        """Test a view valued from columns matches the record-based portfolio view"""
+        columns = self.service.read_investment_columns()
+        records = [
+            Investment(investment_id, paise / 100, inv_date, rate)
+            for investment_id, paise, inv_date, rate in zip(
+                columns.investment_ids.tolist(), columns.investment_paise.tolist(),
+                columns.investment_dates.tolist(), columns.annual_return_percentages.tolist()
+            )
+        ]
+        as_of = date(2025, 6, 1)
+        
+        self.assertEqual(build_portfolio_view_from_columns(columns, as_of=as_of),
+                         build_portfolio_view(records, as_of=as_of))
+    
+    def test_portfolio_view_streams_columns(self):
+        """Test the Dashboard valuation is built from the streamed columns"""
+        _invalidate_valuation_cache()
+        
+        portfolio = self.service.get_portfolio_view(as_of=date(2025, 6, 1))
+        
+        self.cursor.fetchmany.assert_called_with(10000)
+        self.assertEqual([row.investment_id for row in portfolio.rows], ['a' * 36, 'b' * 36, 'legacy-id'])
+        self.assertEqual(portfolio.rows[1].investment_amount, -0.05)
+        self.assertEqual(portfolio.total_invested, 100001000.04)
+    
+    def test_empty_table(self):
+        """Test an empty table yields empty columns"""
+        self.cursor.fetchone.return_value = (0,)
+        self.cursor.fetchmany.side_effect = [[]]
+        
+        self.assertEqual(self.service.read_investment_columns().count, 0)
+        self.assertEqual(InvestmentColumns.allocate(0).investment_paise.dtype, 'int64')
+
+
+class TestInvestmentsPage(unittest.TestCase):
+    """Test keyset pagination queries"""
+    
+    def setUp(self):
+        self.service = InvestmentService.__new__(InvestmentService)
+        self.cursor = Mock()
+        self.cursor.fetchall.return_value = [('a' * 36, 1000, date(2024, 1, 2), 10, None)]
+        self.service.pool = mock_pool(self.cursor)
+        self.service.replicas = ReplicaRouter(self.service.pool, [])
+    
+    def test_first_page(self):
+        """Test the first page has no seek predicate"""
+        records = self.service.read_investments_page(limit=10)
+        
+        query, params = self.cursor.execute.call_args.args
+        self.assertNotIn("WHERE", query)
+        self.assertIn("ORDER BY investment_date DESC, investment_id", query)
+        self.assertEqual(params, (10,))
+        self.assertEqual(records, [Investment('a' * 36, 1000.0, date(2024, 1, 2), 10.0, None)])
+    
+    def test_seek_after_cursor(self):
+        """Test later pages seek past the previous page's last (date, id)"""
+        self.service.read_investments_page(after=(date(2024, 1, 2), 'b' * 36), limit=10)
+        
+        query, params = self.cursor.execute.call_args.args
+        self.assertIn("investment_date <= %s AND (investment_date < %s OR (investment_date = %s AND investment_id > %s))", query)
+        self.assertEqual(params, (date(2024, 1, 2), date(2024, 1, 2), date(2024, 1, 2), 'b' * 36, 10))
+    
+    def test_rejects_non_positive_limit(self):
+        """Test a zero limit is rejected"""
+        with self.assertRaises(ValueError):
+            self.service.read_investments_page(limit=0)
+
+
+class TestReadProjections(unittest.TestCase):
+    """Test projection-aware reads fetch only the requested columns"""
+    
+    def setUp(self):
+        self.service = InvestmentService.__new__(InvestmentService)
+        self.cursor = Mock()
+        self.service.pool = mock_pool(self.cursor)
+        self.service.replicas = ReplicaRouter(self.service.pool, [])
+    
+    def test_summary_page(self):
+        """Test a summary page selects id, amount and date only"""
+        self.cursor.fetchall.return_value = [('a' * 36, 1000, date(2024, 1, 2))]
+        
+        records = self.service.read_investments_page(limit=10, projection='summary')
+        
+        query = self.cursor.execute.call_args.args[0]
+        self.assertIn("SELECT investment_id, investment_amount, investment_date\n", query)
+        self.assertEqual(records, [Investment('a' * 36, 1000.0, date(2024, 1, 2), None)])
+    
+    def test_read_investment_projection(self):
+        """Test a single-row read names its columns instead of SELECT *"""
+        self.cursor.fetchall.return_value = []
+        self.assertIsNone(self.service.read_investment('a' * 36, projection='valuation'))
+        
+        query = self.cursor.execute.call_args.args[0]
+        self.assertNotIn("*", query)
+        self.assertNotIn("investment_comments", query)
+        self.assertIn("annual_return_percentage", query)
+    
+    def test_portfolio_view_reads_covered_columns(self):
+        """Test the Dashboard valuation selects only columns of the covering index"""
+        _invalidate_valuation_cache()
+        self.cursor.fetchone.return_value = (1,)
+        self.cursor.fetchmany.side_effect = [[(b'a' * 36, b'1000.00', b'2024-01-02', b'10.00')], []]
+        
+        portfolio = self.service.get_portfolio_view()
+        
+        queries = [call.args[0] for call in self.cursor.execute.call_args_list]
+        self.assertEqual(queries, ["SELECT COUNT(*) FROM investment", mysql_service._VALUATION_SCAN_QUERY])
+        self.assertIsNone(portfolio.rows[0].investment_comments)
+    
+    def test_read_investment_comments(self):
+        """Test comments are read on their own, keyed on investment id, and cached until a write"""
+        _invalidate_valuation_cache()
+        self.cursor.fetchall.return_value = [('a' * 36, "Mutual fund")]
+        
+        self.assertEqual(self.service.read_investment_comments(), {'a' * 36: "Mutual fund"})
+        self.assertIn("investment_comments IS NOT NULL", self.cursor.execute.call_args.args[0])
+        
+        self.service.read_investment_comments()
+        self.assertEqual(self.cursor.execute.call_count, 1)
+        _invalidate_valuation_cache()
+        self.service.read_investment_comments()
+        self.assertEqual(self.cursor.execute.call_count, 2)
+    
+    def test_unknown_projection(self):
+        """Test an unknown projection is rejected before querying"""
+        with self.assertRaises(ValueError):
+            self.service.read_all_investments(projection='everything')
+        self.cursor.execute.assert_not_called()
+
+
+class TestMigrations(unittest.TestCase):
+    """Test the versioned schema migration runner"""
+    
+    def setUp(self):
+        self.connection = Mock()
+        self.cursor = Mock()
+        self.connection.cursor.return_value = self.cursor
+    
+    def executed(self):
+        return [call.args[0] for call in self.cursor.execute.call_args_list]
+    
+    def test_applies_only_pending_in_order(self):
+        """Test applied versions are skipped and the rest are recorded in order"""
+        self.cursor.fetchall.return_value = [(1,), (2,)]
+        
+        applied = migrations.migrate(self.connection)
+        
+        self.assertEqual([m.version for m in applied], [3, 4, 5])
+        recorded = [call.args[1][0] for call in self.cursor.execute.call_args_list
+                    if "INSERT INTO schema_migrations" in call.args[0]]
+        self.assertEqual(recorded, [3, 4, 5])
+        self.assertFalse(any("CREATE TABLE IF NOT EXISTS investment" in query for query in self.executed()))
+    
+    def test_up_to_date_runs_no_ddl(self):
+        """Test nothing but the bookkeeping queries runs once every version is applied"""
+        self.cursor.fetchall.return_value = [(m.version,) for m in migrations.MIGRATIONS]
+        
+        self.assertEqual(migrations.migrate(self.connection), [])
+        self.assertEqual(len(self.executed()), 2)
+    
+    def test_change_already_in_place(self):
+        """Test a duplicate column from a pre-migrations database still records the version"""
+        self.cursor.fetchall.return_value = [(1,), (2,)]
+        self.cursor.execute.side_effect = lambda query, params=None: self._raise_for_alter(query)
+        
+        applied = migrations.migrate(self.connection, target=3)
+        
+        self.assertEqual([m.version for m in applied], [3])
+        self.connection.commit.assert_called_once()
+    
+    def test_other_errors_propagate(self):
+        """Test unexpected errors stop the run without recording the version"""
+        self.cursor.fetchall.return_value = [(1,), (2,)]
+        self.cursor.execute.side_effect = lambda query, params=None: self._raise_for_alter(
+            query, errorcode.ER_TABLEACCESS_DENIED_ERROR)
+        
+        with self.assertRaises(Error):
+            migrations.migrate(self.connection)
+        self.connection.commit.assert_not_called()
+    
+    def test_valuation_reads_covered(self):
+        """Test the valuation projection and scans only use columns of the covering index"""
+        index_sql = next(statement for m in migrations.MIGRATIONS for statement in m.statements
+                         if "idx_investment_valuation" in statement)
+        index_columns = {column.strip() for column in index_sql[index_sql.rindex("(") + 1:index_sql.rindex(")")].split(",")}
+        
+        self.assertTrue(set(mysql_service._PROJECTIONS['valuation']) <= index_columns)
+        for query in (mysql_service._VALUATION_SCAN_QUERY, mysql_service._PORTFOLIO_SUMMARY_QUERY):
+            self.assertNotIn("investment_comments", query)
+            self.assertNotIn("created_at", query)
+    
+    def test_connection_settings_from_environment(self):
+        """Test the docker-compose environment variables become service arguments"""
+        settings = migrations.connection_settings({
+            'MYSQL_HOST': 'mysql', 'MYSQL_PORT': '3306', 'MYSQL_USER': 'root',
+            'MYSQL_PASSWORD': 'password', 'MYSQL_DATABASE': 'investment_db', 'PATH': '/usr/bin'
+        })
+        
+        self.assertEqual(settings, {'host': 'mysql', 'port': 3306, 'user': 'root',
+                                    'password': 'password', 'database': 'investment_db'})
+        self.assertEqual(migrations.connection_settings({'MYSQL_HOST': ''}), {})
+    
+    @patch('migrations.close_connection_pools')
+    @patch('migrations.InvestmentService')
+    def test_main_connects_with_environment(self, mock_service, mock_close_pools):
+        """Test the command line connects with the environment's settings instead of requiring secrets"""
+        mock_service.return_value.pool = mock_pool(self.cursor)
+        self.cursor.fetchall.return_value = [(migration.version,) for migration in migrations.MIGRATIONS]
+        
+        with patch.dict(os.environ, {'MYSQL_HOST': 'mysql', 'MYSQL_PORT': '3307'}, clear=True):
+            self.assertEqual(migrations.main(["status"]), 0)
+        
+        mock_service.assert_called_once_with(host='mysql', port=3307)
+        mock_service.return_value.close.assert_called_once()
+    
+    @staticmethod
+    def _raise_for_alter(query, errno=errorcode.ER_DUP_FIELDNAME):
+        if query.startswith("ALTER TABLE"):
+            raise Error(msg="Duplicate column name", errno=errno)
+
+
+@unittest.skipUnless(os.getenv('MYSQL_TEST_DATABASE'), "set MYSQL_TEST_DATABASE to check query plans on a MySQL server")
+class TestValuationQueryPlans(unittest.TestCase):
+    """Test the valuation reads are index-only scans on a migrated MySQL database"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.service = InvestmentService(
+            host=os.getenv('MYSQL_HOST', 'localhost'),
+            port=int(os.getenv('MYSQL_PORT', '3306')),
+            user=os.getenv('MYSQL_USER', 'root'),
+            password=os.getenv('MYSQL_PASSWORD', 'password'),
+            database=os.getenv('MYSQL_TEST_DATABASE')
+        )
+        with cls.service.pool.connection() as connection:
+            migrations.migrate(connection)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.close()
+        close_connection_pools()
+    
+    def explain(self, query, params=()):
+        with self.service.pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute("EXPLAIN " + query, params)
+            plan = cursor.fetchall()[0]
+            cursor.close()
+        return plan
+    
+    def test_valuation_scan_index_only(self):
+        """Test the Dashboard's valuation scan reads only idx_investment_valuation"""
+        plan = self.explain(mysql_service._VALUATION_SCAN_QUERY)
+        
+        self.assertEqual(plan['key'], 'idx_investment_valuation')
+        self.assertIn("Using index", plan['Extra'])
+    
+    def test_summary_index_only(self):
+        """Test the headline totals aggregate reads only idx_investment_valuation"""
+        plan = self.explain(mysql_service._PORTFOLIO_SUMMARY_QUERY, (date.today(), date.today()))
+        
+        self.assertEqual(plan['key'], 'idx_investment_valuation')
+        self.assertIn("Using index", plan['Extra'])
+
+
+@unittest.skipUnless(os.getenv('MYSQL_TEST_DATABASE'), "set MYSQL_TEST_DATABASE to check the summary query on a MySQL server")
+class TestPortfolioSummaryQuery(unittest.TestCase):
+    """Test the SQL headline totals match the NumPy valuation to the paise"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.service = InvestmentService(
+            host=os.getenv('MYSQL_HOST', 'localhost'),
+            port=int(os.getenv('MYSQL_PORT', '3306')),
+            user=os.getenv('MYSQL_USER', 'root'),
+            password=os.getenv('MYSQL_PASSWORD', 'password'),
+            database=os.getenv('MYSQL_TEST_DATABASE')
+        )
+        with cls.service.pool.connection() as connection:
+            migrations.migrate(connection)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.close()
+        close_connection_pools()
+    
+    def setUp(self):
+        # Large and long-held positions, where rounding the years shows up in rupees
+        created = [
+            self.service.create_investment(9876543210.99, '1995-03-17', 14.75),
+            self.service.create_investment(250000000.00, '2001-11-30', 12.5),
+            self.service.create_investment(1234567.89, '2019-07-04', 7.25),
+            self.service.create_investment(500000.00, (date.today() + timedelta(days=30)).isoformat(), 9.0),
+        ]
+        for investment in created:
+            self.addCleanup(self.service.delete_investment, investment['investment_id'])
+    
+    def test_summary_matches_view(self):
+        """Test the aggregate query and PortfolioSummary.from_view agree for the same rows"""
+        as_of = date.today()
+        _invalidate_valuation_cache()
+        from_sql = self.service.get_portfolio_summary(as_of=as_of)
+        from_view = PortfolioSummary.from_view(self.service.get_portfolio_view(as_of=as_of))
+        
+        self.assertEqual(to_paise(from_sql.total_current_value), to_paise(from_view.total_current_value))
+        self.assertEqual(to_paise(from_sql.total_invested), to_paise(from_view.total_invested))
+        self.assertEqual(from_sql.count, from_view.count)
+
+
+class TestPartitions(unittest.TestCase):
+    """Test yearly partition maintenance and partition-prunable date filters"""
+    
+    def setUp(self):
+        self.connection = Mock()
+        self.cursor = Mock()
+        self.connection.cursor.return_value = self.cursor
+    
+    def altered(self):
+        return [call.args[0] for call in self.cursor.execute.call_args_list if call.args[0].startswith("ALTER")]
+    
+    def test_unpartitioned_table_untouched(self):
+        """Test a plain table gets no partition DDL"""
+        self.cursor.fetchall.return_value = []
+        
+        self.assertEqual(migrations.maintain_partitions(self.connection), [])
+        self.assertEqual(self.altered(), [])
+    
+    def test_splits_upcoming_years_off_catch_all(self):
+        """Test missing years up to years_ahead are split off the MAXVALUE partition"""
+        self.cursor.fetchall.return_value = [('p_past', '2020'), ('p2020', '2021'), ('p2021', '2022'),
+                                             ('p_future', 'MAXVALUE')]
+        
+        added = migrations.maintain_partitions(self.connection, years_ahead=1, today=date(2022, 6, 1))
+        
+        self.assertEqual(added, ['p2022', 'p2023'])
+        self.assertEqual(self.altered()[0], (
+            "ALTER TABLE investment REORGANIZE PARTITION p_future INTO "
+            "(PARTITION p2022 VALUES LESS THAN (2023), PARTITION p_future VALUES LESS THAN MAXVALUE)"
+        ))
+    
+    def test_up_to_date_adds_nothing(self):
+        """Test a table already partitioned far enough ahead is left alone"""
+        self.cursor.fetchall.return_value = [('p2024', '2025'), ('p2025', '2026')]
+        
+        self.assertEqual(migrations.maintain_partitions(self.connection, years_ahead=1, today=date(2024, 1, 1)), [])
+        self.assertEqual(self.altered(), [])
+    
+    def test_partition_clause(self):
+        """Test the clause has catch-all partitions around one partition per year"""
+        clause = migrations.partition_clause(2023, 2024)
+        
+        self.assertTrue(clause.startswith("PARTITION BY RANGE (YEAR(investment_date))"))
+        self.assertIn("PARTITION p_past VALUES LESS THAN (2023)", clause)
+        self.assertIn("PARTITION p2024 VALUES LESS THAN (2025)", clause)
+        self.assertIn("PARTITION p_future VALUES LESS THAN MAXVALUE", clause)
+    
+    def test_date_range_filters_bare_column(self):
+        """Test the date-range read compares the bare column so partitions can be pruned"""
+        service = InvestmentService.__new__(InvestmentService)
+        service.pool = mock_pool(self.cursor)
+        service.replicas = ReplicaRouter(service.pool, [])
+        self.cursor.fetchall.return_value = [('a' * 36, 1000, date(2024, 3, 1), 10)]
+        
+        records = service.read_investments_between(date(2024, 1, 1), date(2025, 1, 1), projection='valuation')
+        
+        query, params = self.cursor.execute.call_args.args
+        self.assertIn("WHERE investment_date >= %s AND investment_date < %s", query)
+        self.assertNotIn("YEAR(", query)
+        self.assertEqual(params, (date(2024, 1, 1), date(2025, 1, 1)))
+        self.assertEqual(records, [Investment('a' * 36, 1000.0, date(2024, 3, 1), 10.0)])
+
+
+class TestPortfolioSummary(unittest.TestCase):
+    """Test the database-side headline totals"""
+    
+    def setUp(self):
+        _invalidate_valuation_cache()
+        self.service = InvestmentService.__new__(InvestmentService)
+        self.cursor = Mock()
+        self.service.pool = mock_pool(self.cursor)
+        self.service.replicas = ReplicaRouter(self.service.pool, [])
+    
+    def test_single_aggregate_query(self):
+        """Test totals come from one row of paise sums"""
+        self.cursor.fetchone.return_value = (2, 200000, 210050.0)
+        
+        summary = self.service.get_portfolio_summary(as_of=date(2024, 1, 1))
+        
+        self.assertEqual(self.cursor.execute.call_count, 1)
+        self.assertEqual(self.cursor.execute.call_args.args[1], (date(2024, 1, 1), date(2024, 1, 1)))
+        self.assertEqual(summary.count, 2)
+        self.assertEqual(summary.total_invested, 2000.0)
+        self.assertEqual(summary.total_current_value, 2100.5)
+        self.assertEqual(summary.total_profit_loss, 100.5)
+        self.assertAlmostEqual(summary.total_return_percentage, 5.03, places=2)
+    
+    def test_empty_portfolio(self):
+        """Test an empty table gives zero totals"""
+        self.cursor.fetchone.return_value = (0, 0, 0)
+        
+        summary = self.service.get_portfolio_summary()
+        
+        self.assertEqual(summary.count, 0)
+        self.assertEqual(summary.total_invested, 0.0)
+        self.assertEqual(summary.total_return_percentage, 0)
+    
+    def test_reuses_cached_view(self):
+        """Test a cached valuation answers without querying"""
+        self.service.read_investment_columns = Mock(return_value=investment_columns([
+            Investment('a' * 36, 1000.0, date(2023, 1, 1), 10.0),
+            Investment('b' * 36, 500.25, date(2023, 6, 1), 8.0)
+        ]))
+        portfolio = self.service.get_portfolio_view(as_of=date(2024, 1, 1))
+        
+        summary = self.service.get_portfolio_summary(as_of=date(2024, 1, 1))
+        
+        self.cursor.execute.assert_not_called()
+        self.assertEqual(summary, PortfolioSummary.from_view(portfolio))
+        self.assertEqual(summary.count, 2)
+
+
+class TestPortfolioGrowth(unittest.TestCase):
+    """Test the historical growth engine"""
+    
+    def setUp(self):
+        self.as_of = date(2024, 12, 14)
+        self.investments = [
+            Investment('a' * 36, 1000.0, date(2022, 3, 1), 10.0),
+            Investment('b' * 36, 2500.0, date(2023, 7, 15), 10.0),
+            Investment('c' * 36, 500.0, date(2024, 1, 1), -4.5),
+            Investment('d' * 36, 800.0, date(2025, 6, 1), 8.0),
+        ]
+    
+    def test_matches_valuation_on_every_day(self):
+        """Test each day's value matches valuing the holdings held on that day"""
+        growth = calculate_portfolio_growth(self.investments, as_of=self.as_of)
+        
+        self.assertEqual(growth['date'].iloc[0], datetime(2022, 3, 1))
+        self.assertEqual(growth['date'].iloc[-1], datetime(2024, 12, 14))
+        self.assertEqual(len(growth), (self.as_of - date(2022, 3, 1)).days + 1)
+        
+        for day in growth.itertuples():
+            held = [inv for inv in self.investments if inv.investment_date <= day.date.date()]
+            current_values, _, _ = calculate_portfolio_values(
+                [inv.investment_amount for inv in held],
+                [inv.annual_return_percentage for inv in held],
+                [inv.investment_date for inv in held],
+                as_of=day.date.date()
+            )
+            self.assertAlmostEqual(day.current_value, current_values.sum(), delta=0.02)
+            self.assertAlmostEqual(day.invested, sum(inv.investment_amount for inv in held))
+    
+    def test_future_and_empty(self):
+        """Test future investments are left out and an empty portfolio gives no rows"""
+        growth = calculate_portfolio_growth(self.investments, as_of=self.as_of)
+        self.assertEqual(growth['invested'].iloc[-1], 4000)
+        self.assertAlmostEqual(
+            growth['profit_loss'].iloc[-1],
+            growth['current_value'].iloc[-1] - growth['invested'].iloc[-1],
+            delta=0.01
+        )
+        
+        self.assertTrue(calculate_portfolio_growth([], as_of=self.as_of).empty)
+
+
+class TestXirr(unittest.TestCase):
+    """Test the batched XIRR solver"""
+    
+    def test_known_cash_flows(self):
+        """Test a standard XIRR example and a batch with an unsolvable row"""
+        dates = [date(2008, 1, 1), date(2008, 3, 1), date(2008, 10, 30), date(2009, 2, 15), date(2009, 4, 1)]
+        years = [(d - dates[0]).days / 365 for d in dates]
+        
+        rates = solve_xirr(
+            [[-10000, 2750, 4250, 3250, 2750], [-1000, 1100, 0, 0, 0], [-1000, -100, 0, 0, 0]],
+            [years, [0, 1, 0, 0, 0], years]
+        )
+        
+        self.assertAlmostEqual(rates[0], 0.373362535, places=6)
+        self.assertAlmostEqual(rates[1], 0.10, places=9)
+        self.assertTrue(math.isnan(rates[2]))
+    
+    def test_portfolio_and_positions(self):
+        """Test position XIRR follows the annual return and undefined positions are NaN"""
+        as_of = date(2024, 12, 14)
+        portfolio = build_portfolio_view([
+            Investment('a' * 36, 1000.0, date(2020, 12, 14), 10.0),
+            Investment('b' * 36, 4000.0, date(2023, 12, 14), 10.0),
+            Investment('c' * 36, 500.0, as_of, 8.0),
+            Investment('d' * 36, 800.0, date(2025, 6, 1), 8.0),
+        ], as_of=as_of)
+        
+        portfolio_xirr, position_xirrs = calculate_portfolio_xirr(portfolio)
+        
+        self.assertAlmostEqual(position_xirrs[0], 10.0, delta=0.01)
+        self.assertAlmostEqual(position_xirrs[1], 10.0, delta=0.01)
+        self.assertTrue(math.isnan(position_xirrs[2]))
+        self.assertTrue(math.isnan(position_xirrs[3]))
+        # Same rate everywhere, so the money-weighted return matches it
+        self.assertAlmostEqual(portfolio_xirr, 10.0, delta=0.05)
+
+
+class TestMonteCarloProjection(unittest.TestCase):
+    """Test the Monte Carlo projection engine"""
+    
+    def setUp(self):
+        self.portfolio = build_portfolio_view([
+            Investment('a' * 36, 1000.0, date(2022, 3, 1), 10.0),
+            Investment('b' * 36, 2500.0, date(2023, 7, 15), 10.0),
+            Investment('c' * 36, 500.0, date(2024, 1, 1), 6.0),
+        ], as_of=date(2024, 12, 14))
+    
+    def test_zero_volatility_matches_compounding(self):
+        """Test every band collapses onto deterministic compounding without volatility"""
+        projection = project_portfolio_monte_carlo(self.portfolio, years=5, volatility_percentage=0, n_paths=100)
+        
+        self.assertEqual(list(projection['year']), [0, 1, 2, 3, 4, 5])
+        self.assertAlmostEqual(projection['p50'].iloc[0], self.portfolio.total_current_value, delta=0.01)
+        for column in ['p5', 'p25', 'p50', 'p75', 'p95']:
+            for simulated, expected in zip(projection[column], projection['deterministic']):
+                self.assertAlmostEqual(simulated, expected, delta=0.01)
+    
+    def test_bands_ordered_and_cached(self):
+        """Test percentile bands are ordered and repeat runs come from the cache"""
+        portfolio_analytics._projection_cache.clear()
+        projection = project_portfolio_monte_carlo(self.portfolio, years=10, n_paths=2000, workers=1)
+        
+        final_year = projection.iloc[-1]
+        self.assertLess(final_year['p5'], final_year['p25'])
+        self.assertLess(final_year['p25'], final_year['p50'])
+        self.assertLess(final_year['p50'], final_year['p75'])
+        self.assertLess(final_year['p75'], final_year['p95'])
+        self.assertEqual(len(portfolio_analytics._projection_cache), 1)
+        
+        repeat = project_portfolio_monte_carlo(self.portfolio, years=10, n_paths=2000, workers=1)
+        self.assertTrue(repeat.equals(projection))
+        self.assertEqual(len(portfolio_analytics._projection_cache), 1)
+    
+    @patch('portfolio_analytics._PROJECTION_POOL_MIN_CELLS', 0)
+    @patch('portfolio_analytics._PROJECTION_BATCH_CELLS', 10_000)
+    def test_shared_spawned_pool(self):
+        """Test large runs reuse one spawn-context pool and match an in-process run"""
+        self.addCleanup(portfolio_analytics._shutdown_projection_pool)
+        portfolio_analytics._projection_cache.clear()
+        in_process = project_portfolio_monte_carlo(self.portfolio, years=10, n_paths=2000, workers=1)
+        
+        portfolio_analytics._projection_cache.clear()
+        pooled = project_portfolio_monte_carlo(self.portfolio, years=10, n_paths=2000, workers=2)
+        pool = portfolio_analytics._projection_executor
+        portfolio_analytics._projection_cache.clear()
+        project_portfolio_monte_carlo(self.portfolio, years=10, n_paths=2000, workers=2)
+        
+        self.assertTrue(pooled.equals(in_process))
+        self.assertIs(portfolio_analytics._projection_executor, pool)
+        self.assertEqual(pool._mp_context.get_start_method(), "spawn")
+
+
 class TestDataTypes(unittest.TestCase):
     """Test data type handling"""
     
@@ -12,7 +12,8 @@ from oracle_service import (
     InvestmentService, 
     calculate_current_value, 
     calculate_profit_loss,
-    calculate_return_percentage
+    calculate_return_percentage,
+    build_portfolio_view
 )
 
 # Configure logging
@@ -71,6 +72,53 @@ if 'service' not in st.session_state:
 if 'refresh_key' not in st.session_state:
     st.session_state.refresh_key = 0
 
+
+# Investments per page on the View All, Update and Delete pages
+INVESTMENTS_PAGE_SIZE = 25
+
+
+def show_investments_page(key: str, projection: str = 'full'):
+    """
+    Fetch the current page of investments and draw Previous/Next controls
+    
+    Pages are read with keyset pagination; the session keeps the (date, id)
+    each visited page starts after, so only one page is ever loaded.
+    
+    Args:
+        key: Session-state key holding this view's page cursors
+        projection: Columns to fetch - 'summary', 'valuation' or 'full'
+        
+    Returns:
+        Tuple of (records on the current page, number of records on earlier pages)
+    """
+    cursors = st.session_state.setdefault(key, [None])
+    # One extra row tells whether there is a next page
+    records = st.session_state.service.read_investments_page(
+        after=cursors[-1], limit=INVESTMENTS_PAGE_SIZE + 1, projection=projection
+    )
+    has_next = len(records) > INVESTMENTS_PAGE_SIZE
+    records = records[:INVESTMENTS_PAGE_SIZE]
+    
+    if not records and len(cursors) > 1:
+        # Everything on this page was deleted; go back one
+        cursors.pop()
+        st.rerun()
+    
+    if len(cursors) > 1 or has_next:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("◀ Previous", key=f"{key}_previous", disabled=len(cursors) == 1, use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            st.caption(f"Page {len(cursors)}")
+        with col3:
+            if st.button("Next ▶", key=f"{key}_next", disabled=not has_next, use_container_width=True):
+                cursors.append((records[-1].investment_date, records[-1].investment_id))
+                st.rerun()
+    
+    return records, (len(cursors) - 1) * INVESTMENTS_PAGE_SIZE
+
 # Main title
 st.title("💼 Investment Dashboard - Oracle")
 st.markdown("---")
@@ -97,27 +145,16 @@ if selected == "📊 Dashboard":
     st.header("Dashboard Overview")
     
     try:
-        investments = st.session_state.service.read_all_investments()
+        # Headline totals come from one aggregate query; the full valuation is
+        # only loaded for the table below
+        summary = st.session_state.service.get_portfolio_summary()
         
-        if not investments:
+        if summary.count == 0:
             st.info("📭 No investments found. Create one to get started!")
         else:
-            # Calculate metrics
-            total_invested = 0
-            total_current_value = 0
-            total_profit_loss = 0
-            
-            for inv in investments:
-                amount = inv['investment_amount']
-                annual_return = inv['annual_return_percentage']
-                inv_date = inv['investment_date']
-                
-                total_invested += amount
-                
-                if inv_date:
-                    current_val = calculate_current_value(amount, annual_return, inv_date)
-                    total_current_value += current_val
-                    total_profit_loss += calculate_profit_loss(current_val, amount)
+            total_invested = summary.total_invested
+            total_current_value = summary.total_current_value
+            total_profit_loss = summary.total_profit_loss
             
             # Display key metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -137,7 +174,7 @@ if selected == "📊 Dashboard":
                 )
             
             with col3:
-                overall_return = calculate_return_percentage(total_current_value, total_invested)
+                overall_return = summary.total_return_percentage
                 st.metric(
                     label="Overall Return %",
                     value=f"{overall_return:.2f}%",
@@ -147,7 +184,7 @@ if selected == "📊 Dashboard":
             with col4:
                 st.metric(
                     label="Total Investments",
-                    value=len(investments),
+                    value=summary.count,
                     delta=None
                 )
             
@@ -156,29 +193,30 @@ if selected == "📊 Dashboard":
             # Display investments table
             st.subheader("All Investments")
             
-            # Prepare data for display
-            display_data = []
-            for inv in investments:
-                amount = inv['investment_amount']
-                annual_return = inv['annual_return_percentage']
-                inv_date = inv['investment_date']
-                
-                current_val = calculate_current_value(amount, annual_return, inv_date)
-                profit_loss = calculate_profit_loss(current_val, amount)
-                return_pct = calculate_return_percentage(current_val, amount)
-                
-                display_data.append({
-                    'Investment ID': inv['investment_id'][:8] + '...',
-                    'Amount': f"₹{amount:,.2f}",
-                    'Date': inv_date,
-                    'Annual Return %': f"{annual_return:.2f}%",
-                    'Current Value': f"₹{current_val:,.2f}",
-                    'Profit/Loss': f"₹{profit_loss:,.2f}",
-                    'Return %': f"{return_pct:.2f}%"
-                })
-            
-            df = pd.DataFrame(display_data)
-            st.dataframe(df, use_container_width=True)
+            # Keep the columns numeric and let column_config format them, so
+            # sorting is by value and no per-cell strings are built
+            rows = st.session_state.service.get_portfolio_view().rows
+            df = pd.DataFrame({
+                'Investment ID': [row.investment_id[:8] + '...' for row in rows],
+                'Amount': [row.investment_amount for row in rows],
+                'Date': pd.to_datetime([row.investment_date for row in rows]),
+                'Annual Return %': [row.annual_return_percentage for row in rows],
+                'Current Value': [row.current_value for row in rows],
+                'Profit/Loss': [row.profit_loss for row in rows],
+                'Return %': [row.return_percentage for row in rows]
+            })
+            st.dataframe(
+                df,
+                use_container_width=True,
+                column_config={
+                    'Amount': st.column_config.NumberColumn("Amount (₹)", format="localized"),
+                    'Date': st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+                    'Annual Return %': st.column_config.NumberColumn(format="%.2f%%"),
+                    'Current Value': st.column_config.NumberColumn("Current Value (₹)", format="localized"),
+                    'Profit/Loss': st.column_config.NumberColumn("Profit/Loss (₹)", format="localized"),
+                    'Return %': st.column_config.NumberColumn(format="%.2f%%")
+                }
+            )
             
     except Exception as e:
         st.error(f"❌ Error loading dashboard: {str(e)}")
@@ -261,26 +299,26 @@ elif selected == "👁️ View All":
     st.header("All Investments")
     
     try:
-        investments = st.session_state.service.read_all_investments()
+        records, offset = show_investments_page("view_all_cursors")
+        portfolio = build_portfolio_view(records)
         
-        if not investments:
+        if not portfolio.rows:
             st.info("📭 No investments found. Create one to get started!")
         else:
             # Display investments
-            for idx, inv in enumerate(investments, 1):
+            for idx, row in enumerate(portfolio.rows, offset + 1):
                 with st.expander(
-                    f"📈 Investment #{idx} - {inv['investment_date']}", 
+                    f"📈 Investment #{idx} - {row.investment_date}", 
                     expanded=False
                 ):
                     col1, col2, col3 = st.columns(3)
                     
-                    amount = inv['investment_amount']
-                    annual_return = inv['annual_return_percentage']
-                    inv_date = inv['investment_date']
-                    
-                    current_val = calculate_current_value(amount, annual_return, inv_date)
-                    profit_loss = calculate_profit_loss(current_val, amount)
-                    return_pct = calculate_return_percentage(current_val, amount)
+                    amount = row.investment_amount
+                    annual_return = row.annual_return_percentage
+                    inv_date = row.investment_date
+                    current_val = row.current_value
+                    profit_loss = row.profit_loss
+                    return_pct = row.return_percentage
                     
                     with col1:
                         st.metric("Investment Amount", f"₹{amount:,.2f}")
@@ -295,9 +333,9 @@ elif selected == "👁️ View All":
                     with col2:
                         st.metric("Return %", f"{return_pct:.2f}%")
                     with col3:
-                        st.metric("Investment Date", inv_date)
+                        st.metric("Investment Date", str(inv_date))
                     
-                    st.info(f"**ID:** `{inv['investment_id']}`")
+                    st.info(f"**ID:** `{row.investment_id}`")
             
     except Exception as e:
         st.error(f"❌ Error loading investments: {str(e)}")
@@ -308,16 +346,15 @@ elif selected == "✏️ Update":
     st.header("Update Investment")
     
     try:
-        investments = st.session_state.service.read_all_investments()
+        records, _ = show_investments_page("update_cursors", projection='summary')
         
-        if not investments:
+        if not records:
             st.info("📭 No investments found to update!")
         else:
             # Create selection options
             investment_options = {
-                f"{inv['investment_date']} - ₹{inv['investment_amount']:,.2f}": 
-                inv['investment_id'] 
-                for inv in investments
+                f"{row.investment_date} - ₹{row.investment_amount:,.2f}": row.investment_id
+                for row in records
             }
             
             selected_display = st.selectbox(
@@ -328,7 +365,7 @@ elif selected == "✏️ Update":
             
             if selected_display:
                 selected_id = investment_options[selected_display]
-                selected_investment = st.session_state.service.read_investment(selected_id)
+                selected_investment = st.session_state.service.read_investment(selected_id, projection='valuation')
                 
                 if selected_investment:
                     st.info(f"Selected Investment ID: `{selected_id}`")
@@ -411,9 +448,9 @@ elif selected == "🗑️ Delete":
     st.header("Delete Investment")
     
     try:
-        investments = st.session_state.service.read_all_investments()
+        records, _ = show_investments_page("delete_cursors", projection='summary')
         
-        if not investments:
+        if not records:
             st.info("📭 No investments found to delete!")
         else:
             col1, col2 = st.columns([3, 1])
@@ -421,9 +458,8 @@ elif selected == "🗑️ Delete":
             with col1:
                 # Create selection options
                 investment_options = {
-                    f"{inv['investment_date']} - ₹{inv['investment_amount']:,.2f}": 
-                    inv['investment_id'] 
-                    for inv in investments
+                    f"{row.investment_date} - ₹{row.investment_amount:,.2f}": row.investment_id
+                    for row in records
                 }
                 
                 selected_display = st.selectbox(
@@ -434,7 +470,7 @@ elif selected == "🗑️ Delete":
             
             if selected_display:
                 selected_id = investment_options[selected_display]
-                selected_investment = st.session_state.service.read_investment(selected_id)
+                selected_investment = st.session_state.service.read_investment(selected_id, projection='valuation')
                 
                 if selected_investment:
                     st.warning(f"⚠️ You are about to delete investment: `{selected_id}`")
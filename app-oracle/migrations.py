@@ -0,0 +1,190 @@
+"""
+Versioned schema migrations for the Investment Dashboard - Oracle Edition
+
+Each migration is applied once and recorded in the schema_migrations table, so
+the service never queries the data dictionary or runs DDL when it connects.
+Apply pending migrations at deploy time:
+
+    python migrations.py            # apply everything pending
+    python migrations.py status     # list applied and pending versions
+"""
+import argparse
+import logging
+import os
+import sys
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+import cx_Oracle
+
+from oracle_service import InvestmentService
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    """One schema change, recorded under its version once all statements succeed"""
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+# Append new migrations; never edit or renumber one that has shipped
+MIGRATIONS = [
+    Migration(1, "Create Investment table", (
+        """
+        CREATE TABLE Investment (
+            investment_id VARCHAR2(36) PRIMARY KEY,
+            investment_amount NUMBER(15, 2) NOT NULL,
+            investment_date VARCHAR2(10) NOT NULL,
+            annual_return_percentage NUMBER(5, 2) NOT NULL,
+            created_at TIMESTAMP DEFAULT SYSDATE,
+            updated_at TIMESTAMP DEFAULT SYSDATE
+        )
+        """,
+    )),
+    Migration(2, "Add keyset pagination index", (
+        """
+        CREATE INDEX idx_investment_date_id
+        ON Investment (investment_date DESC, investment_id)
+        """,
+    )),
+]
+
+# Oracle has no IF NOT EXISTS for these statements, so "already exists" errors
+# mean the change is in place, as on databases set up by setup_oracle.py or by
+# the service before migrations existed: ORA-00955 (name already used by an
+# existing object) and ORA-01408 (such column list already indexed)
+_ALREADY_APPLIED_ERRORS = {955, 1408}
+
+
+def _error_code(error: cx_Oracle.DatabaseError) -> Optional[int]:
+    """Get the ORA- error number from a cx_Oracle error"""
+    return getattr(error.args[0], 'code', None)
+
+
+def ensure_migrations_table(connection):
+    """
+    Create the schema_migrations bookkeeping table if it doesn't exist
+    
+    Args:
+        connection: Open cx_Oracle connection
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE schema_migrations (
+                version NUMBER(10) PRIMARY KEY,
+                description VARCHAR2(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+            )
+        """)
+    except cx_Oracle.DatabaseError as e:
+        if _error_code(e) not in _ALREADY_APPLIED_ERRORS:
+            raise
+    finally:
+        cursor.close()
+
+
+def applied_versions(connection) -> Set[int]:
+    """
+    Get the versions already recorded in schema_migrations
+    
+    Args:
+        connection: Open cx_Oracle connection
+    
+    Returns:
+        Set of applied migration versions
+    """
+    ensure_migrations_table(connection)
+    cursor = connection.cursor()
+    cursor.execute("SELECT version FROM schema_migrations")
+    versions = {int(row[0]) for row in cursor.fetchall()}
+    cursor.close()
+    return versions
+
+
+def pending_migrations(connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Get the migrations not yet applied, in version order
+    
+    Args:
+        connection: Open cx_Oracle connection
+        target: Highest version to include (defaults to the latest)
+    
+    Returns:
+        List of pending migrations
+    """
+    applied = applied_versions(connection)
+    return [
+        migration for migration in sorted(MIGRATIONS)
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def migrate(connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations in order, recording each as it completes
+    
+    Args:
+        connection: Open cx_Oracle connection
+        target: Highest version to apply (defaults to the latest)
+    
+    Returns:
+        List of migrations applied by this call
+    """
+    pending = pending_migrations(connection, target)
+    cursor = connection.cursor()
+    try:
+        for migration in pending:
+            logger.info(f"Applying migration {migration.version}: {migration.description}")
+            for statement in migration.statements:
+                try:
+                    cursor.execute(statement)
+                except cx_Oracle.DatabaseError as e:
+                    if _error_code(e) not in _ALREADY_APPLIED_ERRORS:
+                        raise
+                    logger.info(f"Migration {migration.version} already in place: {e}")
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (:1, :2)",
+                [migration.version, migration.description]
+            )
+            connection.commit()
+    except cx_Oracle.DatabaseError as e:
+        logger.error(f"Error applying migrations: {e}")
+        raise
+    finally:
+        cursor.close()
+    return pending
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; connects with the same environment variables as the app"""
+    parser = argparse.ArgumentParser(description="Apply Investment Dashboard schema migrations")
+    parser.add_argument("command", nargs="?", choices=["migrate", "status"], default="migrate")
+    parser.add_argument("--target", type=int, help="highest migration version to apply")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
+    service = InvestmentService(
+        db_user=os.getenv('ORACLE_USER', 'system'),
+        db_password=os.getenv('ORACLE_PASSWORD', 'oracle'),
+        db_host=os.getenv('ORACLE_HOST', 'localhost'),
+        db_port=int(os.getenv('ORACLE_PORT', '1521')),
+        db_service=os.getenv('ORACLE_SERVICE', 'XEPDB1')
+    )
+    try:
+        if args.command == "status":
+            applied = applied_versions(service.connection)
+            for migration in sorted(MIGRATIONS):
+                state = "applied" if migration.version in applied else "pending"
+                print(f"{migration.version:>4}  {state:<8} {migration.description}")
+        else:
+            applied = migrate(service.connection, args.target)
+            print(f"✅ Applied {len(applied)} migration(s)" if applied else "✅ Schema is up to date")
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
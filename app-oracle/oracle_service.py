@@ -1,14 +1,117 @@
 """
 Oracle Database service module for Investment table operations
+
+The schema is managed by migrations.py, which is run at deploy time.
 """
 import cx_Oracle
 import uuid
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, date
+from typing import Callable, List, Dict, Optional, NamedTuple, Tuple, Union
+from dataclasses import dataclass
+import numpy as np
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Process-wide valuation cache keyed on (as-of date, data version). Writes from
+# this process bump the version; entries also expire after _VALUATION_CACHE_TTL
+# seconds so writes from other app instances and direct loads show up too.
+_valuation_cache = {}
+_valuation_cache_lock = threading.Lock()
+_data_version = 0
+_VALUATION_CACHE_SIZE = 16
+_VALUATION_CACHE_TTL = 30.0
+
+# Columns fetched by each read projection: 'summary' for pickers and labels,
+# 'valuation' for everything the calculations need, 'full' for the whole row
+_PROJECTIONS = {
+    'summary': ('investment_id', 'investment_amount', 'investment_date'),
+    'valuation': ('investment_id', 'investment_amount', 'investment_date', 'annual_return_percentage'),
+    'full': ('investment_id', 'investment_amount', 'investment_date', 'annual_return_percentage',
+             'created_at', 'updated_at'),
+}
+
+
+def _projection_columns(projection: str) -> Tuple[str, ...]:
+    """
+    Look up the columns of a read projection
+    
+    Args:
+        projection: One of 'summary', 'valuation' or 'full'
+        
+    Returns:
+        Column names in select order
+    """
+    try:
+        return _PROJECTIONS[projection]
+    except KeyError:
+        raise ValueError(f"Unknown projection {projection!r}; expected one of {', '.join(_PROJECTIONS)}") from None
+
+
+def _investment_dict(columns: Tuple[str, ...], row: tuple) -> Dict:
+    """
+    Convert a projected investment row into a record dict
+    
+    Args:
+        columns: Projected column names, in select order
+        row: Row tuple from the cursor
+        
+    Returns:
+        Investment record with float amounts and string timestamps
+    """
+    record = dict(zip(columns, row))
+    record['investment_amount'] = float(record['investment_amount'])
+    if 'annual_return_percentage' in record:
+        record['annual_return_percentage'] = float(record['annual_return_percentage'])
+    for column in ('created_at', 'updated_at'):
+        if column in record:
+            record[column] = str(record[column])
+    return record
+
+
+def _invalidate_valuation_cache():
+    """Bump the data version and drop cached valuations after a write"""
+    global _data_version
+    with _valuation_cache_lock:
+        _data_version += 1
+        _valuation_cache.clear()
+
+
+def _cached_valuation(as_of: date, build: Optional[Callable[[], 'PortfolioView']] = None) -> Optional['PortfolioView']:
+    """
+    Look up the cached valuation for a date, building and caching it on a miss
+    
+    Args:
+        as_of: Valuation date
+        build: Builds the valuation on a miss (optional; without it a miss returns None)
+        
+    Returns:
+        The cached or newly built PortfolioView, or None on a miss without build
+    """
+    started = time.monotonic()
+    with _valuation_cache_lock:
+        key = (as_of, _data_version)
+        entry = _valuation_cache.get(key)
+    if entry is not None and started - entry[1] < _VALUATION_CACHE_TTL:
+        return entry[0]
+    if build is None:
+        return None
+    
+    portfolio = build()
+    
+    with _valuation_cache_lock:
+        # Skip caching if a write bumped the version while records were read
+        if key[1] == _data_version:
+            _valuation_cache.pop(key, None)
+            if len(_valuation_cache) >= _VALUATION_CACHE_SIZE:
+                _valuation_cache.pop(next(iter(_valuation_cache)))
+            # Aged from when the read started, so the TTL bounds how stale the data is
+            _valuation_cache[key] = (portfolio, started)
+    return portfolio
+
+
 class InvestmentService:
     def __init__(self, db_user: str, db_password: str, db_host: str, 
                  db_port: int = 1521, db_service: str = "XEPDB1"):
@@ -33,44 +136,12 @@ class InvestmentService:
             )
             self.connection.autocommit = True
             self.cursor = self.connection.cursor()
-            
-            # Initialize table
-            self._create_table()
             logger.info("Oracle database connection established")
             
         except cx_Oracle.DatabaseError as e:
             logger.error(f"Oracle connection error: {e}")
             raise
     
-    def _create_table(self):
-        """Create investment table if it doesn't exist"""
-        try:
-            # Check if table exists
-            self.cursor.execute("""
-                SELECT COUNT(*) FROM user_tables 
-                WHERE table_name = 'INVESTMENT'
-            """)
-            
-            if self.cursor.fetchone()[0] == 0:
-                # Create table if it doesn't exist
-                self.cursor.execute("""
-                    CREATE TABLE Investment (
-                        investment_id VARCHAR2(36) PRIMARY KEY,
-                        investment_amount NUMBER(15, 2) NOT NULL,
-                        investment_date VARCHAR2(10) NOT NULL,
-                        annual_return_percentage NUMBER(5, 2) NOT NULL,
-                        created_at TIMESTAMP DEFAULT SYSDATE,
-                        updated_at TIMESTAMP DEFAULT SYSDATE
-                    )
-                """)
-                logger.info("Investment table created successfully")
-            else:
-                logger.info("Investment table already exists")
-                
-        except cx_Oracle.DatabaseError as e:
-            logger.error(f"Error creating table: {e}")
-            raise
-    
     def create_investment(self, investment_amount: float, investment_date: str, 
                          annual_return_percentage: float) -> Dict:
         """
@@ -96,6 +167,7 @@ class InvestmentService:
                   float(annual_return_percentage)])
             
             self.connection.commit()
+            _invalidate_valuation_cache()
             
             return {
                 'investment_id': investment_id,
@@ -111,20 +183,21 @@ class InvestmentService:
             self.connection.rollback()
             raise
     
-    def read_investment(self, investment_id: str) -> Optional[Dict]:
+    def read_investment(self, investment_id: str, projection: str = 'full') -> Optional[Dict]:
         """
         Read a specific investment record
         
         Args:
             investment_id: Investment ID to retrieve
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'
             
         Returns:
-            Investment record or None if not found
+            Investment record with the projection's columns, or None if not found
         """
+        columns = _projection_columns(projection)
         try:
-            self.cursor.execute("""
-                SELECT investment_id, investment_amount, investment_date,
-                       annual_return_percentage, created_at, updated_at
+            self.cursor.execute(f"""
+                SELECT {", ".join(columns)}
                 FROM Investment
                 WHERE investment_id = :1
             """, [investment_id])
@@ -132,54 +205,168 @@ class InvestmentService:
             row = self.cursor.fetchone()
             
             if row:
-                return {
-                    'investment_id': row[0],
-                    'investment_amount': float(row[1]),
-                    'investment_date': row[2],
-                    'annual_return_percentage': float(row[3]),
-                    'created_at': str(row[4]),
-                    'updated_at': str(row[5])
-                }
+                return _investment_dict(columns, row)
             return None
             
         except cx_Oracle.DatabaseError as e:
             logger.error(f"Error reading investment: {e}")
             raise
     
-    def read_all_investments(self) -> List[Dict]:
+    def read_all_investments(self, projection: str = 'full') -> List[Dict]:
         """
         Read all investment records
         
+        Args:
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'
+            
+        Returns:
+            List of all investment records with the projection's columns
+        """
+        columns = _projection_columns(projection)
+        try:
+            self.cursor.execute(f"""
+                SELECT {", ".join(columns)}
+                FROM Investment
+                ORDER BY investment_date DESC
+            """)
+            
+            return [_investment_dict(columns, row) for row in self.cursor.fetchall()]
+            
+        except cx_Oracle.DatabaseError as e:
+            logger.error(f"Error reading all investments: {e}")
+            raise
+    
+    def read_all_investment_records(self) -> List['Investment']:
+        """
+        Read all investment records as typed Investment records
+        
         Returns:
-            List of all investment records
+            List of Investment records, newest investment date first
         """
         try:
             self.cursor.execute("""
                 SELECT investment_id, investment_amount, investment_date,
-                       annual_return_percentage, created_at, updated_at
+                       annual_return_percentage
                 FROM Investment
                 ORDER BY investment_date DESC
             """)
             
-            rows = self.cursor.fetchall()
-            investments = []
+            return [
+                Investment(row[0], float(row[1]), date.fromisoformat(row[2]), float(row[3]))
+                for row in self.cursor.fetchall()
+            ]
+            
+        except cx_Oracle.DatabaseError as e:
+            logger.error(f"Error reading investment records: {e}")
+            raise
+    
+    def read_investments_page(self, after: Optional[Tuple[date, str]] = None, limit: int = 50,
+                              projection: str = 'full') -> List['Investment']:
+        """
+        Read one page of investment records using keyset pagination
+        
+        Args:
+            after: (investment_date, investment_id) of the last record on the previous page,
+                or None for the first page
+            limit: Maximum number of records to return
+            projection: Columns to fetch - 'summary', 'valuation' or 'full'; record
+                fields outside the projection are None
+            
+        Returns:
+            Up to limit Investment records, newest investment date first, ties by investment_id
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+        
+        columns = [column for column in _projection_columns(projection) if column in Investment._fields]
+        
+        try:
+            if after is None:
+                where_clause = ""
+                params = [limit]
+            else:
+                # investment_date is stored as YYYY-MM-DD text, which sorts like the date
+                after_date = after[0].isoformat() if isinstance(after[0], date) else str(after[0])
+                where_clause = "WHERE investment_date < :1 OR (investment_date = :2 AND investment_id > :3)"
+                params = [after_date, after_date, after[1], limit]
+            
+            self.cursor.execute(f"""
+                SELECT {", ".join(columns)}
+                FROM Investment
+                {where_clause}
+                ORDER BY investment_date DESC, investment_id
+                FETCH FIRST :{len(params)} ROWS ONLY
+            """, params)
             
-            for row in rows:
-                investments.append({
-                    'investment_id': row[0],
-                    'investment_amount': float(row[1]),
-                    'investment_date': row[2],
-                    'annual_return_percentage': float(row[3]),
-                    'created_at': str(row[4]),
-                    'updated_at': str(row[5])
-                })
+            if len(columns) > 3:
+                return [
+                    Investment(row[0], float(row[1]), date.fromisoformat(row[2]), float(row[3]))
+                    for row in self.cursor.fetchall()
+                ]
+            return [
+                Investment(row[0], float(row[1]), date.fromisoformat(row[2]), None)
+                for row in self.cursor.fetchall()
+            ]
             
-            return investments
+        except cx_Oracle.DatabaseError as e:
+            logger.error(f"Error reading investment page: {e}")
+            raise
+    
+    def get_portfolio_summary(self, as_of: Optional[date] = None) -> 'PortfolioSummary':
+        """
+        Get the headline portfolio totals, computed in the database
+        
+        Uses the cached portfolio view when one exists for the date; otherwise one
+        aggregate query returns a single row, whatever the portfolio size.
+        
+        Args:
+            as_of: Valuation date (defaults to today)
             
+        Returns:
+            PortfolioSummary valued as of the given date
+        """
+        as_of = as_of or date.today()
+        portfolio = _cached_valuation(as_of)
+        if portfolio is not None:
+            return PortfolioSummary.from_view(portfolio)
+        
+        try:
+            # Same formula as calculate_portfolio_values_paise: each current value is
+            # rounded to the paise before summing, and future dates keep the principal
+            self.cursor.execute("""
+                SELECT COUNT(*),
+                       NVL(SUM(ROUND(investment_amount * 100)), 0),
+                       NVL(SUM(CASE
+                           WHEN TO_DATE(investment_date, 'YYYY-MM-DD') > :1 THEN ROUND(investment_amount * 100)
+                           ELSE ROUND(
+                               investment_amount * 100
+                               * POWER(1 + annual_return_percentage / 100,
+                                       (:2 - TO_DATE(investment_date, 'YYYY-MM-DD')) / 365.25)
+                           )
+                       END), 0)
+                FROM Investment
+            """, [as_of, as_of])
+            count, invested, current_value = self.cursor.fetchone()
+            return PortfolioSummary.from_paise(int(count), int(invested), int(current_value), as_of=as_of)
         except cx_Oracle.DatabaseError as e:
-            logger.error(f"Error reading all investments: {e}")
+            logger.error(f"Error computing portfolio summary: {e}")
             raise
     
+    def get_portfolio_view(self, as_of: Optional[date] = None) -> 'PortfolioView':
+        """
+        Get the valued portfolio, served from the valuation cache when possible
+        
+        Args:
+            as_of: Valuation date (defaults to today)
+            
+        Returns:
+            PortfolioView valued as of the given date
+        """
+        as_of = as_of or date.today()
+        return _cached_valuation(
+            as_of, lambda: build_portfolio_view(self.read_all_investment_records(), as_of=as_of)
+        )
+    
     def update_investment(self, investment_id: str, investment_amount: Optional[float] = None,
                          investment_date: Optional[str] = None, 
                          annual_return_percentage: Optional[float] = None) -> Optional[Dict]:
@@ -195,11 +382,6 @@ class InvestmentService:
         Returns:
             Updated investment record or None if not found
         """
-        # Check if investment exists
-        existing = self.read_investment(investment_id)
-        if not existing:
-            return None
-        
         try:
             # Build dynamic UPDATE statement
             update_fields = ["updated_at = SYSDATE"]
@@ -219,17 +401,39 @@ class InvestmentService:
             
             params.append(investment_id)
             
+            # Existence check, write and read-back in one round trip
+            returned = [
+                self.cursor.var(cx_Oracle.NUMBER),
+                self.cursor.var(cx_Oracle.STRING),
+                self.cursor.var(cx_Oracle.NUMBER),
+                self.cursor.var(cx_Oracle.TIMESTAMP),
+                self.cursor.var(cx_Oracle.TIMESTAMP)
+            ]
+            first_out = len(params) + 1
             update_sql = f"""
                 UPDATE Investment
                 SET {', '.join(update_fields)}
                 WHERE investment_id = :{len(params)}
+                RETURNING investment_amount, investment_date, annual_return_percentage,
+                          created_at, updated_at
+                INTO {', '.join(f':{first_out + i}' for i in range(len(returned)))}
             """
             
-            self.cursor.execute(update_sql, params)
+            self.cursor.execute(update_sql, params + returned)
+            if self.cursor.rowcount == 0:
+                return None
             self.connection.commit()
+            _invalidate_valuation_cache()
             
-            # Return updated record
-            return self.read_investment(investment_id)
+            amount, inv_date, annual_return, created_at, updated_at = (var.getvalue()[0] for var in returned)
+            return {
+                'investment_id': investment_id,
+                'investment_amount': float(amount),
+                'investment_date': inv_date,
+                'annual_return_percentage': float(annual_return),
+                'created_at': str(created_at),
+                'updated_at': str(updated_at)
+            }
             
         except cx_Oracle.DatabaseError as e:
             logger.error(f"Error updating investment: {e}")
@@ -246,18 +450,16 @@ class InvestmentService:
         Returns:
             True if deleted, False if not found
         """
-        # Check if investment exists
-        existing = self.read_investment(investment_id)
-        if not existing:
-            return False
-        
         try:
             self.cursor.execute("""
                 DELETE FROM Investment
                 WHERE investment_id = :1
             """, [investment_id])
             
+            if self.cursor.rowcount == 0:
+                return False
             self.connection.commit()
+            _invalidate_valuation_cache()
             return True
             
         except cx_Oracle.DatabaseError as e:
@@ -275,8 +477,40 @@ class InvestmentService:
             logger.error(f"Error closing connection: {e}")
 
 
+class Investment(NamedTuple):
+    """Compact typed investment record with native date and float fields"""
+    investment_id: str
+    investment_amount: float
+    investment_date: Optional[date]
+    annual_return_percentage: float
+    investment_comments: Optional[str] = None
+    
+    @classmethod
+    def from_row(cls, row: Dict) -> 'Investment':
+        """
+        Convert an investment row dict into a typed record
+        
+        Args:
+            row: Investment record as returned by read_investment/read_all_investments
+            
+        Returns:
+            Investment record
+        """
+        inv_date = row.get('investment_date')
+        if isinstance(inv_date, str):
+            inv_date = date.fromisoformat(inv_date) if inv_date else None
+        
+        return cls(
+            investment_id=str(row.get('investment_id', '')),
+            investment_amount=float(row.get('investment_amount', 0)),
+            investment_date=inv_date,
+            annual_return_percentage=float(row.get('annual_return_percentage', 0)),
+            investment_comments=row.get('investment_comments')
+        )
+
+
 def calculate_current_value(investment_amount: float, annual_return_percentage: float, 
-                           investment_date: str) -> float:
+                           investment_date: Union[str, date], as_of: Optional[date] = None) -> float:
     """
     Calculate current value of investment based on compound interest
     
@@ -286,16 +520,18 @@ def calculate_current_value(investment_amount: float, annual_return_percentage:
     Args:
         investment_amount: Initial investment amount
         annual_return_percentage: Annual return percentage (e.g., 5 for 5%)
-        investment_date: Investment date (YYYY-MM-DD format)
+        investment_date: Investment date (date object or YYYY-MM-DD string)
+        as_of: Valuation date (defaults to today)
         
     Returns:
         Current value of investment
     """
-    from datetime import datetime
-    
-    # Parse investment date
-    inv_date = datetime.strptime(investment_date, "%Y-%m-%d").date()
-    today = datetime.now().date()
+    # Driver and Investment record dates are used as-is; only strings are parsed
+    if isinstance(investment_date, str):
+        inv_date = datetime.strptime(investment_date, "%Y-%m-%d").date()
+    else:
+        inv_date = investment_date
+    today = as_of or datetime.now().date()
     
     # Calculate actual days passed (as a timedelta object for precision)
     time_delta = today - inv_date
@@ -346,3 +582,233 @@ def calculate_return_percentage(current_value: float, investment_amount: float)
         return 0.0
     
     return round(((current_value - investment_amount) / investment_amount) * 100, 2)
+
+
+PAISE_PER_RUPEE = 100
+
+
+def to_paise(rupees) -> np.ndarray:
+    """
+    Convert rupee amounts to fixed-point integer paise
+    
+    Args:
+        rupees: Amount or sequence of amounts in rupees (float or Decimal)
+        
+    Returns:
+        int64 NumPy array of paise
+    """
+    return np.rint(np.asarray(rupees, dtype=np.float64) * PAISE_PER_RUPEE).astype(np.int64)
+
+
+def from_paise(paise) -> np.ndarray:
+    """
+    Convert fixed-point integer paise to rupees
+    
+    Args:
+        paise: Amount or sequence of amounts in paise
+        
+    Returns:
+        float64 NumPy array of rupees
+    """
+    return np.asarray(paise, dtype=np.int64) / PAISE_PER_RUPEE
+
+
+def calculate_portfolio_values_paise(investment_paise, annual_return_percentages,
+                                     investment_dates, as_of: Optional[date] = None):
+    """
+    Calculate current value, profit/loss and return percentage for a whole portfolio in paise
+    
+    Fixed-point core of the valuation engine: each current value is rounded to
+    the paise once, and profit/loss and any totals over the results are exact
+    int64 arithmetic.
+    
+    Args:
+        investment_paise: Sequence of initial investment amounts in paise
+        annual_return_percentages: Sequence of annual return percentages (e.g., 5 for 5%)
+        investment_dates: Sequence of investment dates (date objects or YYYY-MM-DD strings)
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        Tuple of NumPy arrays (current_values_paise, profit_loss_paise, return_percentages)
+    """
+    amounts = np.asarray(investment_paise, dtype=np.int64)
+    annual_rates = np.asarray(annual_return_percentages, dtype=np.float64) / 100
+    inv_dates = np.asarray(investment_dates, dtype='datetime64[D]')
+    today = np.datetime64(as_of or datetime.now().date(), 'D')
+    
+    # Missing or future dates keep the principal, as in calculate_current_value
+    days_passed = (today - inv_dates).astype(np.float64)
+    not_started = np.isnat(inv_dates) | (days_passed < 0)
+    years_passed = np.where(not_started, 0.0, days_passed) / 365.25
+    
+    current_values = np.where(
+        not_started,
+        amounts,
+        np.rint(amounts * np.power(1 + annual_rates, years_passed)).astype(np.int64)
+    )
+    profit_loss = current_values - amounts
+    
+    return_percentages = np.zeros(len(amounts))
+    np.divide(profit_loss, amounts, out=return_percentages, where=amounts != 0)
+    return_percentages = np.round(return_percentages * 100, 2)
+    
+    return current_values, profit_loss, return_percentages
+
+
+def calculate_portfolio_values(investment_amounts, annual_return_percentages,
+                               investment_dates, as_of: Optional[date] = None):
+    """
+    Calculate current value, profit/loss and return percentage for a whole portfolio
+    
+    Vectorized counterpart of calculate_current_value, calculate_profit_loss and
+    calculate_return_percentage: whole columns are valued in one fixed-point
+    NumPy pass (calculate_portfolio_values_paise) instead of once per investment.
+    
+    Args:
+        investment_amounts: Sequence of initial investment amounts
+        annual_return_percentages: Sequence of annual return percentages (e.g., 5 for 5%)
+        investment_dates: Sequence of investment dates (date objects or YYYY-MM-DD strings)
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        Tuple of NumPy arrays (current_values, profit_loss, return_percentages)
+    """
+    current_values, profit_loss, return_percentages = calculate_portfolio_values_paise(
+        to_paise(investment_amounts), annual_return_percentages, investment_dates, as_of=as_of
+    )
+    return from_paise(current_values), from_paise(profit_loss), return_percentages
+
+
+@dataclass(frozen=True)
+class PortfolioRow:
+    """One valued investment of a PortfolioView"""
+    investment_id: str
+    investment_amount: float
+    investment_date: Optional[date]
+    annual_return_percentage: float
+    current_value: float
+    profit_loss: float
+    return_percentage: float
+    investment_comments: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PortfolioView:
+    """Valued portfolio shared by the metric cards, charts, tables and pages of one rerun"""
+    rows: List[PortfolioRow]
+    total_invested: float
+    total_current_value: float
+    total_profit_loss: float
+    total_return_percentage: float
+    as_of: Optional[date] = None
+    
+    @property
+    def count(self) -> int:
+        """Number of investments in the portfolio"""
+        return len(self.rows)
+
+
+@dataclass(frozen=True)
+class PortfolioSummary:
+    """Headline portfolio totals for the Dashboard metric cards"""
+    total_invested: float
+    total_current_value: float
+    total_profit_loss: float
+    total_return_percentage: float
+    count: int
+    as_of: Optional[date] = None
+    
+    @classmethod
+    def from_paise(cls, count: int, total_invested_paise: int, total_current_value_paise: int,
+                   as_of: Optional[date] = None) -> 'PortfolioSummary':
+        """
+        Build a summary from exact paise totals
+        
+        Args:
+            count: Number of investments
+            total_invested_paise: Sum of investment amounts in paise
+            total_current_value_paise: Sum of per-investment current values, each rounded to the paise
+            as_of: Valuation date
+            
+        Returns:
+            PortfolioSummary in rupees
+        """
+        return cls(
+            total_invested=total_invested_paise / PAISE_PER_RUPEE,
+            total_current_value=total_current_value_paise / PAISE_PER_RUPEE,
+            total_profit_loss=(total_current_value_paise - total_invested_paise) / PAISE_PER_RUPEE,
+            total_return_percentage=calculate_return_percentage(total_current_value_paise, total_invested_paise),
+            count=count,
+            as_of=as_of
+        )
+    
+    @classmethod
+    def from_view(cls, portfolio: 'PortfolioView') -> 'PortfolioSummary':
+        """
+        Take the totals of an already valued portfolio
+        
+        Args:
+            portfolio: PortfolioView from build_portfolio_view()
+            
+        Returns:
+            PortfolioSummary with the view's totals
+        """
+        return cls(
+            total_invested=portfolio.total_invested,
+            total_current_value=portfolio.total_current_value,
+            total_profit_loss=portfolio.total_profit_loss,
+            total_return_percentage=portfolio.total_return_percentage,
+            count=portfolio.count,
+            as_of=portfolio.as_of
+        )
+
+
+def build_portfolio_view(investments: List[Investment], as_of: Optional[date] = None) -> PortfolioView:
+    """
+    Value a list of investment records once and build the portfolio view model
+    
+    Args:
+        investments: Investment records as returned by read_all_investment_records()
+        as_of: Valuation date (defaults to today)
+        
+    Returns:
+        PortfolioView with one row per investment and precomputed totals
+    """
+    # Amounts enter the engine as paise once; totals below are exact integer sums
+    amounts = to_paise([inv.investment_amount for inv in investments])
+    current_values, profit_losses, return_pcts = calculate_portfolio_values_paise(
+        amounts,
+        [inv.annual_return_percentage for inv in investments],
+        [inv.investment_date for inv in investments],
+        as_of=as_of
+    )
+    
+    rows = [
+        PortfolioRow(
+            investment_id=inv.investment_id,
+            investment_amount=inv.investment_amount,
+            investment_date=inv.investment_date,
+            annual_return_percentage=inv.annual_return_percentage,
+            current_value=current_value,
+            profit_loss=profit_loss,
+            return_percentage=return_pct,
+            investment_comments=inv.investment_comments
+        )
+        for inv, current_value, profit_loss, return_pct in zip(
+            investments,
+            from_paise(current_values).tolist(),
+            from_paise(profit_losses).tolist(),
+            return_pcts.tolist()
+        )
+    ]
+    
+    total_invested = int(amounts.sum())
+    total_current_value = int(current_values.sum())
+    return PortfolioView(
+        rows=rows,
+        total_invested=total_invested / PAISE_PER_RUPEE,
+        total_current_value=total_current_value / PAISE_PER_RUPEE,
+        total_profit_loss=(total_current_value - total_invested) / PAISE_PER_RUPEE,
+        total_return_percentage=calculate_return_percentage(total_current_value, total_invested),
+        as_of=as_of or datetime.now().date()
+    )
@@ -3,13 +3,19 @@ Unit tests for Investment Dashboard - Oracle Edition
 """
 import pytest
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 from oracle_service import (
     InvestmentService,
     calculate_current_value,
     calculate_profit_loss,
-    calculate_return_percentage
+    calculate_return_percentage,
+    calculate_portfolio_values,
+    build_portfolio_view,
+    Investment,
+    to_paise,
+    from_paise
 )
+from migrations import migrate, pending_migrations
 
 @pytest.fixture
 def service():
@@ -22,6 +28,7 @@ def service():
             db_port=int(os.getenv('ORACLE_PORT', '1521')),
             db_service=os.getenv('ORACLE_SERVICE', 'XEPDB1')
         )
+        migrate(svc.connection)
         yield svc
         svc.close()
     except Exception as e:
@@ -74,6 +81,89 @@ class TestCalculations:
         )
         assert result == 0.0
 
+class TestPortfolioValues:
+    """Test vectorized portfolio valuation"""
+    
+    def test_as_of_date(self):
+        """Test valuation on an explicit as-of date"""
+        current_values, _, _ = calculate_portfolio_values(
+            [100000, 100000], [10, 10], [date(2023, 1, 1), date(2025, 1, 1)], as_of=date(2024, 1, 1)
+        )
+        
+        assert current_values[0] == calculate_current_value(100000, 10, "2023-01-01", as_of=date(2024, 1, 1))
+        assert current_values[1] == 100000
+    
+    def test_matches_per_investment_calculations(self):
+        """Test batch results match the scalar calculation functions"""
+        amounts = [100000, 50000, 75000]
+        annual_returns = [10, 8.5, 0]
+        inv_dates = [
+            (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"),
+            (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d"),
+            datetime.now().strftime("%Y-%m-%d")
+        ]
+        
+        current_values, profit_losses, return_pcts = calculate_portfolio_values(
+            amounts, annual_returns, inv_dates
+        )
+        
+        for i, amount in enumerate(amounts):
+            expected = calculate_current_value(amount, annual_returns[i], inv_dates[i])
+            assert current_values[i] == pytest.approx(expected, abs=0.01)
+            assert profit_losses[i] == pytest.approx(calculate_profit_loss(expected, amount), abs=0.01)
+            assert return_pcts[i] == pytest.approx(calculate_return_percentage(expected, amount), abs=0.01)
+    
+    def test_future_date_keeps_principal(self):
+        """Test future date is valued at the invested amount"""
+        future_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+        current_values, _, return_pcts = calculate_portfolio_values([100000], [10], [future_date])
+        assert current_values[0] == 100000.0
+        assert return_pcts[0] == 0.0
+
+class TestPortfolioView:
+    """Test the portfolio view model"""
+    
+    def test_rows_and_totals(self):
+        """Test view rows carry valuations and totals add up"""
+        past_date = date.today() - timedelta(days=365)
+        portfolio = build_portfolio_view([
+            Investment('id1', 100000.0, past_date, 10.0),
+            Investment('id2', 50000.0, past_date, 0.0),
+        ])
+        
+        assert portfolio.count == 2
+        assert portfolio.rows[1].current_value == 50000.0
+        assert portfolio.total_invested == 150000.0
+        assert 159900 < portfolio.total_current_value < 160100
+        assert 6.6 < portfolio.total_return_percentage < 6.7
+    
+    def test_investment_from_row(self):
+        """Test VARCHAR2 dates convert to date objects on typed records"""
+        record = Investment.from_row({'investment_id': 'id1', 'investment_amount': 100000,
+                                      'investment_date': '2024-06-15', 'annual_return_percentage': 10})
+        
+        assert record == Investment('id1', 100000.0, date(2024, 6, 15), 10.0)
+        assert calculate_current_value(1000, 5, date(2024, 6, 15)) == calculate_current_value(1000, 5, "2024-06-15")
+
+class TestFixedPointMoney:
+    """Test the fixed-point paise valuation engine"""
+    
+    def test_paise_round_trip(self):
+        """Test rupee amounts convert to exact paise and back"""
+        paise = to_paise([100000.0, 0.1, 0.29])
+        
+        assert paise.tolist() == [10000000, 10, 29]
+        assert from_paise(paise).tolist() == [100000.0, 0.1, 0.29]
+    
+    def test_totals_are_exact(self):
+        """Test totals are exact integer sums of paise"""
+        portfolio = build_portfolio_view(
+            [Investment(str(i), 0.1, date(2099, 1, 1), 5.0) for i in range(10)]
+        )
+        
+        assert portfolio.total_invested == 1.0
+        assert portfolio.total_profit_loss == 0.0
+
 class TestCRUDOperations:
     """Test CRUD operations"""
     
@@ -112,11 +202,42 @@ class TestCRUDOperations:
         # Clean up
         service.delete_investment(created['investment_id'])
     
+    def test_read_investment_projection(self, service):
+        """Test a summary read returns only id, amount and date"""
+        created = service.create_investment(
+            investment_amount=75000,
+            investment_date=datetime.now().strftime("%Y-%m-%d"),
+            annual_return_percentage=7.5
+        )
+        
+        read_result = service.read_investment(created['investment_id'], projection='summary')
+        
+        assert set(read_result) == {'investment_id', 'investment_amount', 'investment_date'}
+        assert read_result['investment_amount'] == 75000
+        
+        # Clean up
+        service.delete_investment(created['investment_id'])
+    
+    def test_migrations_up_to_date(self, service):
+        """Test a second run finds nothing pending and applies nothing"""
+        assert pending_migrations(service.connection) == []
+        assert migrate(service.connection) == []
+    
     def test_read_nonexistent_investment(self, service):
         """Test reading non-existent investment"""
         result = service.read_investment('nonexistent-id')
         assert result is None
     
+    def test_update_nonexistent_investment(self, service):
+        """Test updating a non-existent investment returns None"""
+        result = service.update_investment('nonexistent-id', investment_amount=1000)
+        assert result is None
+    
+    def test_delete_nonexistent_investment(self, service):
+        """Test deleting a non-existent investment returns False"""
+        result = service.delete_investment('nonexistent-id')
+        assert result is False
+    
     def test_update_investment(self, service):
         """Test updating an investment"""
         # Create test investment
@@ -176,6 +297,52 @@ class TestCRUDOperations:
         # Clean up
         for inv_id in ids:
             service.delete_investment(inv_id)
+    
+    def test_read_investments_page(self, service):
+        """Test keyset pages cover every investment exactly once"""
+        ids = []
+        for i in range(5):
+            result = service.create_investment(
+                investment_amount=1000 + i,
+                investment_date="2001-01-0" + str(1 + i % 2),
+                annual_return_percentage=5.0
+            )
+            ids.append(result['investment_id'])
+        
+        seen = []
+        after = None
+        while True:
+            page = service.read_investments_page(after=after, limit=2)
+            if not page:
+                break
+            assert len(page) <= 2
+            seen.extend(record.investment_id for record in page)
+            after = (page[-1].investment_date, page[-1].investment_id)
+        
+        assert len(seen) == len(set(seen))
+        assert set(ids) <= set(seen)
+        
+        # Clean up
+        for inv_id in ids:
+            service.delete_investment(inv_id)
+    
+    def test_portfolio_summary_matches_view(self, service):
+        """Test the SQL summary agrees with the Python valuation"""
+        created = service.create_investment(
+            investment_amount=12345.67,
+            investment_date="2020-02-29",
+            annual_return_percentage=7.5
+        )
+        
+        summary = service.get_portfolio_summary(as_of=date(2024, 6, 30))
+        portfolio = build_portfolio_view(service.read_all_investment_records(), as_of=date(2024, 6, 30))
+        
+        assert summary.count == portfolio.count
+        assert summary.total_invested == pytest.approx(portfolio.total_invested)
+        assert summary.total_current_value == pytest.approx(portfolio.total_current_value, abs=0.01 * portfolio.count)
+        
+        # Clean up
+        service.delete_investment(created['investment_id'])
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])